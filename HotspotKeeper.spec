@@ -3,11 +3,11 @@
 block_cipher = None
 
 a = Analysis(
-    ['hotspotkeeper.py'],
+    ['hotspotkeeper_launcher.py'],
     pathex=[],
     binaries=[],
     datas=[('assets/icon.ico', 'assets')],
-    hiddenimports=[],
+    hiddenimports=['hotspotkeeper', 'hotspotkeeper_gui', 'hotspotkeeper_dialogs'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,292 @@
+"""
+Control loop benchmark for HotspotKeeper.
+
+Runs the real control logic (status ticks, auto-enable, failure cooldown,
+debounce) of the HotspotKeeper core behind a MainWindow on Qt's offscreen platform against the
+SimulatedBackend, so it works on Linux without any Windows API.
+
+Scenarios:
+    policy   - HotspotPolicy alone replaying a synthetic trace: decisions/sec
+    ticks    - back-to-back status ticks with the cached status bypassed:
+               ticks/sec, p50/p99 latency from request to rendered snapshot,
+               and how long each tick blocks the GUI thread (the request
+               call plus applying the snapshot)
+    connect  - WiFi off -> on, timed until the hotspot is confirmed enabled
+    steady   - stable WiFi for --duration seconds: probes and spawns per hour
+    flapping - WiFi flipping every ~--flap-period seconds (with failing
+               enables if --fail-enables is set): probes, enables and
+               spawns per hour
+
+The simulator spawns no processes, so "probe calls/hour" is the figure to
+watch: each one is a process spawn on the legacy netsh/PowerShell path and a
+PowerShell host request on the subprocess backend.
+
+Usage:
+    python benchmarks/bench_control_loop.py [--probe-latency 0.05] [--tethering-delay 1.5]
+    python benchmarks/bench_control_loop.py --json > bench_output.txt
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Headless and isolated: offscreen Qt, simulated backend, throwaway settings/log dir
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["HOTSPOTKEEPER_BACKEND"] = "simulated"
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="hotspotkeeper-bench-")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import logging
+
+from PySide6.QtWidgets import QApplication
+
+import hotspotkeeper
+from hotspotkeeper import (HotspotBackend, HotspotPolicy, ManualEventSource, PolicyAction, SettingsManager,
+                           SimulatedBackend, StatusSnapshot, metrics, setup_logging)
+from hotspotkeeper_gui import MainWindow
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0..1)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Harness:
+    """One MainWindow wired to a SimulatedBackend"""
+
+    def __init__(self, args):
+        self.args = args
+        self.app = QApplication.instance() or QApplication(sys.argv)
+
+        probes = ('read_status', 'is_wifi_connected', 'is_hotspot_enabled', 'power_status')
+        self.backend = SimulatedBackend(
+            wifi_connected=True,
+            latencies={name: args.probe_latency for name in probes},
+            tethering_delay=args.tethering_delay,
+            event_source=ManualEventSource()
+        )
+        HotspotBackend.install(self.backend)
+
+        # No network traffic from the update check
+        hotspotkeeper.UpdateChecker.run = lambda checker: None
+
+        log_file = setup_logging()
+        logging.getLogger().setLevel(logging.WARNING)
+        settings_manager = SettingsManager()
+        settings_manager.update({
+            "show_notifications": False,
+            "check_interval": args.check_interval,
+            "debounce_time": args.debounce_time,
+            "pause_polling_when_idle": False,
+            "pause_polling_on_battery": False,
+        })
+
+        self.window = MainWindow(True, settings_manager, log_file)
+        self.keeper = self.window.keeper
+        self.keeper.policy.failure_cooldown = args.failure_cooldown
+        self.applied = 0
+        self.keeper.probe_engine.snapshot_ready.connect(self._on_snapshot)
+
+    def _on_snapshot(self, snapshot):
+        self.applied += 1
+
+    def pump(self, seconds):
+        """Run the Qt event loop for `seconds`"""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+            time.sleep(0.0005)
+
+    def wait_until(self, predicate, timeout):
+        """Run the event loop until predicate() holds; returns False on timeout"""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                return False
+            self.app.processEvents()
+            time.sleep(0.0005)
+        return True
+
+    def settled(self, wifi, hotspot):
+        snapshot = self.keeper.last_snapshot
+        return (snapshot is not None and not self.keeper.policy.busy and
+                snapshot.wifi_connected == wifi and snapshot.hotspot_enabled == hotspot)
+
+    def counts(self):
+        return {
+            'probe_calls': sum(count for name, count in self.backend.calls.items()
+                               if name not in ('set_tethering', 'read_clients', 'read_traffic')),
+            'enables': self.backend.calls['set_tethering'],
+            'spawns': metrics.counters['process.spawns'],
+        }
+
+    def close(self):
+        self.window.quit_app()
+        self.app.processEvents()
+
+
+def bench_ticks(harness, ticks):
+    keeper = harness.keeper
+    harness.wait_until(lambda: harness.settled(True, True), 30)
+
+    latencies = []
+    blocked = []  # GUI thread time per tick
+    started = time.perf_counter()
+    for _ in range(ticks):
+        keeper.probe_engine.invalidate()
+        expected = harness.applied + 1
+        tick_started = time.perf_counter()
+        keeper.update_status()
+        request_time = time.perf_counter() - tick_started
+        if not harness.wait_until(lambda: harness.applied >= expected, 10):
+            raise RuntimeError("status tick did not complete")
+        latencies.append(time.perf_counter() - tick_started)
+        blocked.append(request_time + keeper.last_apply_time)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'ticks': ticks,
+        'ticks_per_sec': ticks / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': max(latencies) * 1000,
+        'gui_p50_ms': percentile(blocked, 0.5) * 1000,
+        'gui_p99_ms': percentile(blocked, 0.99) * 1000,
+    }
+
+
+def bench_connect(harness, trials):
+    times = []
+    for _ in range(trials):
+        harness.backend.set_wifi(False)
+        if not harness.wait_until(lambda: harness.settled(False, False), 30):
+            raise RuntimeError("did not observe WiFi disconnect")
+
+        started = time.perf_counter()
+        harness.backend.set_wifi(True)
+        if not harness.wait_until(lambda: harness.settled(True, True), 60):
+            raise RuntimeError("hotspot was not confirmed enabled after WiFi connect")
+        times.append(time.perf_counter() - started)
+
+    return {
+        'trials': trials,
+        'p50_s': percentile(times, 0.5),
+        'max_s': max(times),
+    }
+
+
+def bench_policy(ticks, seed=1):
+    """Replay `ticks` synthetic snapshots (WiFi and hotspot flapping, 1 s apart) through HotspotPolicy"""
+    rng = random.Random(seed)
+    trace = [StatusSnapshot(rng.random() < 0.7, rng.random() < 0.5, rng.randint(0, 100), rng.random() < 0.5,
+                            None, 0, 0.0, 0.0) for _ in range(1000)]
+    policy = HotspotPolicy(battery_threshold=20)
+    decide = policy.decide
+    finished = policy.operation_finished
+    enable = PolicyAction.ENABLE
+    actions = 0
+
+    rounds = max(1, ticks // len(trace))
+    started = time.perf_counter()
+    now = 0.0
+    for _ in range(rounds):
+        for snapshot in trace:
+            now += 1.0
+            action = decide(snapshot, now)
+            if action:
+                actions += 1
+                finished(action == enable, now % 7 > 1, now, True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'ticks': rounds * len(trace),
+        'ticks_per_sec': rounds * len(trace) / elapsed,
+        'actions': actions,
+    }
+
+
+def bench_soak(harness, duration, flap_period=0, fail_enables=0, seed=1):
+    """Run for `duration` seconds, optionally flapping WiFi; rates are per hour"""
+    rng = random.Random(seed)
+    harness.wait_until(lambda: harness.settled(True, True), 30)
+    harness.backend.fail_enables = fail_enables
+    before = harness.counts()
+
+    started = time.perf_counter()
+    end = started + duration
+    while time.perf_counter() < end:
+        if flap_period:
+            harness.pump(min(rng.uniform(0.5, 1.5) * flap_period, max(0, end - time.perf_counter())))
+            harness.backend.set_wifi(not harness.backend.wifi_connected)
+        else:
+            harness.pump(end - time.perf_counter())
+    elapsed = time.perf_counter() - started
+
+    after = harness.counts()
+    harness.backend.fail_enables = 0
+    harness.backend.set_wifi(True)
+    return {
+        'seconds': round(elapsed, 1),
+        **{f"{name}_per_hour": (after[name] - before[name]) * 3600 / elapsed for name in after},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--probe-latency', type=float, default=0.05, help="seconds per simulated probe")
+    parser.add_argument('--tethering-delay', type=float, default=1.5, help="seconds for tethering to start")
+    parser.add_argument('--check-interval', type=int, default=3, help="base poll interval (seconds)")
+    parser.add_argument('--debounce-time', type=int, default=10)
+    parser.add_argument('--failure-cooldown', type=float, default=60)
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--policy-ticks', type=int, default=2_000_000)
+    parser.add_argument('--trials', type=int, default=5, help="WiFi connect trials")
+    parser.add_argument('--duration', type=float, default=30, help="seconds per soak scenario")
+    parser.add_argument('--flap-period', type=float, default=2.0, help="mean seconds between WiFi flips")
+    parser.add_argument('--fail-enables', type=int, default=5, help="failing enables during the flapping run")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    harness = Harness(args)
+    try:
+        results = {
+            'config': vars(args),
+            'policy': bench_policy(args.policy_ticks),
+            'ticks': bench_ticks(harness, args.ticks),
+            'connect': bench_connect(harness, args.trials),
+            'steady': bench_soak(harness, args.duration),
+            'flapping': bench_soak(harness, args.duration, args.flap_period, args.fail_enables),
+        }
+    finally:
+        harness.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    ticks, connect = results['ticks'], results['connect']
+    print(f"probe latency {args.probe_latency * 1000:.0f} ms, tethering delay {args.tethering_delay:.2f} s")
+    print(f"policy:    {results['policy']['ticks_per_sec']:10.0f} decisions/s (replay, no Qt)")
+    print(f"ticks:     {ticks['ticks_per_sec']:8.1f} ticks/s   p50 {ticks['p50_ms']:.2f} ms   "
+          f"p99 {ticks['p99_ms']:.2f} ms   max {ticks['max_ms']:.2f} ms")
+    print(f"gui:       p50 {ticks['gui_p50_ms']:.3f} ms   p99 {ticks['gui_p99_ms']:.3f} ms   "
+          f"(GUI thread blocked per tick)")
+    print(f"connect:   p50 {connect['p50_s']:.3f} s   max {connect['max_s']:.3f} s   "
+          f"(WiFi connect -> hotspot confirmed, {connect['trials']} trials)")
+    for name in ('steady', 'flapping'):
+        soak = results[name]
+        print(f"{name + ':':<10} {soak['probe_calls_per_hour']:8.0f} probe calls/h   "
+              f"{soak['enables_per_hour']:6.0f} enables/h   {soak['spawns_per_hour']:6.0f} spawns/h   "
+              f"({soak['seconds']} s)")
+
+
+if __name__ == '__main__':
+    main()
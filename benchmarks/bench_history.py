@@ -0,0 +1,130 @@
+"""
+History store benchmark for HotspotKeeper.
+
+Writes --days of synthetic status ticks (irregular intervals like the
+adaptive poller's, WiFi outages, hotspot drops, app restarts) into a
+HistoryStore in a throwaway directory, then reports:
+
+    append  - ticks/sec and p50/p99 cost of one tick (tick record plus the
+              in-place hourly and daily rollup updates)
+    uptime  - p50/p99 time to answer "hotspot uptime over the last 30 days"
+              from the rollups, and its error against the exact figure
+              computed from the synthetic ticks
+    disk    - bytes used by each tier
+
+Usage:
+    python benchmarks/bench_history.py [--days 35] [--queries 1000] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotspotkeeper import HistoryStore, StatusSnapshot  # noqa: E402
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0..1)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def synthetic_ticks(days, end, seed=1):
+    """Yield (time, snapshot) for `days` of ticks ending at `end`, and None where the app restarts"""
+    rng = random.Random(seed)
+    now = end - days * 86400
+    wifi = hotspot = True
+    while now < end:
+        if rng.random() < 0.0005:
+            now += rng.uniform(600, 7200)  # app closed or machine asleep
+            yield None
+        if rng.random() < 0.002:
+            wifi = not wifi
+        hotspot = wifi and (hotspot or rng.random() < 0.3) and rng.random() > 0.001
+        latency = rng.uniform(0.005, 0.05)
+        yield now, StatusSnapshot(wifi, hotspot, rng.randint(20, 100), rng.random() < 0.7, None,
+                                  rng.randint(0, 4) if hotspot else 0, 0.0, latency)
+        now += rng.choice((1, 3, 3, 3, 6, 12, 24, 48, 60))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--days', type=int, default=35, help="days of synthetic history to write")
+    parser.add_argument('--queries', type=int, default=1000, help="30-day uptime queries to time")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="hotspotkeeper-bench-")) / "history"
+    end = time.time()
+    store = HistoryStore(directory)
+
+    # Exact uptime over the last 30 days, credited the same way as the store
+    window_start = end - 30 * 86400
+    exact_observed = exact_hotspot = 0.0
+    previous = None
+
+    append_times = []
+    for tick in synthetic_ticks(args.days, end):
+        if tick is None:  # restart: the next tick opens a new session
+            store.close(previous[0] if previous else None)
+            store = HistoryStore(directory)
+            previous = None
+            continue
+        now, snapshot = tick
+        if previous is not None and 0 < now - previous[0] <= HistoryStore.MAX_GAP:
+            overlap = max(0.0, now - max(previous[0], window_start))
+            exact_observed += overlap
+            exact_hotspot += overlap if previous[1] else 0.0
+        previous = (now, snapshot.hotspot_enabled)
+
+        started = time.perf_counter()
+        store.record(snapshot, now)
+        append_times.append(time.perf_counter() - started)
+
+    query_times = []
+    for _ in range(args.queries):
+        started = time.perf_counter()
+        uptime = store.uptime(30 * 86400, end)
+        query_times.append(time.perf_counter() - started)
+
+    sizes = {path.name: path.stat().st_size for path in sorted(directory.iterdir())}
+    store.close(end)
+
+    exact_ratio = exact_hotspot / exact_observed
+    results = {
+        'append': {
+            'ticks': len(append_times),
+            'ticks_per_sec': len(append_times) / sum(append_times),
+            'p50_us': percentile(append_times, 0.5) * 1e6,
+            'p99_us': percentile(append_times, 0.99) * 1e6,
+        },
+        'uptime': {
+            'queries': len(query_times),
+            'p50_ms': percentile(query_times, 0.5) * 1000,
+            'p99_ms': percentile(query_times, 0.99) * 1000,
+            'ratio': uptime['ratio'],
+            'exact_ratio': round(exact_ratio, 4),
+            'observed_error_s': round(uptime['observed'] - exact_observed, 1),
+        },
+        'disk_bytes': sizes,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    append, query = results['append'], results['uptime']
+    print(f"append:  {append['ticks_per_sec']:9.0f} ticks/s   p50 {append['p50_us']:.1f} us   "
+          f"p99 {append['p99_us']:.1f} us   ({append['ticks']} ticks over {args.days} days)")
+    print(f"uptime:  p50 {query['p50_ms']:.3f} ms   p99 {query['p99_ms']:.3f} ms   30-day ratio "
+          f"{query['ratio']:.2%} (exact {query['exact_ratio']:.2%}, observed off by {query['observed_error_s']} s)")
+    print("disk:    " + "   ".join(f"{name} {size / 1024:.0f} KB" for name, size in sizes.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Control endpoint benchmark for HotspotKeeper.
+
+Starts `hotspotkeeper_launcher.py --headless` against the SimulatedBackend in a
+throwaway profile and times `status` queries through hotspotkeeper_ctl:
+
+    persistent - many queries over one connection (round-trip latency)
+    connect    - a fresh connection per query (what a polling script pays)
+    cli        - `python hotspotkeeper_ctl.py status` as a new process
+    relaunch   - `python hotspotkeeper_launcher.py --minimized` while running: the
+                 launcher hands its arguments over and exits
+
+Status is served from the running instance's cached snapshot, so none of
+these run a probe; compare with a netsh/PowerShell spawn per query.
+
+Usage:
+    python benchmarks/bench_ipc.py [--queries 10000] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hotspotkeeper_ctl import ControlClient  # noqa: E402
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0..1)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(times):
+    return {
+        'queries': len(times),
+        'p50_us': percentile(times, 0.5) * 1e6,
+        'p99_us': percentile(times, 0.99) * 1e6,
+        'per_sec': len(times) / sum(times),
+    }
+
+
+def start_instance(env, timeout=30):
+    """Launch a headless instance and wait until its endpoint answers"""
+    process = subprocess.Popen([sys.executable, str(ROOT / 'hotspotkeeper_launcher.py'), '--headless'], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with ControlClient() as client:
+                if client.request('status')['status'].get('wifi_connected') is not None:
+                    return process
+        except OSError:
+            pass
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("headless instance did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--queries', type=int, default=10000, help="queries over one connection")
+    parser.add_argument('--connects', type=int, default=1000, help="queries with a new connection each")
+    parser.add_argument('--cli-runs', type=int, default=10, help="CLI processes and relaunches to spawn")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    # The client resolves the endpoint from the same profile as the instance
+    os.environ["HOTSPOTKEEPER_BACKEND"] = "simulated"
+    os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="hotspotkeeper-bench-")
+    process = start_instance(dict(os.environ))
+    try:
+        persistent = []
+        with ControlClient() as client:
+            for _ in range(args.queries):
+                started = time.perf_counter()
+                client.request('status')
+                persistent.append(time.perf_counter() - started)
+
+        connect = []
+        for _ in range(args.connects):
+            started = time.perf_counter()
+            with ControlClient() as client:
+                client.request('status')
+            connect.append(time.perf_counter() - started)
+
+        cli = []
+        for _ in range(args.cli_runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, str(ROOT / 'hotspotkeeper_ctl.py'), 'status'],
+                           stdout=subprocess.DEVNULL, check=True)
+            cli.append(time.perf_counter() - started)
+
+        relaunch = []
+        for _ in range(args.cli_runs):
+            started = time.perf_counter()
+            # A relaunch that failed to forward would start a second instance and hit the timeout
+            subprocess.run([sys.executable, str(ROOT / 'hotspotkeeper_launcher.py'), '--minimized'], check=True, timeout=30)
+            relaunch.append(time.perf_counter() - started)
+    finally:
+        process.terminate()
+        process.wait(10)
+
+    results = {'persistent': summarize(persistent), 'connect': summarize(connect), 'cli': summarize(cli),
+               'relaunch': summarize(relaunch)}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        print(f"{name + ':':<12} p50 {result['p50_us']:9.1f} us   p99 {result['p99_us']:9.1f} us   "
+              f"{result['per_sec']:9.0f} queries/s   ({result['queries']} queries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Startup benchmark for HotspotKeeper.
+
+Launches fresh interpreters that go through the same steps as main() - logging,
+QApplication, settings, MainWindow - on Qt's offscreen platform against the
+SimulatedBackend, and reports for each launch mode:
+
+    time-to-tray  - process spawn until the tray icon (headless: the core) is up
+                    and the engine is running
+    import        - time spent importing hotspotkeeper itself
+    peak RSS      - the process's high-water mark once the tray is up
+    modules       - entries in sys.modules, and whether QtWidgets and `requests` were loaded
+
+Modes:
+    minimized - the `--minimized` path taken by the Windows autostart at login
+    window    - a normal launch that shows the main window
+    headless  - `--headless`: the monitoring core under QCoreApplication, no widgets
+
+Every launch is a cold interpreter; pass --runs to average over more of them.
+Peak RSS comes from getrusage() and is reported as n/a where that is unavailable.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def child(mode):
+    """Start the app like main() does, print one JSON line once the tray is up, then exit"""
+    started = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    import hotspotkeeper
+    import_s = time.perf_counter() - started
+
+    import logging
+
+    # No network traffic from the update check
+    hotspotkeeper.UpdateChecker.run = lambda checker: None
+
+    log_file = hotspotkeeper.setup_logging()
+    if mode == 'headless':
+        from PySide6.QtCore import QCoreApplication
+        app = QCoreApplication(sys.argv)
+    else:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+        app.setQuitOnLastWindowClosed(False)
+    settings_manager = hotspotkeeper.SettingsManager()
+    settings_manager.update({"show_notifications": False})
+    hotspotkeeper.configure_logging(settings_manager.settings)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if mode == 'headless':
+        keeper = hotspotkeeper.HotspotKeeper(settings_manager)
+        keeper.start()
+        quit_app = keeper.shutdown
+    else:
+        from hotspotkeeper_gui import MainWindow
+        start_minimized = mode == 'minimized'
+        window = MainWindow(start_minimized=start_minimized, settings_manager=settings_manager, log_file=log_file)
+        if not start_minimized:
+            window.show()
+        quit_app = window.quit_app
+    app.processEvents()
+    ready_s = time.perf_counter() - started
+
+    print(json.dumps({
+        'import_s': import_s,
+        'ready_s': ready_s,
+        'peak_rss_mb': peak_rss_mb(),
+        'modules': len(sys.modules),
+        'requests_loaded': 'requests' in sys.modules,
+        'widgets_loaded': 'PySide6.QtWidgets' in sys.modules,
+    }), flush=True)
+    quit_app()
+
+
+def launch(mode):
+    """One cold start in a fresh interpreter and throwaway profile"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["HOTSPOTKEEPER_BACKEND"] = "simulated"
+    env["HOME"] = env["USERPROFILE"] = tempfile.mkdtemp(prefix="hotspotkeeper-bench-")
+
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, __file__, '--child', mode], env=env,
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    tray_s = time.perf_counter() - started
+    process.communicate(timeout=30)
+    if not line:
+        raise RuntimeError(f"{mode} launch exited with {process.returncode} before the tray was up")
+    result = json.loads(line)
+    result['tray_s'] = tray_s
+    return result
+
+
+def summarize(runs):
+    def mean(key):
+        values = [run[key] for run in runs if run[key] is not None]
+        return sum(values) / len(values) if values else None
+
+    return {
+        'runs': len(runs),
+        'tray_s': mean('tray_s'),
+        'tray_min_s': min(run['tray_s'] for run in runs),
+        'import_s': mean('import_s'),
+        'peak_rss_mb': mean('peak_rss_mb'),
+        'modules': mean('modules'),
+        'requests_loaded': any(run['requests_loaded'] for run in runs),
+        'widgets_loaded': any(run['widgets_loaded'] for run in runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per mode")
+    parser.add_argument('--mode', choices=('minimized', 'window', 'headless', 'all'), default='all')
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    modes = ('minimized', 'window', 'headless') if args.mode == 'all' else (args.mode,)
+    launch(modes[0])  # warm the OS file cache and .pyc files; not counted
+    results = {mode: summarize([launch(mode) for _ in range(args.runs)]) for mode in modes}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for mode, result in results.items():
+        rss = f"{result['peak_rss_mb']:.1f} MB" if result['peak_rss_mb'] is not None else "n/a"
+        print(f"{mode + ':':<11} time-to-tray {result['tray_s'] * 1000:6.0f} ms (min {result['tray_min_s'] * 1000:.0f})   "
+              f"import {result['import_s'] * 1000:5.0f} ms   peak RSS {rss}   "
+              f"{result['modules']:.0f} modules{'' if result['widgets_loaded'] else '   no QtWidgets'}"
+              f"{'   requests loaded' if result['requests_loaded'] else ''}")
+
+
+if __name__ == '__main__':
+    main()
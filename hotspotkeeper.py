@@ -6,38 +6,45 @@ Version: 1.1.0 - FIXED
 
 import sys
 import subprocess
-import winreg
 import os
 import ctypes
 import json
+import gzip
 import logging
+import logging.handlers
+import atexit
+import mmap
+import struct
+import base64
+import bisect
+import queue
+import shutil
+import signal
+import threading
+import time
+from array import array
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                               QHBoxLayout, QLabel, QPushButton, QSystemTrayIcon, 
-                               QMenu, QCheckBox, QFrame, QDialog, QSpinBox, QMessageBox,
-                               QGroupBox, QTextEdit)
-from PySide6.QtCore import QTimer, Qt, Signal, QThread, QMutex, QSharedMemory
-from PySide6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor
-import requests
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, QThread, QLockFile
+from PySide6.QtNetwork import QLocalServer
 
+import hotspotkeeper_ctl
 
-# Configure logging
-def setup_logging():
-    """Setup logging to file"""
-    log_dir = Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "hotspotkeeper.log"
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
-    return log_file
+try:
+    import winreg
+except ImportError:  # Not on Windows (development / testing)
+    winreg = None
+
+# Run as a script, this module is __main__; register it under its own name so the
+# lazily imported UI modules share its singletons instead of importing a second copy
+if __name__ == "__main__":
+    sys.modules.setdefault("hotspotkeeper", sys.modules[__name__])
+
+
+# Entry point that forwards relaunches without loading this module (see hotspotkeeper_launcher.py)
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hotspotkeeper_launcher.py')
 
 
 def is_admin():
@@ -48,8 +55,29 @@ def is_admin():
         return False
 
 
+def user_idle_seconds():
+    """Seconds since the last keyboard/mouse input, or None if unknown"""
+    if sys.platform != 'win32':
+        return None
+    
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+    
+    try:
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # Both are 32-bit millisecond tick counts that wrap every ~49 days
+        return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+    except Exception:
+        return None
+
+
 def run_as_admin():
     """Re-run the script with admin privileges"""
+    if sys.platform != 'win32':  # UAC elevation only exists on Windows
+        return
     if not is_admin():
         try:
             # Get the path to pythonw.exe to run without console
@@ -57,8 +85,7 @@ def run_as_admin():
             if not os.path.exists(python_path):
                 python_path = sys.executable
             
-            script = os.path.abspath(__file__)
-            params = ' '.join([script] + sys.argv[1:])
+            params = ' '.join([f'"{LAUNCHER}"'] + sys.argv[1:])
             
             ctypes.windll.shell32.ShellExecuteW(
                 None, "runas", python_path, params, None, 1
@@ -69,84 +96,615 @@ def run_as_admin():
             sys.exit(1)
 
 
+class Histogram:
+    """Latency histogram with fixed exponential buckets (values in seconds)"""
+    
+    # 100 µs .. ~105 s, doubling
+    BOUNDS = [0.0001 * (2 ** i) for i in range(21)]
+    
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+    
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (max for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+    
+    def summary(self):
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else None,
+            'min': self.min,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, last-value gauges and latency histograms.
+    
+    Recording costs about a microsecond, so instrumentation stays on in
+    production. Use the module-level `metrics` instance.
+    """
+    
+    class _Timer:
+        __slots__ = ('registry', 'name', 'started')
+        
+        def __init__(self, registry, name):
+            self.registry = registry
+            self.name = name
+        
+        def __enter__(self):
+            self.started = time.perf_counter()
+            return self
+        
+        def __exit__(self, exc_type, exc, tb):
+            self.registry.observe(self.name, time.perf_counter() - self.started)
+            if exc_type is not None:
+                self.registry.inc(self.name + '.errors')
+            return False
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.counters = Counter()
+        self.gauges = {}
+        self.histograms = {}
+    
+    def inc(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+    
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+    
+    def observe(self, name, value):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+    
+    def timer(self, name):
+        """Context manager recording the duration of its block in histogram `name`"""
+        return self._Timer(self, name)
+    
+    def snapshot(self):
+        with self.lock:
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'counters': dict(sorted(self.counters.items())),
+                'gauges': dict(sorted(self.gauges.items())),
+                'histograms': {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+            }
+    
+    def format_report(self):
+        """Plain-text table of everything recorded"""
+        data = self.snapshot()
+        
+        def ms(value):
+            return '-' if value is None else f"{value * 1000:.1f}"
+        
+        lines = [f"Started {data['started_at']} (uptime {data['uptime_seconds']:.0f}s)", ""]
+        lines.append(f"{'Timing (ms)':<32}{'count':>8}{'avg':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+        for name, summary in data['histograms'].items():
+            lines.append(f"{name:<32}{summary['count']:>8}{ms(summary['avg']):>10}{ms(summary['p50']):>10}"
+                         f"{ms(summary['p99']):>10}{ms(summary['max']):>10}")
+        lines += ["", f"{'Counter':<32}{'value':>8}"]
+        lines += [f"{name:<32}{value:>8}" for name, value in data['counters'].items()]
+        lines += ["", f"{'Gauge':<32}{'value':>8}"]
+        lines += [f"{name:<32}{value!s:>8}" for name, value in data['gauges'].items()]
+        return '\n'.join(lines)
+    
+    def dump(self, path):
+        """Write the current metrics to `path` as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+metrics = MetricsRegistry()
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Log file rotated by size and by age; rotated segments are gzip-compressed.
+    
+    At most `backup_count` compressed segments are kept, so the footprint is
+    bounded by max_bytes plus the compressed backups; with no backups the log
+    is truncated instead. Bytes and records written and rotations are
+    recorded in `metrics`.
+    """
+    
+    def __init__(self, filename, max_bytes=5 * 1024 * 1024, backup_count=5, max_age=7 * 24 * 3600):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.max_age = max_age  # seconds, 0 = no time-based rotation
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+        try:
+            self.opened_at = os.stat(filename).st_mtime if os.path.getsize(filename) else time.time()
+        except OSError:
+            self.opened_at = time.time()
+    
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+    
+    def shouldRollover(self, record):
+        if (self.max_age and time.time() - self.opened_at >= self.max_age and
+                os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename)):
+            return True
+        return super().shouldRollover(record)
+    
+    def doRollover(self):
+        super().doRollover()
+        if self.backupCount == 0:
+            # Nothing to rotate into: start the file over so the limits still hold
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            open(self.baseFilename, 'w').close()
+        self.opened_at = time.time()
+        metrics.inc('log.rotations')
+        metrics.set_gauge('log.footprint_bytes', self.footprint())
+    
+    def emit(self, record):
+        super().emit(record)
+        metrics.inc('log.records')
+        if self.stream is not None:
+            metrics.set_gauge('log.file_bytes', self.stream.tell())
+    
+    def footprint(self):
+        """Bytes on disk used by the log and its rotated segments"""
+        paths = [self.baseFilename] + [self.rotation_filename(f"{self.baseFilename}.{i}")
+                                       for i in range(1, self.backupCount + 1)]
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the background writer; drop (and count) them if its queue is full"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc('log.dropped')
+
+
+_log_listener = None
+
+
+def setup_logging():
+    """
+    Setup logging to file.
+    
+    Records go through a bounded queue to a background thread that writes the
+    rotating log file and the console, so logging never blocks on disk I/O.
+    """
+    global _log_listener
+    log_dir = Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / "hotspotkeeper.log"
+    if _log_listener is not None:
+        return log_file
+    
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = CompressingRotatingFileHandler(log_file)
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(maxsize=10000)
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # drain the queue on exit
+    
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # formatted for real by the writer
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    return log_file
+
+
+def configure_logging(settings):
+    """Apply the log level and rotation limits from a Settings object"""
+    logging.getLogger().setLevel(getattr(logging, settings.log_level, logging.INFO))
+    if _log_listener is None:
+        return
+    for handler in _log_listener.handlers:
+        if isinstance(handler, CompressingRotatingFileHandler):
+            handler.maxBytes = settings.log_max_size_mb * 1024 * 1024
+            handler.backupCount = settings.log_backup_count
+            handler.max_age = settings.log_max_age_days * 24 * 3600
+            metrics.set_gauge('log.footprint_bytes', handler.footprint())
+
+
+def hidden_subprocess_kwargs():
+    """Keyword arguments that stop child processes from flashing a console window"""
+    if sys.platform != 'win32':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {'startupinfo': startupinfo, 'creationflags': subprocess.CREATE_NO_WINDOW}
+
+
+def run_hidden(args, timeout=5):
+    """Run a console command without a window, recording spawn count and duration"""
+    metrics.inc('process.spawns')
+    with metrics.timer(f"process.{args[0]}"):
+        return subprocess.run(
+            args,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            **hidden_subprocess_kwargs()
+        )
+
+
+class Settings:
+    """
+    Typed application settings.
+    
+    SCHEMA maps every field to (type, default, constraint), where the
+    constraint is a (min, max) range for numbers or the allowed choices for
+    strings. Read fields as plain attributes; change them through
+    SettingsManager so they are validated, saved and announced.
+    """
+    
+    VERSION = 2
+    SCHEMA = {
+        "auto_hotspot_enabled": (bool, True, None),
+        "check_interval": (int, 3, (1, 3600)),  # seconds
+        "max_check_interval": (int, 60, (1, 86400)),  # seconds - ceiling for backoff while state is stable
+        "pause_polling_when_idle": (bool, True, None),
+        "idle_threshold": (int, 600, (1, 86400)),  # seconds without input before the machine counts as idle
+        "pause_polling_on_battery": (bool, True, None),
+        "auto_disable_on_wifi_disconnect": (bool, False, None),
+        "show_notifications": (bool, True, None),
+        "debounce_time": (int, 10, (0, 86400)),  # seconds before re-enabling after manual disable
+        "battery_threshold": (int, 0, (0, 100)),  # 0 = disabled
+        "trace_enabled": (bool, True, None),  # binary snapshot/decision trace for --replay-trace
+        "log_level": (str, "INFO", ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")),
+        "log_max_size_mb": (int, 5, (1, 1024)),  # rotate the log at this size...
+        "log_max_age_days": (int, 7, (0, 3650)),  # ...or age (0 = never)
+        "log_backup_count": (int, 5, (0, 100)),  # compressed segments kept
+        "update_check_interval": (int, 24, (0, 8760)),  # hours between update checks (0 = never)
+        "telemetry_interval": (int, 2, (0, 3600)),  # seconds between client/throughput samples (0 = off)
+        "history_enabled": (bool, True, None),  # status history in history/*.bin
+        "history_tick_days": (int, 2, (0, 30)),  # per-tick samples kept (sized for one tick every 3 s)
+        "history_hour_days": (int, 90, (1, 3650)),  # hourly rollups kept
+        "history_day_days": (int, 1825, (1, 36500)),  # daily rollups kept
+    }
+    __slots__ = tuple(SCHEMA)
+    
+    def __init__(self):
+        for name, (_, default, _) in self.SCHEMA.items():
+            setattr(self, name, default)
+    
+    @classmethod
+    def validate(cls, name, value):
+        """Return `value` as the field's type; raises KeyError/ValueError if it does not fit the schema"""
+        kind, _, constraint = cls.SCHEMA[name]
+        if kind is bool:
+            if value in (0, 1) and not isinstance(value, str):
+                return bool(value)
+        elif kind is int:
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value == int(value):
+                value = int(value)
+                if constraint[0] <= value <= constraint[1]:
+                    return value
+        elif kind is str and isinstance(value, str):
+            value = value.upper()
+            if value in constraint:
+                return value
+        raise ValueError(f"Invalid value for {name}: {value!r}")
+    
+    @classmethod
+    def migrate(cls, data):
+        """Bring a settings dict loaded from disk up to VERSION (in place); returns True if it changed"""
+        version = data.get("settings_version", 1)
+        if version >= cls.VERSION:
+            return False
+        if version < 2:
+            data.pop("last_manual_disable_time", None)  # was never read back
+        data["settings_version"] = cls.VERSION
+        return True
+    
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.SCHEMA}
+
+
+_MISSING = object()
+
+
 class SettingsManager:
-    """Manage application settings with JSON persistence"""
+    """
+    Manage application settings with JSON persistence.
+    
+    `settings` is a typed Settings object for reading. Changes made with
+    set()/update() are validated, announced to subscribers and written in
+    the background SAVE_DELAY seconds after the last one, so a burst of
+    updates costs one write; unchanged values are not written at all. The
+    file is replaced atomically (temp file, then rename).
+    """
+    
+    SAVE_DELAY = 1.0  # seconds
     
     def __init__(self):
         self.settings_dir = Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper"
         self.settings_dir.mkdir(parents=True, exist_ok=True)
         self.settings_file = self.settings_dir / "settings.json"
+        self.lock = threading.RLock()  # guards settings, dirty and the save timer
+        self.write_lock = threading.Lock()  # one file write at a time
+        self.dirty = False
+        self.batch_depth = 0
+        self.batch_changes = set()
+        self.save_timer = None
+        self.subscribers = []
+        self.extra = {}  # keys this version does not know, kept so they survive a save
         self.settings = self.load_settings()
+        atexit.register(self.save_settings)  # flush anything pending
     
     def load_settings(self):
-        """Load settings from JSON file"""
-        default_settings = {
-            "auto_hotspot_enabled": True,
-            "check_interval": 3,  # seconds
-            "auto_disable_on_wifi_disconnect": False,
-            "show_notifications": True,
-            "debounce_time": 10,  # seconds before re-enabling after manual disable
-            "battery_threshold": 0,  # 0 = disabled
-            "last_manual_disable_time": None
-        }
-        
-        if self.settings_file.exists():
+        """Load settings from JSON file, migrating and validating them"""
+        settings = Settings()
+        if not self.settings_file.exists():
+            return settings
+        try:
+            with open(self.settings_file, 'r') as f:
+                loaded = json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading settings: {e}")
+            return settings
+        
+        if Settings.migrate(loaded):
+            logging.info(f"Settings migrated to version {Settings.VERSION}")
+            self.dirty = True
+        for key, value in loaded.items():
+            if key == "settings_version":
+                continue
+            if key not in Settings.SCHEMA:
+                self.extra[key] = value
+                continue
             try:
-                with open(self.settings_file, 'r') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to add any new settings
-                    default_settings.update(loaded)
-                    logging.info("Settings loaded successfully")
-            except Exception as e:
-                logging.error(f"Error loading settings: {e}")
-        
-        return default_settings
+                setattr(settings, key, Settings.validate(key, value))
+            except ValueError as e:
+                logging.warning(f"{e} - using default {getattr(settings, key)!r}")
+                self.dirty = True
+        logging.info("Settings loaded successfully")
+        return settings
     
     def save_settings(self):
-        """Save settings to JSON file"""
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-            logging.info("Settings saved successfully")
-        except Exception as e:
-            logging.error(f"Error saving settings: {e}")
+        """Write pending changes now (atomically); does nothing if there are none"""
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return
+            data = json.dumps({**self.extra, **self.settings.to_dict(), "settings_version": Settings.VERSION},
+                              indent=4)
+            self.dirty = False
+        
+        with self.write_lock:
+            temp_file = self.settings_file.with_name(self.settings_file.name + ".tmp")
+            try:
+                with open(temp_file, 'w') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.settings_file)
+                metrics.inc('settings.saves')
+                logging.debug("Settings saved successfully")
+            except Exception as e:
+                logging.error(f"Error saving settings: {e}")
+                with self.lock:
+                    self.dirty = True
+    
+    def _schedule_save(self):
+        """(Re)start the debounced background save"""
+        if self.save_timer is not None:
+            self.save_timer.cancel()
+        self.save_timer = threading.Timer(self.SAVE_DELAY, self.save_settings)
+        self.save_timer.daemon = True
+        self.save_timer.start()
     
     def get(self, key, default=None):
-        """Get a setting value"""
-        return self.settings.get(key, default)
+        """Get a setting value by name (hot paths read `settings` attributes instead)"""
+        if key in Settings.SCHEMA:
+            return getattr(self.settings, key)
+        return self.extra.get(key, default)
+    
+    def subscribe(self, callback):
+        """Call `callback(changed_keys)` after settings change (on the thread that changed them)"""
+        self.subscribers.append(callback)
+    
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+    
+    def _notify(self, changed):
+        for callback in list(self.subscribers):
+            try:
+                callback(frozenset(changed))
+            except Exception as e:
+                logging.error(f"Error in settings subscriber: {e}")
     
     def set(self, key, value):
-        """Set a setting value and save"""
-        self.settings[key] = value
-        self.save_settings()
+        """
+        Set a setting value; returns False if it was unchanged (and nothing
+        is saved). Raises ValueError if the value does not fit the schema.
+        """
+        if key in Settings.SCHEMA:
+            value = Settings.validate(key, value)
+        with self.lock:
+            current = self.get(key, _MISSING)
+            if current == value and type(current) is type(value):
+                return False
+            if key in Settings.SCHEMA:
+                setattr(self.settings, key, value)
+            else:
+                self.extra[key] = value
+            self.dirty = True
+            if self.batch_depth:
+                self.batch_changes.add(key)
+                return True
+            self._schedule_save()
+        self._notify((key,))
+        return True
+    
+    @contextmanager
+    def batch(self):
+        """Group several set() calls into one save and one notification"""
+        with self.lock:
+            self.batch_depth += 1
+        changed = ()
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    changed, self.batch_changes = self.batch_changes, set()
+                    if self.dirty:
+                        self._schedule_save()
+            if changed:
+                self._notify(changed)
+    
+    def update(self, values):
+        """Set several values at once; returns the keys that changed"""
+        with self.batch():
+            return [key for key, value in values.items() if self.set(key, value)]
 
 
 class UpdateChecker(QThread):
-    """Check for updates on GitHub"""
+    """
+    Check GitHub for a newer release in the background.
+    
+    The last release seen is cached on disk with its ETag and Last-Modified
+    headers, so repeat checks are conditional requests (a 304 costs no API
+    quota) and a check sooner than `min_interval` after the previous one is
+    answered from the cache without touching the network.
+    """
     update_available = Signal(str, str)  # version, url
     
-    def __init__(self):
+    URL = "https://api.github.com/repos/Moanesbbr/HotspotKeeper/releases/latest"
+    TIMEOUT = 5  # seconds
+    
+    def __init__(self, cache_path=None, min_interval=0, url=None):
         super().__init__()
         self.current_version = "1.1.0"
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.min_interval = min_interval  # seconds
+        self.url = url or self.URL
+        self.result = None  # 'cached', 'not_modified' or 'fetched' once run
     
     def run(self):
         try:
-            # Check GitHub API for latest release
-            response = requests.get(
-                "https://api.github.com/repos/Moanesbbr/HotspotKeeper/releases/latest",
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                latest_version = data.get("tag_name", "").replace("v", "")
-                
-                if latest_version and self.compare_versions(latest_version, self.current_version):
-                    download_url = data.get("html_url", "")
-                    self.update_available.emit(latest_version, download_url)
-                    logging.info(f"Update available: {latest_version}")
+            cache = self.load_cache()
+            if time.time() - cache.get("checked_at", 0) < self.min_interval:
+                metrics.inc('update.skipped')
+                self.result = 'cached'
+            else:
+                cache = self.fetch(cache)
+            
+            latest_version = cache.get("tag_name", "").replace("v", "")
+            if latest_version and self.compare_versions(latest_version, self.current_version):
+                self.update_available.emit(latest_version, cache.get("html_url", ""))
+                logging.info(f"Update available: {latest_version}")
         except Exception as e:
             logging.warning(f"Update check failed: {e}")
     
+    def fetch(self, cache):
+        """Conditional GET of the latest release; returns the updated cache"""
+        import urllib.error
+        import urllib.request  # much lighter than requests, and only loaded on this thread
+        
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": f"HotspotKeeper/{self.current_version}",
+        }
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+        
+        metrics.inc('update.requests')
+        with metrics.timer('update.request'):
+            try:
+                request = urllib.request.Request(self.url, headers=headers)
+                with urllib.request.urlopen(request, timeout=self.TIMEOUT) as response:
+                    data = json.loads(response.read())
+                    cache = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "tag_name": data.get("tag_name", ""),
+                        "html_url": data.get("html_url", ""),
+                    }
+                self.result = 'fetched'
+            except urllib.error.HTTPError as e:
+                if e.code != 304:
+                    # Rate limited or an API error: back off for the full interval.
+                    # Network errors (URLError) are not recorded, so they retry sooner
+                    cache["checked_at"] = time.time()
+                    self.save_cache(cache)
+                    raise
+                metrics.inc('update.not_modified')
+                self.result = 'not_modified'
+        
+        cache["checked_at"] = time.time()
+        self.save_cache(cache)
+        return cache
+    
+    def load_cache(self):
+        """The cached release and validators, or {} if there is none"""
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable update cache: {e}")
+            return {}
+    
+    def save_cache(self, cache):
+        """Write the cache atomically (temporary file + rename)"""
+        if self.cache_path is None:
+            return
+        temp_file = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(cache, f, indent=4)
+            os.replace(temp_file, self.cache_path)
+        except Exception as e:
+            logging.error(f"Error saving update cache: {e}")
+    
     def compare_versions(self, latest, current):
         """Compare version strings (simple comparison)"""
         try:
@@ -157,181 +715,730 @@ class UpdateChecker(QThread):
             return False
 
 
-class BatteryMonitor:
-    """Monitor battery level"""
-    
+class PowerShellHost:
+    """
+    Long-lived PowerShell process that runs scripts on request.
+
+    Starting powershell.exe costs several hundred milliseconds (plus the WinRT
+    type load), so the app keeps one host alive and sends it scripts instead.
+
+    Protocol (one JSON document per line):
+        request:  {"id": 1, "script": "..."}   or   {"id": 0, "op": "exit"}
+        response: {"id": 1, "code": 0, "stdout": "...", "stderr": "..."}
+
+    A script succeeds (code 0) unless it throws. Scripts must not call `exit`,
+    which would terminate the host. Any process speaking the same protocol can
+    be passed as `command`, e.g. a fake host script when testing on Linux.
+    """
+
+    HOST_SCRIPT = r'''
+    $ErrorActionPreference = 'Stop'
+    $ProgressPreference = 'SilentlyContinue'
+    [Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+
+    # Load the WinRT types once for the lifetime of the host
+    $null = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]
+    $null = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]
+
+    # Helper for awaiting WinRT IAsyncOperation<T> results from scripts
+    Add-Type -AssemblyName System.Runtime.WindowsRuntime
+    $global:WinRtAsTask = ([System.WindowsRuntimeSystemExtensions].GetMethods() | Where-Object {
+        $_.Name -eq 'AsTask' -and $_.GetParameters().Count -eq 1 -and
+        $_.GetParameters()[0].ParameterType.Name -eq 'IAsyncOperation`1'
+    })[0]
+
+    # Returns the operation result, or $null if it did not complete within TimeoutMs
+    function global:Wait-WinRtOperation($Operation, $ResultType, $TimeoutMs) {
+        $task = $global:WinRtAsTask.MakeGenericMethod($ResultType).Invoke($null, @($Operation))
+        if ($task.Wait($TimeoutMs)) { return $task.Result }
+        return $null
+    }
+
+    while ($true) {
+        $line = [Console]::In.ReadLine()
+        if ($null -eq $line) { break }
+        if ($line.Trim() -eq '') { continue }
+
+        $request = $line | ConvertFrom-Json
+        if ($request.op -eq 'exit') { break }
+
+        $out = New-Object System.Collections.Generic.List[string]
+        $err = New-Object System.Collections.Generic.List[string]
+        $code = 0
+        try {
+            $block = [scriptblock]::Create($request.script)
+            foreach ($item in (& $block)) {
+                $out.Add(($item | Out-String).TrimEnd())
+            }
+        } catch {
+            $code = 1
+            $err.Add($_.Exception.Message)
+        }
+
+        $response = @{
+            id = $request.id
+            code = $code
+            stdout = ($out -join "`n")
+            stderr = ($err -join "`n")
+        }
+        [Console]::Out.WriteLine(($response | ConvertTo-Json -Compress))
+        [Console]::Out.Flush()
+    }
+    '''
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, command=None):
+        if command is None:
+            encoded = base64.b64encode(self.HOST_SCRIPT.encode('utf-16-le')).decode('ascii')
+            command = ['powershell', '-NoProfile', '-NonInteractive',
+                       '-ExecutionPolicy', 'Bypass', '-EncodedCommand', encoded]
+        self.command = command
+        self.process = None
+        self.responses = None
+        self.next_id = 1
+        self.restart_count = 0
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @classmethod
+    def instance(cls):
+        """Get the shared host, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def install(cls, host):
+        """Replace the shared host (e.g. with one running a fake host script)"""
+        with cls._instance_lock:
+            previous = cls._instance
+            cls._instance = host
+        if previous is not None and previous is not host:
+            previous.shutdown()
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def _start(self):
+        """Launch the host process and its stdout reader thread"""
+        if self.process is not None:
+            self.restart_count += 1
+            logging.warning(f"Restarting PowerShell host (restart #{self.restart_count})")
+            metrics.inc('powershell.restarts')
+            self._kill()
+
+        metrics.inc('process.spawns')
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            **hidden_subprocess_kwargs()
+        )
+        # Each process gets its own queue so late replies from a killed host are never mixed in
+        self.responses = queue.Queue()
+        reader = threading.Thread(
+            target=self._read_responses,
+            args=(self.process.stdout, self.responses),
+            name="PowerShellHostReader",
+            daemon=True
+        )
+        reader.start()
+        logging.info(f"PowerShell host started (pid {self.process.pid})")
+
     @staticmethod
-    def get_battery_percentage():
-        """Get current battery percentage"""
+    def _read_responses(stream, responses):
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            result = subprocess.run(
-                ['powershell', '-Command', 
-                 '(Get-WmiObject Win32_Battery).EstimatedChargeRemaining'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            if result.stdout.strip():
-                return int(result.stdout.strip())
-            return 100  # Assume full if not on battery
-        except Exception as e:
-            logging.warning(f"Error getting battery level: {e}")
-            return 100
-    
-    @staticmethod
-    def is_plugged_in():
-        """Check if device is plugged in"""
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    responses.put(json.loads(line))
+                except ValueError:
+                    logging.debug(f"Ignoring non-protocol output from PowerShell host: {line[:200]}")
+        except Exception:
+            pass
+        responses.put(None)  # EOF - host exited
+
+    def _kill(self):
+        if self.process is None:
+            return
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            result = subprocess.run(
-                ['powershell', '-Command', 
-                 '(Get-WmiObject Win32_Battery).BatteryStatus'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            # BatteryStatus: 2 = AC Power
-            if result.stdout.strip():
-                return '2' in result.stdout.strip()
-            return True  # Assume plugged in if can't determine
-        except Exception as e:
-            logging.warning(f"Error checking power status: {e}")
-            return True
+            self.process.kill()
+            self.process.wait(timeout=2)
+        except Exception:
+            pass
 
+    def _send(self, message):
+        self.process.stdin.write(json.dumps(message) + '\n')
+        self.process.stdin.flush()
 
-class NetworkMonitor(QThread):
-    """Monitor network connectivity changes"""
-    wifi_connected = Signal()
-    wifi_disconnected = Signal()
+    def run(self, script, timeout=5):
+        """
+        Run a script in the host and return a subprocess.CompletedProcess.
+
+        Raises subprocess.TimeoutExpired if no reply arrives within `timeout`
+        seconds; the stuck host is killed and restarted on the next request.
+        """
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("PowerShell host has been shut down")
+
+            request_id = self.next_id
+            self.next_id += 1
+            message = {'id': request_id, 'script': script}
+
+            if not self.is_running():
+                self._start()
+            try:
+                self._send(message)
+            except (BrokenPipeError, OSError, ValueError):
+                # Host died between requests - restart once and resend
+                self._start()
+                self._send(message)
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    response = self.responses.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    logging.warning(f"PowerShell host request timed out after {timeout}s")
+                    metrics.inc('powershell.timeouts')
+                    self._kill()
+                    raise subprocess.TimeoutExpired(self.command[0], timeout)
+
+                if response is None:
+                    logging.warning("PowerShell host exited while handling a request")
+                    metrics.inc('powershell.crashes')
+                    self._kill()  # reap it so the next request starts a new host
+                    return subprocess.CompletedProcess(self.command, -1, '', 'PowerShell host exited')
+                if response.get('id') == request_id:
+                    return subprocess.CompletedProcess(
+                        self.command,
+                        response.get('code', 1),
+                        response.get('stdout', ''),
+                        response.get('stderr', '')
+                    )
+
+    def shutdown(self, timeout=2):
+        """
+        Ask the host to exit, killing it if it does not stop in time.
+        
+        If a request still holds the host after `timeout` seconds (e.g. a
+        tethering operation), the host is killed under it; that request
+        then returns code -1.
+        """
+        if not self.lock.acquire(timeout=timeout):
+            self.closed = True
+            self._kill()
+            logging.info("PowerShell host killed (busy at shutdown)")
+            return
+        try:
+            self.closed = True
+            if not self.is_running():
+                return
+            try:
+                self._send({'id': 0, 'op': 'exit'})
+                self.process.stdin.close()
+                self.process.wait(timeout=timeout)
+                logging.info("PowerShell host stopped")
+            except Exception:
+                self._kill()
+                logging.info("PowerShell host killed")
+        finally:
+            self.lock.release()
+
+
+class PowerStatus(namedtuple('PowerStatus', ['battery_level', 'plugged_in'])):
+    """Battery percentage and AC state, read together"""
+    __slots__ = ()
+
+
+class PowerStatusProvider:
+    """
+    Source of PowerStatus values.
+    
+    `read` returns the current status; subscribers registered with
+    `subscribe` are called with the new PowerStatus whenever it changes, so
+    consumers can react to pushes instead of polling.
+    """
+    
+    def __init__(self):
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.last_status = None
+    
+    def read(self):
+        raise NotImplementedError
+    
+    def subscribe(self, callback):
+        with self.lock:
+            self.subscribers.append(callback)
+    
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+    
+    def _publish(self, status):
+        """Record a new status and notify subscribers if it changed"""
+        with self.lock:
+            changed = status != self.last_status
+            self.last_status = status
+            subscribers = list(self.subscribers)
+        if changed:
+            for callback in subscribers:
+                try:
+                    callback(status)
+                except Exception as e:
+                    logging.error(f"Power status subscriber failed: {e}")
+    
+    def close(self):
+        pass
+
+
+class SystemPowerStatusProvider(PowerStatusProvider):
+    """
+    Windows provider - GetSystemPowerStatus returns both values in one cheap
+    call, and power setting notifications (AC/DC source, battery percentage)
+    push changes so `read` can serve the cached value.
+    """
+    
+    DEVICE_NOTIFY_CALLBACK = 2
+    GUID_ACDC_POWER_SOURCE = '{5D3E9A59-E9D5-4B00-A6BD-FF34FF516548}'
+    GUID_BATTERY_PERCENTAGE_REMAINING = '{A7AD8041-B45A-4CAE-87A3-EECBB468A9E1}'
     
     def __init__(self):
         super().__init__()
-        self.running = True
-        self.was_connected = False
+        from ctypes import wintypes
+        
+        class SYSTEM_POWER_STATUS(ctypes.Structure):
+            _fields_ = [('ACLineStatus', ctypes.c_ubyte),
+                        ('BatteryFlag', ctypes.c_ubyte),
+                        ('BatteryLifePercent', ctypes.c_ubyte),
+                        ('SystemStatusFlag', ctypes.c_ubyte),
+                        ('BatteryLifeTime', wintypes.DWORD),
+                        ('BatteryFullLifeTime', wintypes.DWORD)]
+        
+        class GUID(ctypes.Structure):
+            _fields_ = [('Data1', wintypes.DWORD), ('Data2', wintypes.WORD),
+                        ('Data3', wintypes.WORD), ('Data4', ctypes.c_ubyte * 8)]
+        
+        CALLBACK = ctypes.WINFUNCTYPE(wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG, ctypes.c_void_p)
+        
+        class DEVICE_NOTIFY_SUBSCRIBE_PARAMETERS(ctypes.Structure):
+            _fields_ = [('Callback', CALLBACK), ('Context', ctypes.c_void_p)]
+        
+        self.SYSTEM_POWER_STATUS = SYSTEM_POWER_STATUS
+        self.kernel32 = ctypes.WinDLL('kernel32')
+        self.ole32 = ctypes.WinDLL('ole32')
+        self.powrprof = ctypes.WinDLL('powrprof')
+        
+        # Keep the callback and its parameters alive for as long as we are registered
+        self.callback = CALLBACK(self._on_power_setting_change)
+        self.parameters = DEVICE_NOTIFY_SUBSCRIBE_PARAMETERS(self.callback, None)
+        self.registrations = []
+        
+        for guid_text in (self.GUID_ACDC_POWER_SOURCE, self.GUID_BATTERY_PERCENTAGE_REMAINING):
+            guid = GUID()
+            self.ole32.CLSIDFromString(ctypes.c_wchar_p(guid_text), ctypes.byref(guid))
+            handle = ctypes.c_void_p()
+            result = self.powrprof.PowerSettingRegisterNotification(
+                ctypes.byref(guid), self.DEVICE_NOTIFY_CALLBACK,
+                ctypes.byref(self.parameters), ctypes.byref(handle))
+            if result == 0:
+                self.registrations.append(handle)
+            else:
+                logging.warning(f"Power notifications unavailable for {guid_text}: error {result}")
         
-    def run(self):
-        while self.running:
-            connected = self.check_wifi_connection()
-            
-            if connected and not self.was_connected:
-                self.wifi_connected.emit()
-                self.was_connected = True
-                logging.info("WiFi connected")
-            elif not connected and self.was_connected:
-                self.wifi_disconnected.emit()
-                self.was_connected = False
-                logging.info("WiFi disconnected")
-                
-            self.msleep(2000)  # Check every 2 seconds
+        self._publish(self._query())
     
-    def check_wifi_connection(self):
-        """Check if WiFi is connected using netsh"""
+    def _query(self):
+        status = self.SYSTEM_POWER_STATUS()
+        if not self.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+            raise ctypes.WinError()
+        percent = 100 if status.BatteryLifePercent == 255 else status.BatteryLifePercent  # 255 = unknown
+        return PowerStatus(percent, status.ACLineStatus != 0)  # 0 = offline, 1 = online, 255 = unknown
+    
+    def _on_power_setting_change(self, context, event_type, setting):
         try:
-            # Hide console window
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            result = subprocess.run(
-                ['netsh', 'wlan', 'show', 'interfaces'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            return 'State' in result.stdout and 'connected' in result.stdout.lower()
+            self._publish(self._query())
         except Exception as e:
-            logging.error(f"Error checking WiFi: {e}")
-            return False
+            logging.warning(f"Error reading power status: {e}")
+        return 0
     
-    def stop(self):
-        self.running = False
+    def read(self):
+        # Without both notifications registered we cannot trust the cache
+        if len(self.registrations) == 2 and self.last_status is not None:
+            return self.last_status
+        status = self._query()
+        self._publish(status)
+        return status
+    
+    def close(self):
+        for handle in self.registrations:
+            self.powrprof.PowerSettingUnregisterNotification(handle)
+        self.registrations = []
 
 
-class HotspotManager:
-    """Manage Windows Mobile Hotspot"""
+class ManualPowerStatusProvider(PowerStatusProvider):
+    """Provider whose value is set with `set()` - used by the simulator and tests"""
     
-    @staticmethod
-    def is_hotspot_enabled():
-        """
-        Check if hotspot is currently enabled - improved detection with multiple methods
-        
-        FIXED: Now uses multiple detection strategies:
-        1. PowerShell WinRT API (most reliable for Windows 10/11)
-        2. Network adapter check (looks for Microsoft Hosted Network adapters)
-        3. Legacy hosted network check (fallback)
-        """
+    def __init__(self, battery_level=100, plugged_in=True):
+        super().__init__()
+        self.last_status = PowerStatus(battery_level, plugged_in)
+    
+    def read(self):
+        return self.last_status
+    
+    def set(self, battery_level=None, plugged_in=None):
+        current = self.last_status
+        self._publish(PowerStatus(
+            current.battery_level if battery_level is None else battery_level,
+            current.plugged_in if plugged_in is None else plugged_in
+        ))
+
+
+def create_power_status_provider():
+    """GetSystemPowerStatus on Windows, a fixed mains-powered status elsewhere"""
+    if sys.platform == 'win32':
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            # ===== METHOD 1: PowerShell WinRT API (MOST RELIABLE) =====
-            # This directly queries the TetheringOperationalState
-            script = '''
-            try {
-                $connectionProfile = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetInternetConnectionProfile()
-                $tetheringManager = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]::CreateFromConnectionProfile($connectionProfile)
-                
-                # Get the current operational state
-                # 0 = Unknown, 1 = On, 2 = Off, 3 = InTransition
-                $state = $tetheringManager.TetheringOperationalState
-                
-                if ($state -eq 1) {
-                    Write-Output "ENABLED"
-                } else {
-                    Write-Output "DISABLED"
-                }
-                exit 0
-            } catch {
-                # If WinRT API fails, output error for fallback methods
-                Write-Output "ERROR"
-                exit 1
-            }
-            '''
-            
-            result_ps = subprocess.run(
-                ['powershell', '-Command', script],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            # Check PowerShell method result
-            if result_ps.returncode == 0 and 'ENABLED' in result_ps.stdout:
-                logging.debug("Hotspot detected as ENABLED via PowerShell WinRT API")
-                return True
-            elif result_ps.returncode == 0 and 'DISABLED' in result_ps.stdout:
-                logging.debug("Hotspot detected as DISABLED via PowerShell WinRT API")
-                # Don't return False yet - try fallback methods
-                pass
-            
-            # ===== METHOD 2: Network Adapter Check (FALLBACK) =====
-            # Look for Microsoft-hosted network adapters
-            result_adapter = subprocess.run(
-                ['netsh', 'interface', 'show', 'interface'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            return SystemPowerStatusProvider()
+        except Exception as e:
+            logging.warning(f"System power status unavailable: {e}")
+    return ManualPowerStatusProvider()
+
+
+class TetheringResult(namedtuple('TetheringResult', ['action', 'success', 'status', 'message', 'elapsed'])):
+    """Outcome of one enable/disable operation (status is the WinRT status name)"""
+    __slots__ = ()
+
+
+class TetheringState:
+    """TetheringOperationalState values"""
+    UNKNOWN = 0
+    ON = 1
+    OFF = 2
+    IN_TRANSITION = 3
+
+
+class DeviceStatus(namedtuple('DeviceStatus', [
+        'wifi_connected', 'ssid', 'tethering_state', 'client_count', 'battery_level', 'plugged_in'])):
+    """Everything one status probe reports (ssid is None when not connected)"""
+    __slots__ = ()
+    
+    @property
+    def hotspot_enabled(self):
+        return self.tethering_state == TetheringState.ON
+
+
+class TrafficCounters(namedtuple('TrafficCounters', ['bytes_received', 'bytes_sent'])):
+    """Cumulative byte counters of the hosted adapter (received from / sent to the clients)"""
+    __slots__ = ()
+
+
+class HostedAdapterCounters:
+    """
+    Byte counters of the virtual adapter Windows shares the connection on
+    (Wi-Fi Direct for Mobile Hotspot, Hosted Network for the legacy
+    hostednetwork), read with one in-process GetIfTable2 call.
+    """
+    DESCRIPTIONS = ('Wi-Fi Direct Virtual Adapter', 'Hosted Network Virtual Adapter')
+    IF_OPER_STATUS_UP = 1
+    
+    def __init__(self):
+        from ctypes import wintypes
+        
+        class GUID(ctypes.Structure):
+            _fields_ = [('Data1', wintypes.DWORD), ('Data2', wintypes.WORD),
+                        ('Data3', wintypes.WORD), ('Data4', ctypes.c_ubyte * 8)]
+        
+        class MIB_IF_ROW2(ctypes.Structure):
+            _fields_ = [('InterfaceLuid', ctypes.c_uint64),
+                        ('InterfaceIndex', wintypes.ULONG),
+                        ('InterfaceGuid', GUID),
+                        ('Alias', ctypes.c_wchar * 257),
+                        ('Description', ctypes.c_wchar * 257),
+                        ('PhysicalAddressLength', wintypes.ULONG),
+                        ('PhysicalAddress', ctypes.c_ubyte * 32),
+                        ('PermanentPhysicalAddress', ctypes.c_ubyte * 32),
+                        ('Mtu', wintypes.ULONG),
+                        ('Type', wintypes.ULONG),
+                        ('TunnelType', wintypes.ULONG),
+                        ('MediaType', wintypes.ULONG),
+                        ('PhysicalMediumType', wintypes.ULONG),
+                        ('AccessType', wintypes.ULONG),
+                        ('DirectionType', wintypes.ULONG),
+                        ('InterfaceAndOperStatusFlags', ctypes.c_ubyte),
+                        ('OperStatus', wintypes.ULONG),
+                        ('AdminStatus', wintypes.ULONG),
+                        ('MediaConnectState', wintypes.ULONG),
+                        ('NetworkGuid', GUID),
+                        ('ConnectionType', wintypes.ULONG),
+                        ('TransmitLinkSpeed', ctypes.c_uint64),
+                        ('ReceiveLinkSpeed', ctypes.c_uint64),
+                        ('InOctets', ctypes.c_uint64),
+                        ('InUcastPkts', ctypes.c_uint64),
+                        ('InNUcastPkts', ctypes.c_uint64),
+                        ('InDiscards', ctypes.c_uint64),
+                        ('InErrors', ctypes.c_uint64),
+                        ('InUnknownProtos', ctypes.c_uint64),
+                        ('InUcastOctets', ctypes.c_uint64),
+                        ('InMulticastOctets', ctypes.c_uint64),
+                        ('InBroadcastOctets', ctypes.c_uint64),
+                        ('OutOctets', ctypes.c_uint64),
+                        ('OutUcastPkts', ctypes.c_uint64),
+                        ('OutNUcastPkts', ctypes.c_uint64),
+                        ('OutDiscards', ctypes.c_uint64),
+                        ('OutErrors', ctypes.c_uint64),
+                        ('OutUcastOctets', ctypes.c_uint64),
+                        ('OutMulticastOctets', ctypes.c_uint64),
+                        ('OutBroadcastOctets', ctypes.c_uint64),
+                        ('OutQLen', ctypes.c_uint64)]
+        
+        class MIB_IF_TABLE2(ctypes.Structure):
+            _fields_ = [('NumEntries', wintypes.ULONG),
+                        ('Table', MIB_IF_ROW2 * 1)]
+        
+        self.MIB_IF_ROW2 = MIB_IF_ROW2
+        self.MIB_IF_TABLE2 = MIB_IF_TABLE2
+        self.iphlpapi = ctypes.WinDLL('iphlpapi')
+        self.iphlpapi.GetIfTable2.argtypes = [ctypes.POINTER(ctypes.POINTER(MIB_IF_TABLE2))]
+        self.iphlpapi.FreeMibTable.argtypes = [ctypes.c_void_p]
+    
+    def read(self):
+        """Counters summed over the hosted adapters that are up, or None if there are none"""
+        table = ctypes.POINTER(self.MIB_IF_TABLE2)()
+        result = self.iphlpapi.GetIfTable2(ctypes.byref(table))
+        if result != 0:
+            raise ctypes.WinError(result)
+        try:
+            count = table.contents.NumEntries
+            rows = ctypes.cast(table.contents.Table, ctypes.POINTER(self.MIB_IF_ROW2 * count)).contents
+            received = sent = 0
+            found = False
+            for row in rows:
+                if row.OperStatus == self.IF_OPER_STATUS_UP and \
+                        any(name in row.Description for name in self.DESCRIPTIONS):
+                    received += row.InOctets
+                    sent += row.OutOctets
+                    found = True
+            return TrafficCounters(received, sent) if found else None
+        finally:
+            self.iphlpapi.FreeMibTable(table)
+
+
+class HotspotBackend:
+    """
+    Interface for querying and controlling WiFi, tethering and power state.
+    
+    HotspotManager, NetworkMonitor and BatteryMonitor all go through the
+    shared backend returned by `instance()`. Implementations:
+    
+    - SubprocessBackend: netsh and PowerShell (works everywhere on Windows)
+    - NativeBackend: in-process WinRT projection and wlanapi.dll via ctypes
+    - SimulatedBackend: in-memory state for benchmarks and runs off Windows
+    
+    Power state always comes from a PowerStatusProvider (`power`).
+    """
+    name = 'base'
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def instance(cls):
+        """Get the shared backend, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = create_hotspot_backend()
+                logging.info(f"Using {cls._instance.name} backend")
+            return cls._instance
+    
+    @classmethod
+    def install(cls, backend):
+        """Replace the shared backend (e.g. with a SimulatedBackend)"""
+        with cls._instance_lock:
+            previous = cls._instance
+            cls._instance = backend
+        if previous is not None and previous is not backend:
+            previous.close()
+    
+    def __init__(self, power=None):
+        self.power = power if power is not None else create_power_status_provider()
+        self.hosted_adapter = None  # HostedAdapterCounters, created on first read_traffic
+    
+    def read_status(self):
+        """Everything the status tick needs, as one DeviceStatus"""
+        power = self.power_status()
+        return DeviceStatus(
+            wifi_connected=self.is_wifi_connected(),
+            ssid=None,
+            tethering_state=TetheringState.ON if self.is_hotspot_enabled() else TetheringState.OFF,
+            client_count=0,
+            battery_level=power.battery_level,
+            plugged_in=power.plugged_in
+        )
+    
+    def is_wifi_connected(self):
+        raise NotImplementedError
+    
+    def is_hotspot_enabled(self):
+        raise NotImplementedError
+    
+    def set_tethering(self, enable, timeout=30):
+        """Start or stop tethering, wait for the outcome and return a TetheringResult"""
+        raise NotImplementedError
+    
+    def read_clients(self):
+        """Number of tethered clients, or None if only read_status can tell"""
+        return None
+    
+    def read_traffic(self):
+        """Byte counters of the hosted adapter (a TrafficCounters), or None while it is down"""
+        if sys.platform != 'win32':
+            return None
+        if self.hosted_adapter is None:
+            self.hosted_adapter = HostedAdapterCounters()
+        return self.hosted_adapter.read()
+    
+    def power_status(self):
+        """Battery percentage and AC state in one call (a PowerStatus)"""
+        return self.power.read()
+    
+    def get_battery_percentage(self):
+        return self.power_status().battery_level
+    
+    def is_plugged_in(self):
+        return self.power_status().plugged_in
+    
+    def close(self):
+        self.power.close()
+
+
+class SubprocessBackend(HotspotBackend):
+    """
+    Query and control WiFi and tethering through the PowerShell host.
+    
+    One status script gathers WiFi state, SSID, tethering state and client
+    count as a single JSON document; netsh is only run as a fallback for a
+    section the WinRT APIs could not answer.
+    """
+    name = 'subprocess'
+    
+    # Sections of the status script: each fills in its fields of $status and
+    # leaves them $null if the WinRT call fails
+    WIFI_SECTION = '''
+    try {
+        # Connected WLAN profiles (connectivity level above None)
+        $wlan = @([Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetConnectionProfiles() | Where-Object {
+            $_.IsWlanConnectionProfile -and [int]$_.GetNetworkConnectivityLevel() -gt 0
+        })
+        $status.wifi = $wlan.Count -gt 0
+        if ($wlan.Count -gt 0) {
+            $status.ssid = $wlan[0].WlanConnectionProfileDetails.GetConnectedSsid()
+        }
+    } catch { }
+    '''
+    
+    TETHERING_SECTION = '''
+    try {
+        $connectionProfile = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetInternetConnectionProfile()
+        $tetheringManager = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]::CreateFromConnectionProfile($connectionProfile)
+        # 0 = Unknown, 1 = On, 2 = Off, 3 = InTransition
+        $status.tethering = [int]$tetheringManager.TetheringOperationalState
+        $status.clients = [int]$tetheringManager.ClientCount
+    } catch { }
+    '''
+    
+    SCRIPT_HEADER = '''
+    $status = @{ wifi = $null; ssid = $null; tethering = $null; clients = $null }
+    '''
+    SCRIPT_FOOTER = '''
+    $status | ConvertTo-Json -Compress
+    '''
+    
+    STATUS_SCRIPT = SCRIPT_HEADER + WIFI_SECTION + TETHERING_SECTION + SCRIPT_FOOTER
+    # The network monitor re-checks WiFi on every address change: skip the tethering query
+    WIFI_SCRIPT = SCRIPT_HEADER + WIFI_SECTION + SCRIPT_FOOTER
+    TETHERING_STATE_SCRIPT = SCRIPT_HEADER + TETHERING_SECTION + SCRIPT_FOOTER
+    
+    @staticmethod
+    def _run_status_script(script):
+        """Run a status script in the PowerShell host; returns its fields ({} on failure)"""
+        try:
+            result = PowerShellHost.instance().run(script, timeout=5)
+            if result.returncode == 0 and result.stdout.strip():
+                return json.loads(result.stdout.strip().splitlines()[-1])
+            logging.warning(f"Status script failed with code {result.returncode}: {result.stderr.strip()}")
+        except Exception as e:
+            logging.warning(f"Status script failed: {e}")
+        return {}
+    
+    def read_status(self):
+        """Run the status script once and parse it into a DeviceStatus"""
+        data = self._run_status_script(self.STATUS_SCRIPT)
+        
+        wifi_connected = data.get('wifi')
+        if wifi_connected is None:
+            wifi_connected = self._netsh_wifi_check()
+        
+        tethering_state = data.get('tethering')
+        if tethering_state is None:
+            tethering_state = TetheringState.ON if self._netsh_hotspot_check() else TetheringState.OFF
+        
+        power = self.power_status()
+        return DeviceStatus(
+            wifi_connected=bool(wifi_connected),
+            ssid=data.get('ssid'),
+            tethering_state=tethering_state,
+            client_count=data.get('clients') or 0,
+            battery_level=power.battery_level,
+            plugged_in=power.plugged_in
+        )
+    
+    def is_wifi_connected(self):
+        wifi_connected = self._run_status_script(self.WIFI_SCRIPT).get('wifi')
+        if wifi_connected is None:
+            return self._netsh_wifi_check()
+        return bool(wifi_connected)
+    
+    def is_hotspot_enabled(self):
+        tethering_state = self._run_status_script(self.TETHERING_STATE_SCRIPT).get('tethering')
+        if tethering_state is None:
+            return self._netsh_hotspot_check()
+        return tethering_state == TetheringState.ON
+    
+    @staticmethod
+    def _netsh_wifi_check():
+        """Fallback: check if WiFi is connected using netsh"""
+        try:
+            result = run_hidden(['netsh', 'wlan', 'show', 'interfaces'])
+            return 'State' in result.stdout and 'connected' in result.stdout.lower()
+        except Exception as e:
+            logging.error(f"Error checking WiFi: {e}")
+            return False
+    
+    @staticmethod
+    def _netsh_hotspot_check():
+        """
+        Fallback when the WinRT tethering query fails:
+        1. Network adapter check (looks for Microsoft Hosted Network adapters)
+        2. Legacy hosted network check
+        """
+        try:
+            # ===== METHOD 1: Network Adapter Check =====
+            # Look for Microsoft-hosted network adapters
+            result_adapter = run_hidden(['netsh', 'interface', 'show', 'interface'])
             
             # Look for various adapter name patterns (case-insensitive)
             adapter_output_lower = result_adapter.stdout.lower()
@@ -348,128 +1455,1632 @@ class HotspotManager:
                 logging.debug("Hotspot detected as ENABLED via network adapter check")
                 return True
             
-            # ===== METHOD 3: Legacy Hosted Network (FALLBACK) =====
-            result_legacy = subprocess.run(
-                ['netsh', 'wlan', 'show', 'hostednetwork'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            # ===== METHOD 2: Legacy Hosted Network =====
+            result_legacy = run_hidden(['netsh', 'wlan', 'show', 'hostednetwork'])
             
             if 'started' in result_legacy.stdout.lower():
                 logging.debug("Hotspot detected as ENABLED via legacy hosted network")
                 return True
             
             # All methods indicate disabled
-            logging.debug("Hotspot detected as DISABLED (all methods)")
+            logging.debug("Hotspot detected as DISABLED (all fallback methods)")
+            return False
+            
+        except Exception as e:
+            logging.error(f"Error checking hotspot status: {e}")
             return False
+    
+    # Awaits the WinRT operation; __METHOD__ and __TIMEOUT_MS__ are filled in per call
+    TETHERING_SCRIPT = '''
+    $connectionProfile = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetInternetConnectionProfile()
+    $tetheringManager = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]::CreateFromConnectionProfile($connectionProfile)
+    
+    $resultType = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringOperationResult,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]
+    $result = Wait-WinRtOperation ($tetheringManager.__METHOD__()) $resultType __TIMEOUT_MS__
+    
+    if ($null -eq $result) {
+        @{ status = -1; name = 'Timeout'; message = '' } | ConvertTo-Json -Compress
+    } else {
+        # TetheringOperationStatus: 0 = Success, anything else is a failure reason
+        @{ status = [int]$result.Status; name = "$($result.Status)"; message = "$($result.AdditionalErrorMessage)" } | ConvertTo-Json -Compress
+    }
+    '''
+    
+    def set_tethering(self, enable, timeout=30):
+        """
+        Start or stop tethering and wait for the WinRT operation to finish.
+        
+        Returns a TetheringResult carrying the real outcome: success, the
+        TetheringOperationStatus failure reason, or a timeout.
+        """
+        action = 'enable' if enable else 'disable'
+        started = time.monotonic()
+        
+        def outcome(success, status, message):
+            return TetheringResult(action, success, status, message, time.monotonic() - started)
+        
+        try:
+            script = (self.TETHERING_SCRIPT
+                      .replace('__METHOD__', 'StartTetheringAsync' if enable else 'StopTetheringAsync')
+                      .replace('__TIMEOUT_MS__', str(int(timeout * 1000))))
+            # Allow the host some slack beyond the WinRT timeout
+            result = PowerShellHost.instance().run(script, timeout=timeout + 5)
+            
+            if result.returncode != 0:
+                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+                logging.error(f"Hotspot {action} command failed with code {result.returncode}: {error_msg}")
+                return outcome(False, None, error_msg)
             
+            data = json.loads(result.stdout.strip().splitlines()[-1])
+            if data.get('status') == -1:
+                logging.error(f"Hotspot {action} did not complete within {timeout}s")
+                return outcome(False, 'Timeout', f"No result after {timeout}s")
+            
+            if data.get('status') == 0:
+                tethering_result = outcome(True, 'Success', '')
+                logging.info(f"Hotspot {action} completed in {tethering_result.elapsed:.1f}s")
+                return tethering_result
+            
+            message = data.get('message') or data.get('name', 'Unknown error')
+            logging.error(f"Hotspot {action} failed: {data.get('name')} {message}")
+            return outcome(False, data.get('name'), message)
+        except Exception as e:
+            logging.error(f"Exception when trying to {action} hotspot: {e}")
+            return outcome(False, None, str(e))
+
+
+class NativeBackend(HotspotBackend):
+    """
+    In-process backend: WinRT projection (pywinrt) for tethering and
+    wlanapi.dll for WiFi state - no child processes.
+    
+    Raises ImportError/OSError from the constructor when the pieces it needs
+    are missing, so the factory can fall back to SubprocessBackend.
+    """
+    name = 'native'
+    
+    WLAN_INTERFACE_STATE_CONNECTED = 1
+    
+    def __init__(self, power=None):
+        from ctypes import wintypes
+        from winrt.windows.networking.connectivity import NetworkInformation
+        from winrt.windows.networking.networkoperators import NetworkOperatorTetheringManager
+        
+        class WLAN_INTERFACE_INFO(ctypes.Structure):
+            _fields_ = [('InterfaceGuid', ctypes.c_byte * 16),
+                        ('strInterfaceDescription', ctypes.c_wchar * 256),
+                        ('isState', wintypes.DWORD)]
+        
+        class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+            _fields_ = [('dwNumberOfItems', wintypes.DWORD),
+                        ('dwIndex', wintypes.DWORD),
+                        ('InterfaceInfo', WLAN_INTERFACE_INFO * 1)]
+        
+        self.NetworkInformation = NetworkInformation
+        self.TetheringManager = NetworkOperatorTetheringManager
+        self.WLAN_INTERFACE_INFO = WLAN_INTERFACE_INFO
+        self.WLAN_INTERFACE_INFO_LIST = WLAN_INTERFACE_INFO_LIST
+        
+        self.wlanapi = ctypes.WinDLL('wlanapi')
+        self.wlanapi.WlanEnumInterfaces.argtypes = [wintypes.HANDLE, ctypes.c_void_p,
+                                                    ctypes.POINTER(ctypes.POINTER(WLAN_INTERFACE_INFO_LIST))]
+        self.wlanapi.WlanFreeMemory.argtypes = [ctypes.c_void_p]
+        
+        self.wlan_handle = wintypes.HANDLE()
+        negotiated_version = wintypes.DWORD()
+        result = self.wlanapi.WlanOpenHandle(2, None, ctypes.byref(negotiated_version), ctypes.byref(self.wlan_handle))
+        if result != 0:
+            raise OSError(result, "WlanOpenHandle failed")
+        self.wlan_lock = threading.Lock()
+        super().__init__(power)
+    
+    def _tethering_manager(self):
+        profile = self.NetworkInformation.get_internet_connection_profile()
+        return self.TetheringManager.create_from_connection_profile(profile)
+    
+    def is_wifi_connected(self):
+        """Check if any WLAN interface is in the connected state"""
+        interfaces = ctypes.POINTER(self.WLAN_INTERFACE_INFO_LIST)()
+        with self.wlan_lock:
+            result = self.wlanapi.WlanEnumInterfaces(self.wlan_handle, None, ctypes.byref(interfaces))
+            if result != 0:
+                logging.error(f"WlanEnumInterfaces failed: {result}")
+                return False
+            try:
+                count = interfaces.contents.dwNumberOfItems
+                items = ctypes.cast(interfaces.contents.InterfaceInfo,
+                                    ctypes.POINTER(self.WLAN_INTERFACE_INFO * count)).contents
+                return any(item.isState == self.WLAN_INTERFACE_STATE_CONNECTED for item in items)
+            finally:
+                self.wlanapi.WlanFreeMemory(interfaces)
+    
+    def is_hotspot_enabled(self):
+        try:
+            return self._tethering_manager().tethering_operational_state == TetheringState.ON
         except Exception as e:
             logging.error(f"Error checking hotspot status: {e}")
             return False
     
-    @staticmethod
-    def enable_hotspot():
-        """Enable Windows Mobile Hotspot"""
+    def read_clients(self):
+        return self._tethering_manager().client_count
+    
+    def read_status(self):
+        ssid = None
+        tethering_state = TetheringState.UNKNOWN
+        client_count = 0
+        try:
+            profile = self.NetworkInformation.get_internet_connection_profile()
+            if profile is not None and profile.is_wlan_connection_profile:
+                ssid = profile.wlan_connection_profile_details.get_connected_ssid()
+            manager = self.TetheringManager.create_from_connection_profile(profile)
+            tethering_state = int(manager.tethering_operational_state)
+            client_count = manager.client_count
+        except Exception as e:
+            logging.error(f"Error reading tethering status: {e}")
+        
+        power = self.power_status()
+        return DeviceStatus(self.is_wifi_connected(), ssid, tethering_state, client_count,
+                            power.battery_level, power.plugged_in)
+    
+    def set_tethering(self, enable, timeout=30):
+        import asyncio
+        
+        action = 'enable' if enable else 'disable'
+        started = time.monotonic()
+        
+        async def run_operation():
+            manager = self._tethering_manager()
+            operation = manager.start_tethering_async() if enable else manager.stop_tethering_async()
+            return await asyncio.wait_for(operation, timeout)
+        
+        try:
+            result = asyncio.run(run_operation())
+        except asyncio.TimeoutError:
+            logging.error(f"Hotspot {action} did not complete within {timeout}s")
+            return TetheringResult(action, False, 'Timeout', f"No result after {timeout}s",
+                                   time.monotonic() - started)
+        except Exception as e:
+            logging.error(f"Exception when trying to {action} hotspot: {e}")
+            return TetheringResult(action, False, None, str(e), time.monotonic() - started)
+        
+        status = int(result.status)
+        elapsed = time.monotonic() - started
+        if status == 0:
+            logging.info(f"Hotspot {action} completed in {elapsed:.1f}s")
+            return TetheringResult(action, True, 'Success', '', elapsed)
+        
+        status_name = getattr(result.status, 'name', str(status))
+        logging.error(f"Hotspot {action} failed: {status_name} {result.additional_error_message}")
+        return TetheringResult(action, False, status_name, result.additional_error_message or '', elapsed)
+    
+    def close(self):
+        super().close()
+        if self.wlan_handle:
+            self.wlanapi.WlanCloseHandle(self.wlan_handle, None)
+            self.wlan_handle = None
+
+
+class SimulatedBackend(HotspotBackend):
+    """
+    In-memory stand-in for the Windows APIs.
+    
+    State is changed with the set_* methods (power goes through a
+    ManualPowerStatusProvider, so subscribers see pushes); every call can be
+    given a latency (seconds) through `latencies`, and `tethering_delay` /
+    `fail_enables` model slow or failing tethering starts. Calls are counted
+    in `calls`. If an `event_source` (ManualEventSource) is given, WiFi
+    changes notify it like the OS would. While tethering, each client moves
+    `client_rate` bytes/second (mostly towards the client).
+    """
+    name = 'simulated'
+    
+    def __init__(self, wifi_connected=True, hotspot_enabled=False, battery_level=100,
+                 plugged_in=True, latencies=None, tethering_delay=0.0, event_source=None):
+        super().__init__(ManualPowerStatusProvider(battery_level, plugged_in))
+        self.lock = threading.Lock()
+        self.wifi_connected = wifi_connected
+        self.hotspot_enabled = hotspot_enabled
+        self.ssid = "SimulatedWiFi"
+        self.client_count = 0
+        self.client_rate = 250_000  # bytes/second per client (2 Mbit/s)
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.traffic_time = time.monotonic()
+        self.latencies = latencies or {}
+        self.tethering_delay = tethering_delay
+        self.fail_enables = 0  # number of upcoming enables that fail
+        self.event_source = event_source
+        self.calls = Counter()
+    
+    def _call(self, name):
+        with self.lock:
+            self.calls[name] += 1
+        latency = self.latencies.get(name, 0)
+        if latency:
+            time.sleep(latency)
+    
+    def set_wifi(self, connected):
+        with self.lock:
+            changed = self.wifi_connected != connected
+            self._advance_traffic()
+            self.wifi_connected = connected
+            if not connected:
+                self.hotspot_enabled = False  # Windows stops tethering without an upstream
+        if changed and self.event_source is not None:
+            self.event_source.notify()
+    
+    def set_power(self, battery_level=None, plugged_in=None):
+        self.power.set(battery_level, plugged_in)
+    
+    def set_clients(self, count):
+        with self.lock:
+            self._advance_traffic()
+            self.client_count = count
+    
+    def _advance_traffic(self):
+        """Add the bytes the current clients moved since the last call (lock held)"""
+        now = time.monotonic()
+        if self.hotspot_enabled:
+            moved = self.client_count * self.client_rate * (now - self.traffic_time)
+            self.bytes_sent += int(moved * 0.9)
+            self.bytes_received += int(moved * 0.1)
+        self.traffic_time = now
+    
+    def is_wifi_connected(self):
+        self._call('is_wifi_connected')
+        return self.wifi_connected
+    
+    def is_hotspot_enabled(self):
+        self._call('is_hotspot_enabled')
+        return self.hotspot_enabled
+    
+    def set_tethering(self, enable, timeout=30):
+        action = 'enable' if enable else 'disable'
+        started = time.monotonic()
+        self._call('set_tethering')
+        
+        if enable and self.tethering_delay > timeout:
+            time.sleep(timeout)
+            return TetheringResult(action, False, 'Timeout', f"No result after {timeout}s", timeout)
+        if enable and self.tethering_delay:
+            time.sleep(self.tethering_delay)
+        
+        with self.lock:
+            if enable and self.fail_enables:
+                self.fail_enables -= 1
+                return TetheringResult(action, False, 'WiFiDeviceOff', 'Simulated failure',
+                                       time.monotonic() - started)
+            if enable and not self.wifi_connected:
+                return TetheringResult(action, False, 'NetworkLimitedConnectivity', 'No upstream connection',
+                                       time.monotonic() - started)
+            self._advance_traffic()
+            self.hotspot_enabled = enable
+        return TetheringResult(action, True, 'Success', '', time.monotonic() - started)
+    
+    def power_status(self):
+        self._call('power_status')
+        return self.power.read()
+    
+    def read_clients(self):
+        self._call('read_clients')
+        with self.lock:
+            return self.client_count if self.hotspot_enabled else 0
+    
+    def read_traffic(self):
+        self._call('read_traffic')
+        with self.lock:
+            self._advance_traffic()
+            if not self.hotspot_enabled:
+                return None
+            return TrafficCounters(self.bytes_received, self.bytes_sent)
+    
+    def read_status(self):
+        self._call('read_status')
+        power = self.power.read()
+        with self.lock:
+            return DeviceStatus(
+                wifi_connected=self.wifi_connected,
+                ssid=self.ssid if self.wifi_connected else None,
+                tethering_state=TetheringState.ON if self.hotspot_enabled else TetheringState.OFF,
+                client_count=self.client_count if self.hotspot_enabled else 0,
+                battery_level=power.battery_level,
+                plugged_in=power.plugged_in
+            )
+
+
+def create_hotspot_backend(name=None):
+    """
+    Create the backend named by `name` or HOTSPOTKEEPER_BACKEND
+    ('native', 'subprocess' or 'simulated').
+    
+    By default the native backend is used when its dependencies load, then
+    the subprocess backend; off Windows the simulator is the only option.
+    """
+    name = name or os.environ.get("HOTSPOTKEEPER_BACKEND")
+    if name == 'simulated' or (name is None and sys.platform != 'win32'):
+        return SimulatedBackend()
+    if name == 'subprocess':
+        return SubprocessBackend()
+    try:
+        return NativeBackend()
+    except Exception as e:
+        if name == 'native':
+            raise
+        logging.info(f"Native backend unavailable ({e}), using subprocess backend")
+        return SubprocessBackend()
+
+
+class BatteryMonitor:
+    """Monitor battery level"""
+    
+    @staticmethod
+    def get_power_status():
+        """Get battery percentage and AC state in one call (a PowerStatus)"""
+        with metrics.timer('probe.power'):
+            return HotspotBackend.instance().power_status()
+    
+    @staticmethod
+    def subscribe(callback):
+        """Call `callback(PowerStatus)` whenever the power status changes (may run on any thread)"""
+        HotspotBackend.instance().power.subscribe(callback)
+    
+    @staticmethod
+    def unsubscribe(callback):
+        HotspotBackend.instance().power.unsubscribe(callback)
+    
+    @staticmethod
+    def get_battery_percentage():
+        """Get current battery percentage"""
+        return HotspotBackend.instance().get_battery_percentage()
+    
+    @staticmethod
+    def is_plugged_in():
+        """Check if device is plugged in"""
+        return HotspotBackend.instance().is_plugged_in()
+
+
+class ConnectivityEventSource:
+    """
+    Source of "connectivity may have changed" notifications.
+    
+    `wait` blocks until a change is signalled (returns True), the timeout
+    expires or `wake` is called from another thread (returns False).
+    `close` releases resources and is called from the waiting thread.
+    """
+    
+    def wait(self, timeout=None):
+        raise NotImplementedError
+    
+    def wake(self):
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+
+class AddressChangeEventSource(ConnectivityEventSource):
+    """Windows backend - IP Helper NotifyAddrChange fires when the address table changes"""
+    
+    INFINITE = 0xFFFFFFFF
+    WAIT_OBJECT_0 = 0
+    ERROR_IO_PENDING = 997
+    
+    def __init__(self):
+        from ctypes import wintypes
+        
+        class OVERLAPPED(ctypes.Structure):
+            _fields_ = [('Internal', ctypes.c_void_p),
+                        ('InternalHigh', ctypes.c_void_p),
+                        ('Offset', wintypes.DWORD),
+                        ('OffsetHigh', wintypes.DWORD),
+                        ('hEvent', wintypes.HANDLE)]
+        
+        self.wintypes = wintypes
+        self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self.iphlpapi = ctypes.WinDLL('iphlpapi', use_last_error=True)
+        self.kernel32.CreateEventW.restype = wintypes.HANDLE
+        self.kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        self.kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self.kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                                         wintypes.BOOL, wintypes.DWORD]
+        self.iphlpapi.NotifyAddrChange.argtypes = [ctypes.POINTER(wintypes.HANDLE), ctypes.POINTER(OVERLAPPED)]
+        self.iphlpapi.CancelIPChangeNotify.argtypes = [ctypes.POINTER(OVERLAPPED)]
+        
+        self.overlapped = OVERLAPPED()
+        self.overlapped.hEvent = self.kernel32.CreateEventW(None, True, False, None)
+        self.stop_event = self.kernel32.CreateEventW(None, True, False, None)
+        if not self.overlapped.hEvent or not self.stop_event:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self.handle = wintypes.HANDLE()
+        self.registered = False
+    
+    def _register(self):
+        self.kernel32.ResetEvent(self.overlapped.hEvent)
+        result = self.iphlpapi.NotifyAddrChange(ctypes.byref(self.handle), ctypes.byref(self.overlapped))
+        if result not in (0, self.ERROR_IO_PENDING):
+            raise OSError(result, "NotifyAddrChange failed")
+        self.registered = True
+    
+    def wait(self, timeout=None):
+        if not self.registered:
+            self._register()
+        handles = (self.wintypes.HANDLE * 2)(self.overlapped.hEvent, self.stop_event)
+        milliseconds = self.INFINITE if timeout is None else int(timeout * 1000)
+        result = self.kernel32.WaitForMultipleObjects(2, handles, False, milliseconds)
+        if result == self.WAIT_OBJECT_0:
+            self.registered = False  # Notifications are one-shot - re-arm on the next wait
+            return True
+        return False
+    
+    def wake(self):
+        self.kernel32.SetEvent(self.stop_event)
+    
+    def close(self):
+        if self.registered:
+            self.iphlpapi.CancelIPChangeNotify(ctypes.byref(self.overlapped))
+            self.registered = False
+        self.kernel32.CloseHandle(self.overlapped.hEvent)
+        self.kernel32.CloseHandle(self.stop_event)
+
+
+class PollingEventSource(ConnectivityEventSource):
+    """Fallback backend - reports a possible change every `interval` seconds"""
+    
+    def __init__(self, interval=2):
+        self.interval = interval
+        self.woken = threading.Event()
+        self.next_poll = time.monotonic() + interval
+    
+    def wait(self, timeout=None):
+        now = time.monotonic()
+        wait_for = self.next_poll - now
+        if timeout is not None and timeout < wait_for:
+            self.woken.wait(timeout)
+            return False
+        if self.woken.wait(max(wait_for, 0)):
+            return False
+        self.next_poll = time.monotonic() + self.interval
+        return True
+    
+    def wake(self):
+        self.woken.set()
+
+
+class ManualEventSource(ConnectivityEventSource):
+    """Backend driven by `notify()` calls - used by simulations and tests"""
+    
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = 0
+        self.woken = False
+    
+    def notify(self):
+        with self.condition:
+            self.pending += 1
+            self.condition.notify_all()
+    
+    def wait(self, timeout=None):
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending or self.woken, timeout)
+            if self.pending:
+                self.pending = 0
+                return True
+            return False
+    
+    def wake(self):
+        with self.condition:
+            self.woken = True
+            self.condition.notify_all()
+
+
+def create_connectivity_event_source():
+    """Use OS change notifications where available, polling otherwise"""
+    backend = HotspotBackend.instance()
+    if isinstance(backend, SimulatedBackend):
+        # The simulator raises change events itself when its WiFi state flips
+        if backend.event_source is None:
+            backend.event_source = ManualEventSource()
+        return backend.event_source
+    if sys.platform == 'win32':
+        try:
+            return AddressChangeEventSource()
+        except Exception as e:
+            logging.warning(f"Address change notifications unavailable, falling back to polling: {e}")
+    return PollingEventSource()
+
+
+class NetworkMonitor(QThread):
+    """
+    Monitor network connectivity changes.
+    
+    WiFi state is only re-checked when the event source reports a change (plus
+    an occasional safety-net resync), so a stable network costs no process
+    spawns. Readers get the last observed state from `current_state`.
+    """
+    wifi_connected = Signal()
+    wifi_disconnected = Signal()
+    
+    RESYNC_INTERVAL = 300  # seconds - check anyway if no event arrived
+    SETTLE_TIME = 0.5  # seconds - a burst of change events is handled as one
+    
+    def __init__(self, event_source=None):
+        super().__init__()
+        self.running = True
+        self.was_connected = False
+        self.has_state = False
+        self.event_source = event_source if event_source is not None else create_connectivity_event_source()
+        self.event_count = 0
+        self.check_count = 0
+        
+    def run(self):
+        try:
+            self.refresh()
+            while self.running:
+                if self.event_source.wait(self.RESYNC_INTERVAL):
+                    self.event_count += 1
+                    while self.running and self.event_source.wait(self.SETTLE_TIME):
+                        self.event_count += 1
+                    metrics.set_gauge('network.events', self.event_count)
+                if not self.running:
+                    break
+                self.refresh()
+        finally:
+            self.event_source.close()
+    
+    def refresh(self):
+        """Check WiFi once and emit a signal if the state changed"""
+        connected = self.check_wifi_connection()
+        self.check_count += 1
+        metrics.inc('network.checks')
+        
+        if connected and not self.was_connected:
+            self.was_connected = True
+            self.wifi_connected.emit()
+            logging.info("WiFi connected")
+        elif not connected and self.was_connected:
+            self.was_connected = False
+            self.wifi_disconnected.emit()
+            logging.info("WiFi disconnected")
+        self.has_state = True
+    
+    def current_state(self):
+        """Last observed WiFi state - only probes until the first check completes"""
+        if self.has_state:
+            return self.was_connected
+        return self.check_wifi_connection()
+    
+    @staticmethod
+    def check_wifi_connection():
+        """Check if WiFi is connected"""
+        with metrics.timer('probe.wifi'):
+            return HotspotBackend.instance().is_wifi_connected()
+    
+    def stop(self):
+        self.running = False
+        self.event_source.wake()
+
+
+class HotspotManager:
+    """Manage Windows Mobile Hotspot"""
+    
+    @staticmethod
+    def is_hotspot_enabled():
+        """Check if hotspot is currently enabled"""
+        with metrics.timer('probe.hotspot'):
+            return HotspotBackend.instance().is_hotspot_enabled()
+    
+    @staticmethod
+    def read_status():
+        """WiFi, tethering and power state from one probe (a DeviceStatus)"""
+        with metrics.timer('probe.status'):
+            return HotspotBackend.instance().read_status()
+    
+    @staticmethod
+    def set_tethering(enable, timeout=30):
+        """Start or stop tethering and wait for the outcome (returns a TetheringResult)"""
+        action = 'enable' if enable else 'disable'
+        with metrics.timer(f"action.{action}"):
+            result = HotspotBackend.instance().set_tethering(enable, timeout)
+        metrics.inc(f"action.{action}.{'success' if result.success else 'failure'}")
+        return result
+    
+    @staticmethod
+    def read_clients():
+        """Tethered client count, or None if the backend only reports it with the status"""
+        return HotspotBackend.instance().read_clients()
+    
+    @staticmethod
+    def read_traffic():
+        """Hosted adapter byte counters (a TrafficCounters), or None while it is down"""
+        return HotspotBackend.instance().read_traffic()
+    
+    @staticmethod
+    def enable_hotspot():
+        """Enable Windows Mobile Hotspot (blocks until Windows reports the outcome)"""
+        return HotspotManager.set_tethering(True).success
+    
+    @staticmethod
+    def disable_hotspot():
+        """Disable Windows Mobile Hotspot (blocks until Windows reports the outcome)"""
+        return HotspotManager.set_tethering(False).success
+
+
+class HotspotOperation(QThread):
+    """Run one enable/disable in the background and report the real outcome via `completed`"""
+    completed = Signal(object)  # TetheringResult
+    
+    def __init__(self, enable, timeout=30):
+        super().__init__()
+        self.enable = enable
+        self.timeout = timeout
+        self.result = None
+    
+    def run(self):
+        self.result = HotspotManager.set_tethering(self.enable, self.timeout)
+        self.completed.emit(self.result)
+
+
+class TelemetrySample(namedtuple('TelemetrySample', ['timestamp', 'client_count', 'rx_rate', 'tx_rate'])):
+    """Client count and hosted adapter rates (bytes/second received from / sent to the clients)"""
+    __slots__ = ()
+    
+    @property
+    def down_mbps(self):
+        """Traffic towards the clients in Mbit/s"""
+        return self.tx_rate * 8 / 1e6
+    
+    @property
+    def up_mbps(self):
+        """Traffic from the clients in Mbit/s"""
+        return self.rx_rate * 8 / 1e6
+
+
+class TelemetryRing:
+    """
+    Fixed-size ring of telemetry samples in preallocated arrays.
+    
+    Rates are computed as each sample is appended, from the byte counter
+    delta to the previous sample, so nothing is rescanned. A counter that
+    goes backwards (the adapter was recreated) or a gap in the counters
+    restarts the delta instead of producing a bogus rate.
+    """
+    
+    def __init__(self, capacity=300):
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0]) * capacity
+        self.clients = array('i', [0]) * capacity
+        self.rx_rates = array('d', [0.0]) * capacity
+        self.tx_rates = array('d', [0.0]) * capacity
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.total_received = 0  # bytes seen since the ring was created
+        self.total_sent = 0
+        self.peak_clients = 0
+        self.restart()
+    
+    def restart(self):
+        """Forget the last counters so the next sample starts a new delta"""
+        self.last_counters = None
+        self.last_time = None
+    
+    def append(self, now, client_count, counters):
+        """Record one sample and return it as a TelemetrySample"""
+        rx_rate = tx_rate = 0.0
+        if counters is not None and self.last_counters is not None and now > self.last_time:
+            received = counters.bytes_received - self.last_counters.bytes_received
+            sent = counters.bytes_sent - self.last_counters.bytes_sent
+            if received >= 0 and sent >= 0:
+                elapsed = now - self.last_time
+                rx_rate = received / elapsed
+                tx_rate = sent / elapsed
+                self.total_received += received
+                self.total_sent += sent
+        self.last_counters = counters
+        self.last_time = now
+        
+        i = self.head
+        self.timestamps[i] = now
+        self.clients[i] = client_count
+        self.rx_rates[i] = rx_rate
+        self.tx_rates[i] = tx_rate
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.peak_clients = max(self.peak_clients, client_count)
+        return TelemetrySample(now, client_count, rx_rate, tx_rate)
+    
+    def _sample(self, i):
+        return TelemetrySample(self.timestamps[i], self.clients[i], self.rx_rates[i], self.tx_rates[i])
+    
+    def latest(self):
+        """Most recent sample, or None"""
+        return self._sample((self.head - 1) % self.capacity) if self.count else None
+    
+    def samples(self):
+        """All samples in the ring, oldest first"""
+        start = self.head - self.count
+        return [self._sample((start + n) % self.capacity) for n in range(self.count)]
+
+
+class TelemetrySampler(QThread):
+    """
+    Sample the tethered client count and hosted adapter throughput into a
+    TelemetryRing while the hotspot is on.
+    
+    A sample is the backend's client count plus one adapter counter read,
+    both in-process; the thread sleeps while the hotspot is off or
+    `interval` is 0. Backends that only report clients with the status
+    probe use `fallback_clients` from the last snapshot.
+    """
+    sampled = Signal(object)  # TelemetrySample
+    
+    def __init__(self, interval=2, capacity=300):
+        super().__init__()
+        self.interval = interval  # seconds
+        self.ring = TelemetryRing(capacity)
+        self.running = True
+        self.active = False
+        self.fallback_clients = 0
+        self.failed = False
+        self.woken = threading.Event()
+    
+    def configure(self, interval):
+        self.interval = interval
+        self.woken.set()
+    
+    def update(self, snapshot):
+        """Follow the hotspot state from a status snapshot (main thread)"""
+        self.fallback_clients = snapshot.client_count or 0
+        active = snapshot.hotspot_enabled
+        if active != self.active:
+            self.active = active
+            self.woken.set()
+    
+    def latest(self):
+        """Most recent sample while sampling, else None"""
+        return self.ring.latest() if self.active and self.interval else None
+    
+    def run(self):
+        while self.running:
+            if not (self.active and self.interval):
+                self.ring.restart()  # no rate across an off period
+                self.woken.wait()
+                self.woken.clear()
+                continue
+            self.sample()
+            self.woken.wait(self.interval)
+            self.woken.clear()
+    
+    def sample(self):
+        """Take one sample and emit it"""
+        try:
+            with metrics.timer('telemetry.sample'):
+                client_count = HotspotManager.read_clients()
+                counters = HotspotManager.read_traffic()
+        except Exception as e:
+            metrics.inc('telemetry.errors')
+            if not self.failed:  # once, not every interval
+                logging.warning(f"Telemetry sample failed: {e}")
+                self.failed = True
+            return
+        self.failed = False
+        if client_count is None:
+            client_count = self.fallback_clients
+        
+        sample = self.ring.append(time.monotonic(), client_count, counters)
+        metrics.set_gauge('telemetry.clients', client_count)
+        metrics.set_gauge('telemetry.down_mbps', round(sample.down_mbps, 3))
+        metrics.set_gauge('telemetry.up_mbps', round(sample.up_mbps, 3))
+        self.sampled.emit(sample)
+    
+    def stop(self):
+        self.running = False
+        self.woken.set()
+
+
+class PolicyAction:
+    """What HotspotPolicy.decide asks the caller to do"""
+    NONE = 0
+    ENABLE = 1
+    DISABLE = 2
+
+
+class HotspotPolicy:
+    """
+    Auto-hotspot decisions as an explicit state machine.
+    
+    `decide` takes a status snapshot (anything with wifi_connected,
+    hotspot_enabled, battery_level and is_plugged) and a time.monotonic()
+    timestamp and returns a PolicyAction; the caller runs the operation and
+    reports back through `operation_finished`. No Qt, I/O or clock of its own
+    and nothing allocated per tick, so recorded ticks replay at millions per
+    second.
+    """
+    
+    __slots__ = ('auto_enabled', 'auto_disable', 'battery_threshold', 'debounce_time',
+                 'max_failures', 'failure_cooldown', 'busy', 'consecutive_failures',
+                 'last_failure_time', 'last_manual_disable_time')
+    
+    def __init__(self, auto_enabled=True, auto_disable=False, battery_threshold=0, debounce_time=10,
+                 max_failures=3, failure_cooldown=60):
+        self.auto_enabled = auto_enabled
+        self.auto_disable = auto_disable  # disable when WiFi drops
+        self.battery_threshold = battery_threshold  # 0 = disabled
+        self.debounce_time = debounce_time  # seconds before re-enabling after manual disable
+        self.max_failures = max_failures  # stop trying after this many failed auto-enables...
+        self.failure_cooldown = failure_cooldown  # ...for this many seconds
+        self.reset()
+    
+    def reset(self):
+        """Forget all runtime state (not the configuration)"""
+        self.busy = False  # enable/disable operation in flight
+        self.consecutive_failures = 0
+        self.last_failure_time = None
+        self.last_manual_disable_time = None
+    
+    SETTINGS = frozenset({"auto_hotspot_enabled", "auto_disable_on_wifi_disconnect", "battery_threshold",
+                          "debounce_time"})
+    
+    def configure(self, settings):
+        """Pick up the policy fields of a Settings object"""
+        self.auto_enabled = settings.auto_hotspot_enabled
+        self.auto_disable = settings.auto_disable_on_wifi_disconnect
+        self.battery_threshold = settings.battery_threshold
+        self.debounce_time = settings.debounce_time
+    
+    def decide(self, snapshot, now):
+        """Advance on one status snapshot; returns a PolicyAction"""
+        hotspot_enabled = snapshot.hotspot_enabled
+        
+        # Reset failure counter once the hotspot is seen enabled
+        if hotspot_enabled and self.consecutive_failures:
+            self.consecutive_failures = 0
+            self.last_failure_time = None
+        
+        # Failure cooldown
+        if self.consecutive_failures >= self.max_failures and self.last_failure_time is not None:
+            if now - self.last_failure_time < self.failure_cooldown:
+                return PolicyAction.NONE
+            self.consecutive_failures = 0
+            self.last_failure_time = None
+        
+        if self.busy:
+            return PolicyAction.NONE
+        
+        if snapshot.wifi_connected:
+            if hotspot_enabled or not self.auto_enabled:
+                return PolicyAction.NONE
+            if (self.battery_threshold and not snapshot.is_plugged and
+                    snapshot.battery_level < self.battery_threshold):
+                return PolicyAction.NONE
+            if (self.last_manual_disable_time is not None and
+                    now - self.last_manual_disable_time < self.debounce_time):
+                return PolicyAction.NONE
+            self.busy = True
+            return PolicyAction.ENABLE
+        
+        if self.auto_disable and hotspot_enabled:
+            self.busy = True
+            return PolicyAction.DISABLE
+        return PolicyAction.NONE
+    
+    def manual_operation(self, enable, now):
+        """Record a user-requested enable/disable being started"""
+        self.busy = True
+        if not enable:
+            self.last_manual_disable_time = now
+    
+    def operation_finished(self, enable, success, now, automatic=False):
+        """Record the outcome of an enable/disable"""
+        self.busy = False
+        if success and enable:
+            self.consecutive_failures = 0
+            self.last_failure_time = None
+        elif enable and automatic:
+            self.consecutive_failures += 1
+            self.last_failure_time = now
+
+
+class TraceRecorder:
+    """
+    Compact binary trace of status snapshots, policy decisions and operation outcomes.
+    
+    Records are fixed-size and written into a ring of `capacity` slots in a
+    memory-mapped file, so the file never grows and the newest records
+    overwrite the oldest. `read_trace` returns them in order and
+    `replay_trace` feeds them back through HotspotPolicy.
+    """
+    
+    MAGIC = b'HKTRACE1'
+    HEADER = struct.Struct('<8sHHIQ')  # magic, version, record size, capacity, records written
+    RECORD = struct.Struct('<dBBBBBHf')  # time, kind, a, b, c, d, count, value
+    VERSION = 1
+    
+    # Record kinds and how their fields are used
+    SESSION = 0   # app started - replay resets the policy
+    CONFIG = 1    # a=auto_enabled|auto_disable<<1, b=max_failures, c=battery_threshold, count=debounce, value=cooldown
+    SNAPSHOT = 2  # a=wifi, b=hotspot, c=battery, d=plugged, count=clients, value=probe latency
+    ACTION = 3    # a=PolicyAction, b=automatic
+    OUTCOME = 4   # a=enable, b=success, c=automatic, value=elapsed
+    
+    def __init__(self, path, capacity=65536):
+        """Record to `path`; with path=None nothing is recorded"""
+        self.path = Path(path) if path is not None else None
+        self.capacity = capacity
+        self.file = None
+        self.map = None
+        self.written = 0
+        if self.path is None:
+            return
+        try:
+            self._open()
+        except Exception as e:
+            logging.error(f"Trace recording disabled: {e}")
+            self.close()
+    
+    def _open(self):
+        size = self.HEADER.size + self.capacity * self.RECORD.size
+        mode = 'r+b' if self.path.exists() else 'w+b'
+        self.file = open(self.path, mode)
+        
+        header = self.file.read(self.HEADER.size)
+        fresh = len(header) < self.HEADER.size
+        if not fresh:
+            magic, version, record_size, capacity, written = self.HEADER.unpack(header)
+            fresh = (magic, version, record_size, capacity) != (self.MAGIC, self.VERSION, self.RECORD.size, self.capacity)
+        if fresh:
+            self.file.seek(0)
+            self.file.truncate(size)
+            written = 0
+        
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.written = written
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.VERSION, self.RECORD.size, self.capacity, written)
+    
+    @property
+    def enabled(self):
+        return self.map is not None
+    
+    def _write(self, now, kind, a=0, b=0, c=0, d=0, count=0, value=0.0):
+        if self.map is None:
+            return
+        offset = self.HEADER.size + (self.written % self.capacity) * self.RECORD.size
+        self.RECORD.pack_into(self.map, offset, now, kind, a, b, c, d, min(count, 0xFFFF), value)
+        self.written += 1
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.VERSION, self.RECORD.size, self.capacity, self.written)
+    
+    def session(self, now):
+        self._write(now, self.SESSION)
+    
+    def config(self, policy, now):
+        self._write(now, self.CONFIG, int(bool(policy.auto_enabled)) | int(bool(policy.auto_disable)) << 1,
+                    min(policy.max_failures, 255), min(int(policy.battery_threshold), 255), 0,
+                    int(policy.debounce_time), float(policy.failure_cooldown))
+    
+    def snapshot(self, snapshot, now):
+        self._write(now, self.SNAPSHOT, snapshot.wifi_connected, snapshot.hotspot_enabled,
+                    max(0, min(int(snapshot.battery_level), 255)), snapshot.is_plugged,
+                    snapshot.client_count or 0, snapshot.latency)
+    
+    def action(self, action, automatic, now):
+        self._write(now, self.ACTION, action, automatic)
+    
+    def outcome(self, enable, success, automatic, elapsed, now):
+        self._write(now, self.OUTCOME, enable, success, automatic, 0, 0, elapsed or 0.0)
+    
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_trace(path):
+    """Yield the records of a trace file, oldest first, as RECORD tuples"""
+    header_size = TraceRecorder.HEADER.size
+    record = TraceRecorder.RECORD
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, record_size, capacity, written = TraceRecorder.HEADER.unpack_from(data, 0)
+    if magic != TraceRecorder.MAGIC or version != TraceRecorder.VERSION or record_size != record.size:
+        raise ValueError(f"{path} is not a version {TraceRecorder.VERSION} HotspotKeeper trace")
+    for index in range(max(0, written - capacity), written):
+        yield record.unpack_from(data, header_size + (index % capacity) * record_size)
+
+
+class _ReplaySnapshot:
+    """Reused snapshot object so replay does not allocate per record"""
+    __slots__ = ('wifi_connected', 'hotspot_enabled', 'battery_level', 'is_plugged')
+
+
+def replay_trace(path):
+    """
+    Feed a recorded trace through HotspotPolicy at full speed.
+    
+    Recorded outcomes and manual actions are replayed as they happened;
+    automatic actions are decided afresh, and any difference from what was
+    recorded counts as a mismatch. Returns a stats dict.
+    """
+    records = list(read_trace(path))
+    policy = HotspotPolicy()
+    snapshot = _ReplaySnapshot()
+    latencies = []
+    stats = Counter()
+    previous_hotspot = None
+    pending = []  # decided automatic actions waiting to be matched with recorded ones
+    
+    started = time.perf_counter()
+    for now, kind, a, b, c, d, count, value in records:
+        if kind == TraceRecorder.SNAPSHOT:
+            snapshot.wifi_connected = bool(a)
+            snapshot.hotspot_enabled = bool(b)
+            snapshot.battery_level = c
+            snapshot.is_plugged = bool(d)
+            latencies.append(value)
+            if previous_hotspot and not snapshot.hotspot_enabled and snapshot.wifi_connected:
+                stats['hotspot_drops'] += 1
+            previous_hotspot = snapshot.hotspot_enabled
+            action = policy.decide(snapshot, now)
+            if action:
+                stats['replayed_actions'] += 1
+                pending.append(action)
+        elif kind == TraceRecorder.ACTION:
+            if b:
+                stats['recorded_actions'] += 1
+                if pending and pending[0] == a:
+                    pending.pop(0)
+                else:
+                    stats['mismatches'] += 1
+            else:
+                policy.manual_operation(a == PolicyAction.ENABLE, now)
+        elif kind == TraceRecorder.OUTCOME:
+            policy.operation_finished(bool(a), bool(b), now, bool(c))
+            stats['failures' if not b else 'successes'] += 1
+        elif kind == TraceRecorder.CONFIG:
+            policy.auto_enabled = bool(a & 1)
+            policy.auto_disable = bool(a & 2)
+            policy.max_failures = b
+            policy.battery_threshold = c
+            policy.debounce_time = count
+            policy.failure_cooldown = value
+        elif kind == TraceRecorder.SESSION:
+            policy.reset()
+            stats['sessions'] += 1
+            stats['mismatches'] += len(pending)
+            pending.clear()
+            previous_hotspot = None
+        stats['records'] += 1
+    elapsed = time.perf_counter() - started
+    stats['mismatches'] += len(pending)
+    
+    latencies.sort()
+    result = dict(stats)
+    result['snapshots'] = len(latencies)
+    result['records_per_sec'] = round(len(records) / elapsed) if elapsed else None
+    if latencies:
+        result['probe_latency_p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 2)
+        result['probe_latency_p99_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2)
+    if records:
+        result['span_seconds'] = round(records[-1][0] - records[0][0], 1)
+    return result
+
+
+class HistoryTier:
+    """
+    Ring of fixed-size, time-ordered records in a memory-mapped file.
+    
+    Like TraceRecorder the file never grows: `capacity` slots are reused
+    oldest first. When the capacity changes (retention settings) the newest
+    records that still fit are carried over. The first field of every record
+    is its time, which `records` binary-searches.
+    """
+    
+    MAGIC = b'HKHIST01'
+    HEADER = struct.Struct('<8sHHIQ')  # magic, version, record size, capacity, records written
+    TIME = struct.Struct('<d')
+    VERSION = 1
+    
+    def __init__(self, path, record, capacity):
+        """Keep up to `capacity` records in `path`; capacity 0 keeps nothing (and removes the file)"""
+        self.path = Path(path)
+        self.record = record
+        self.capacity = capacity
+        self.file = None
+        self.map = None
+        self.written = 0
+        if capacity <= 0:
+            try:
+                self.path.unlink(missing_ok=True)
+            except Exception as e:
+                logging.warning(f"Could not remove {self.path.name}: {e}")
+            return
+        try:
+            self._open()
+        except Exception as e:
+            logging.error(f"History tier {self.path.name} disabled: {e}")
+            self.close()
+    
+    def _open(self):
+        size = self.HEADER.size + self.capacity * self.record.size
+        mode = 'r+b' if self.path.exists() else 'w+b'
+        self.file = open(self.path, mode)
+        
+        carried = []
+        header = self.file.read(self.HEADER.size)
+        written = 0
+        if len(header) == self.HEADER.size:
+            magic, version, record_size, capacity, written = self.HEADER.unpack(header)
+            if (magic, version, record_size) != (self.MAGIC, self.VERSION, self.record.size):
+                written = 0
+            elif capacity != self.capacity:
+                data = header + self.file.read()
+                carried = [self.record.unpack_from(data, self.HEADER.size + (index % capacity) * record_size)
+                           for index in range(max(0, written - min(capacity, self.capacity)), written)]
+                written = 0
+        if written == 0:
+            self.file.seek(0)
+            self.file.truncate(size)
+        
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.written = written
+        self._write_header()
+        for values in carried:
+            self.append(*values)
+    
+    def _write_header(self):
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.VERSION, self.record.size, self.capacity, self.written)
+    
+    def _offset(self, index):
+        return self.HEADER.size + (index % self.capacity) * self.record.size
+    
+    @property
+    def enabled(self):
+        return self.map is not None
+    
+    def append(self, *values):
+        if self.map is None:
+            return
+        self.record.pack_into(self.map, self._offset(self.written), *values)
+        self.written += 1
+        self._write_header()
+    
+    def update_last(self, *values):
+        """Rewrite the newest record in place"""
+        if self.map is not None and self.written:
+            self.record.pack_into(self.map, self._offset(self.written - 1), *values)
+    
+    def last(self):
+        """Newest record, or None"""
+        if self.map is None or not self.written:
+            return None
+        return self.record.unpack_from(self.map, self._offset(self.written - 1))
+    
+    def oldest_time(self):
+        """Time of the oldest record kept, or None"""
+        if self.map is None or not self.written:
+            return None
+        return self.TIME.unpack_from(self.map, self._offset(max(0, self.written - self.capacity)))[0]
+    
+    def wrapped(self):
+        """True once records have been overwritten"""
+        return self.written > self.capacity
+    
+    def records(self, since=None):
+        """Records with time >= `since` (all if None), oldest first"""
+        if self.map is None:
+            return []
+        lo, hi = max(0, self.written - self.capacity), self.written
+        if since is not None:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.TIME.unpack_from(self.map, self._offset(mid))[0] < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        unpack_from, offset, m = self.record.unpack_from, self._offset, self.map
+        return [unpack_from(m, offset(index)) for index in range(lo, self.written)]
+    
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class _Rollup:
+    """The in-progress bucket of a rollup tier, kept as the tier's newest record"""
+    
+    def __init__(self, tier, length, bucket_start):
+        self.tier = tier
+        self.length = length  # nominal bucket length in seconds
+        self.bucket_start = bucket_start  # time -> start of the bucket containing it
+        self.values = None
+        self.end = 0.0
+        last = tier.last()
+        if last is not None:
+            self.values = list(last)
+            self.end = self.bucket_start(last[0] + 1.5 * length)
+    
+    def bucket(self, now):
+        """Values of the bucket containing `now`, starting a new record when the bucket rolls over"""
+        if self.values is None or now >= self.end:
+            start = self.bucket_start(now)
+            # start, observed, wifi, hotspot, client-seconds, samples, clients max, battery min/max, latency mean
+            self.values = [start, 0.0, 0.0, 0.0, 0.0, 0, 0, 255, 0, 0.0]
+            self.end = self.bucket_start(start + 1.5 * self.length)
+            self.tier.append(*self.values)
+        return self.values
+    
+    def save(self):
+        if self.values is not None:
+            self.tier.update_last(*self.values)
+
+
+def _hour_start(now):
+    return now - now % 3600
+
+
+def _day_start(now):
+    """Local midnight starting the day that contains `now`"""
+    day = time.localtime(now)
+    return time.mktime((day.tm_year, day.tm_mon, day.tm_mday, 0, 0, 0, 0, 0, -1))
+
+
+class HistoryStore:
+    """
+    Persistent status history: every status tick, plus hourly and daily rollups.
+    
+    Each tier is a HistoryTier ring sized from the retention settings, so
+    disk use is fixed (about 1 MB with the defaults). The rollups are updated
+    in place on every tick: the time between two ticks is credited to the
+    earlier tick's state, split across bucket boundaries. A gap longer than
+    MAX_GAP (the app was closed, or the machine slept) counts as unobserved.
+    `uptime` therefore reads a few hundred rollup records instead of the
+    ticks.
+    
+    Timestamps are wall-clock (time.time()) so history survives restarts.
+    """
+    
+    TICK = struct.Struct('<dBBHf')  # time, flags, battery, clients, probe latency
+    ROLLUP = struct.Struct('<dffffIHBBf')  # start, observed, wifi, hotspot, client-seconds, samples,
+    #                                        clients max, battery min, battery max, latency mean
+    
+    WIFI = 1
+    HOTSPOT = 2
+    PLUGGED = 4
+    SESSION = 8  # first tick after the app started
+    
+    MAX_GAP = 3600  # seconds
+    TICKS_PER_DAY = 86400 // 3  # tick ring sizing: one tick every 3 s (the default check interval)
+    
+    def __init__(self, directory, tick_days=2, hour_days=90, day_days=1825):
+        """Store history in `directory`; with directory=None nothing is stored"""
+        self.directory = Path(directory) if directory is not None else None
+        self.previous = None  # (time, flags, clients) of the last tick this session
+        self.ticks = self.hours = self.days = None
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error(f"History disabled: {e}")
+            self.directory = None
+            return
+        self.ticks = HistoryTier(self.directory / "ticks.bin", self.TICK, tick_days * self.TICKS_PER_DAY)
+        self.hours = HistoryTier(self.directory / "hours.bin", self.ROLLUP, hour_days * 24)
+        self.days = HistoryTier(self.directory / "days.bin", self.ROLLUP, day_days)
+        self.hour_rollup = _Rollup(self.hours, 3600, _hour_start)
+        self.day_rollup = _Rollup(self.days, 86400, _day_start)
+    
+    @property
+    def enabled(self):
+        return self.directory is not None
+    
+    def record(self, snapshot, now, client_count=None):
+        """Store one status tick and fold it into the rollups"""
+        if self.directory is None:
+            return
+        if client_count is None:
+            client_count = snapshot.client_count or 0
+        clients = min(client_count, 0xFFFF)
+        flags = (self.WIFI * bool(snapshot.wifi_connected) | self.HOTSPOT * bool(snapshot.hotspot_enabled) |
+                 self.PLUGGED * bool(snapshot.is_plugged) | (self.SESSION if self.previous is None else 0))
+        battery = max(0, min(int(snapshot.battery_level), 255))
+        latency = snapshot.latency
+        self.ticks.append(now, flags, battery, clients, latency)
+        
+        if self.previous is not None:
+            self._credit(*self.previous, now)
+        self.previous = (now, flags, clients)
+        
+        for rollup in (self.hour_rollup, self.day_rollup):
+            values = rollup.bucket(now)
+            values[5] += 1
+            values[6] = max(values[6], clients)
+            values[7] = min(values[7], battery)
+            values[8] = max(values[8], battery)
+            values[9] += (latency - values[9]) / values[5]
+            rollup.save()
+    
+    def _credit(self, start, flags, clients, end):
+        """Credit [start, end) in state `flags` to the buckets it spans"""
+        if not 0 < end - start <= self.MAX_GAP:
+            return
+        for rollup in (self.hour_rollup, self.day_rollup):
+            t = start
+            while t < end:
+                values = rollup.bucket(t)
+                span = min(end, rollup.end) - t
+                values[1] += span
+                if flags & self.WIFI:
+                    values[2] += span
+                if flags & self.HOTSPOT:
+                    values[3] += span
+                    values[4] += clients * span
+                rollup.save()
+                t += span
+    
+    def rollups(self, since):
+        """
+        Rollup records from the bucket containing `since` onwards, taken from
+        the finest tier that reaches back that far; returns (records, bucket length)
+        """
+        if self.directory is None:
+            return [], 3600
+        if not self.hours.wrapped() or self.hours.oldest_time() <= since:
+            return self.hours.records(since - 3600), 3600
+        return self.days.records(since - 86400), 86400
+    
+    def uptime(self, seconds=30 * 86400, now=None):
+        """
+        Hotspot and WiFi time over the last `seconds` (to rollup resolution).
+        
+        Returns a dict of observed/hotspot/wifi seconds, the hotspot ratio of
+        observed time and the mean client count while the hotspot was on.
+        """
+        now = time.time() if now is None else now
+        since = now - seconds
+        observed = hotspot = wifi = client_seconds = 0.0
+        records, length = self.rollups(since)
+        for start, obs, w, h, cs, *_ in records:
+            if start >= now:
+                break
+            # Credit a bucket that straddles `since` in proportion
+            fraction = 1.0 if start >= since else max(0.0, (start + length - since) / length)
+            observed += obs * fraction
+            wifi += w * fraction
+            hotspot += h * fraction
+            client_seconds += cs * fraction
+        return {
+            'seconds': seconds,
+            'observed': round(observed, 1),
+            'hotspot': round(hotspot, 1),
+            'wifi': round(wifi, 1),
+            'ratio': round(hotspot / observed, 4) if observed else None,
+            'mean_clients': round(client_seconds / hotspot, 2) if hotspot else None,
+        }
+    
+    def close(self, now=None):
+        """Credit the time since the last tick and close the files"""
+        if self.directory is None:
+            return
+        if self.previous is not None:
+            self._credit(*self.previous, time.time() if now is None else now)
+            self.previous = None
+        for tier in (self.ticks, self.hours, self.days):
+            tier.close()
+        self.directory = None
+
+
+class StatusSnapshot(namedtuple('StatusSnapshot', [
+        'wifi_connected', 'hotspot_enabled', 'battery_level', 'is_plugged',
+        'ssid', 'client_count', 'requested_at', 'completed_at'])):
+    """Immutable result of one probe round (timestamps are time.monotonic())"""
+    __slots__ = ()
+    
+    @property
+    def latency(self):
+        """Seconds from the tick request to the finished snapshot"""
+        return self.completed_at - self.requested_at
+
+
+class ProbeEngine(QThread):
+    """
+    Collect WiFi, hotspot and battery state off the GUI thread.
+    
+    Each requested tick runs the status probe (one consolidated backend call)
+    and emits one StatusSnapshot through `snapshot_ready`. Requests made while
+    a tick is already running are coalesced into a single follow-up tick. A
+    status measured less than `ttl` seconds ago is reused; `invalidate` drops
+    it after an action or event that is known to change it.
+    """
+    snapshot_ready = Signal(object)  # StatusSnapshot
+    
+    # Value used when the probe raises instead of returning
+    DEFAULT_STATUS = DeviceStatus(False, None, TetheringState.UNKNOWN, 0, 100, True)
+    
+    def __init__(self, probe=None, ttl=1.0):
+        super().__init__()
+        self.probe = probe or HotspotManager.read_status
+        self.ttl = ttl
+        self.running = True
+        self.tick_requested = threading.Event()
+        self.request_lock = threading.Lock()
+        self.pending_request_time = None
+        
+        # Last measured status; `generation` changes on every invalidate so a
+        # measurement that was running at the time is not cached
+        self.cached_status = None
+        self.cached_at = 0.0
+        self.generation = 0
+        self.measured = 0  # probes actually run
+        self.reused = 0  # ticks served from the cached status
+        
+        # Latency statistics (seconds)
+        self.tick_count = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+    
+    def request_tick(self):
+        """Ask for a fresh snapshot - returns immediately, safe from any thread"""
+        with self.request_lock:
+            if self.pending_request_time is None:
+                self.pending_request_time = time.monotonic()
+        self.tick_requested.set()
+    
+    def invalidate(self):
+        """Forget the cached status so the next tick measures - safe from any thread"""
+        with self.request_lock:
+            self.cached_status = None
+            self.generation += 1
+    
+    def read_status(self):
+        """The current DeviceStatus, reusing one measured less than `ttl` seconds ago"""
+        with self.request_lock:
+            if self.cached_status is not None and time.monotonic() - self.cached_at < self.ttl:
+                self.reused += 1
+                return self.cached_status
+            generation = self.generation
+        
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            # Use PowerShell to enable hotspot - simplified approach that works
-            script = '''
-            try {
-                $connectionProfile = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetInternetConnectionProfile()
-                $tetheringManager = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]::CreateFromConnectionProfile($connectionProfile)
-                
-                # Start tethering - this is async but we just initiate it
-                $tetheringManager.StartTetheringAsync() | Out-Null
-                
-                # Give it a moment to start
-                Start-Sleep -Milliseconds 1000
-                
-                # Success if we got here without exceptions
-                exit 0
-            } catch {
-                Write-Error $_.Exception.Message
-                exit 1
-            }
-            '''
-            
-            result = subprocess.run(
-                ['powershell', '-Command', script],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            # If the command executed without throwing an exception, consider it successful
-            # The actual hotspot activation happens asynchronously
-            success = result.returncode == 0
-            
-            if success:
-                logging.info("Hotspot enable command sent successfully")
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                logging.error(f"Hotspot enable command failed with code {result.returncode}: {error_msg}")
-            
-            return success
+            status = self.probe()
         except Exception as e:
-            logging.error(f"Exception when enabling hotspot: {e}")
-            return False
+            logging.error(f"Status probe failed: {e}")
+            status = None
+        
+        with self.request_lock:
+            self.measured += 1
+            if status is not None and generation == self.generation:
+                self.cached_status = status
+                self.cached_at = time.monotonic()
+        return status if status is not None else self.DEFAULT_STATUS
     
-    @staticmethod
-    def disable_hotspot():
-        """Disable Windows Mobile Hotspot"""
-        try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
+    def run(self):
+        while self.running:
+            self.tick_requested.wait()
+            if not self.running:
+                break
             
-            script = '''
-            try {
-                $connectionProfile = [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime]::GetInternetConnectionProfile()
-                $tetheringManager = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime]::CreateFromConnectionProfile($connectionProfile)
-                
-                # Stop tethering (don't wait for async completion)
-                $tetheringManager.StopTetheringAsync() | Out-Null
-                
-                # Give it a moment to stop
-                Start-Sleep -Milliseconds 1000
-                
-                # Success if we got here without exceptions
-                exit 0
-            } catch {
-                Write-Error $_.Exception.Message
-                exit 1
-            }
-            '''
+            with self.request_lock:
+                self.tick_requested.clear()
+                requested_at = self.pending_request_time or time.monotonic()
+                self.pending_request_time = None
             
-            result = subprocess.run(
-                ['powershell', '-Command', script],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
+            status = self.read_status()
+            snapshot = StatusSnapshot(
+                wifi_connected=status.wifi_connected,
+                hotspot_enabled=status.hotspot_enabled,
+                battery_level=status.battery_level,
+                is_plugged=status.plugged_in,
+                ssid=status.ssid,
+                client_count=status.client_count,
+                requested_at=requested_at,
+                completed_at=time.monotonic()
             )
             
-            success = result.returncode == 0
+            self.tick_count += 1
+            metrics.observe('tick.latency', snapshot.latency)
+            metrics.set_gauge('cache.probes_avoided', self.reused)
+            self.last_latency = snapshot.latency
+            self.max_latency = max(self.max_latency, snapshot.latency)
+            self.total_latency += snapshot.latency
             
-            if success:
-                logging.info("Hotspot disable command sent successfully")
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                logging.error(f"Hotspot disable command failed with code {result.returncode}: {error_msg}")
-            
-            return success
-        except Exception as e:
-            logging.error(f"Exception when disabling hotspot: {e}")
-            return False
+            self.snapshot_ready.emit(snapshot)
+    
+    def average_latency(self):
+        return self.total_latency / self.tick_count if self.tick_count else 0.0
+    
+    def stop(self):
+        self.running = False
+        self.tick_requested.set()
+
+
+class PollScheduler:
+    """
+    Decide when the next status poll happens.
+    
+    After a transition (WiFi change, manual toggle, failed enable, ...) the
+    next `fast_polls` polls run every `fast_interval` seconds. While state
+    stays stable the interval starts at `base_interval` and grows by
+    `backoff` per poll up to `max_interval`. While paused (idle machine, on
+    battery) wakeups only re-check the pause condition and never probe.
+    """
+    
+    RATE_WINDOW = 600  # seconds of history used for the effective poll rate
+    
+    def __init__(self, base_interval=3, max_interval=60, fast_interval=1, fast_polls=3, backoff=2.0):
+        self.fast_interval = fast_interval
+        self.fast_polls = fast_polls
+        self.backoff = backoff
+        self.configure(base_interval, max_interval)
+        self.fast_polls_left = fast_polls
+        self.paused = False
+        
+        self.wakeups = 0
+        self.polls = 0
+        self.transitions = 0
+        self.poll_times = deque()
+    
+    def configure(self, base_interval, max_interval):
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.interval = base_interval
+    
+    def transition(self, reason):
+        """Switch to fast polling because something just changed"""
+        self.transitions += 1
+        self.fast_polls_left = self.fast_polls
+        self.interval = self.base_interval
+        logging.debug(f"Poll scheduler: fast path ({reason})")
+    
+    def next_wakeup(self, paused=False):
+        """Return (delay in seconds, whether that wakeup should probe)"""
+        if paused:
+            if not self.paused:
+                logging.info("Polling paused")
+            self.paused = True
+            return self.max_interval, False
+        
+        if self.paused:
+            self.paused = False
+            self.transition('resumed')
+        
+        if self.fast_polls_left > 0:
+            self.fast_polls_left -= 1
+            return self.fast_interval, True
+        
+        delay = self.interval
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+        return delay, True
+    
+    def record_wakeup(self, probed):
+        self.wakeups += 1
+        if probed:
+            self.polls += 1
+            now = time.monotonic()
+            self.poll_times.append(now)
+            while self.poll_times and now - self.poll_times[0] > self.RATE_WINDOW:
+                self.poll_times.popleft()
+    
+    def polls_per_minute(self):
+        """Timer-driven polls per minute over the last RATE_WINDOW seconds"""
+        return len(self.poll_times) * 60.0 / self.RATE_WINDOW
+    
+    def stats(self):
+        return {
+            'wakeups': self.wakeups,
+            'polls': self.polls,
+            'transitions': self.transitions,
+            'paused': self.paused,
+            'current_interval': self.interval,
+            'polls_per_minute': round(self.polls_per_minute(), 2),
+        }
 
 
 class StartupManager:
@@ -510,8 +3121,7 @@ class StartupManager:
                 if not os.path.exists(python_path):
                     python_path = sys.executable
                 
-                script_path = os.path.abspath(__file__)
-                command = f'"{python_path}" "{script_path}" --minimized'
+                command = f'"{python_path}" "{LAUNCHER}" --minimized'
             
             winreg.SetValueEx(key, StartupManager.APP_NAME, 0, winreg.REG_SZ, command)
             winreg.CloseKey(key)
@@ -534,1071 +3144,520 @@ class StartupManager:
             return False
 
 
-class SettingsDialog(QDialog):
-    """Settings dialog window"""
+class ControlServer(QObject):
+    """
+    Local control endpoint served by the running instance - a named pipe on
+    Windows, a Unix socket elsewhere (see hotspotkeeper_ctl.py for the client).
     
-    def __init__(self, parent, settings_manager):
-        super().__init__(parent)
-        self.settings_manager = settings_manager
-        self.init_ui()
-    
-    def init_ui(self):
-        """Initialize settings dialog UI"""
-        self.setWindowTitle("Settings")
-        self.setMinimumSize(500, 550)  # Increased size for better visibility
-        
-        layout = QVBoxLayout()
-        layout.setSpacing(15)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Monitoring settings
-        monitor_group = QGroupBox("Monitoring")
-        monitor_layout = QVBoxLayout()
-        monitor_layout.setSpacing(12)
-        
-        # Check interval
-        interval_layout = QHBoxLayout()
-        interval_label = QLabel("Check interval (seconds):")
-        interval_label.setMinimumWidth(180)
-        interval_layout.addWidget(interval_label)
-        
-        self.interval_spin = QSpinBox()
-        self.interval_spin.setMinimumWidth(100)
-        self.interval_spin.setMinimumHeight(30)
-        self.interval_spin.setRange(1, 60)
-        self.interval_spin.setValue(self.settings_manager.get("check_interval", 3))
-        interval_layout.addWidget(self.interval_spin)
-        interval_layout.addStretch()
-        monitor_layout.addLayout(interval_layout)
-        
-        # Debounce time
-        debounce_layout = QHBoxLayout()
-        debounce_label = QLabel("Debounce time (seconds):")
-        debounce_label.setMinimumWidth(180)
-        debounce_layout.addWidget(debounce_label)
-        
-        self.debounce_spin = QSpinBox()
-        self.debounce_spin.setMinimumWidth(100)
-        self.debounce_spin.setMinimumHeight(30)
-        self.debounce_spin.setRange(0, 300)
-        self.debounce_spin.setValue(self.settings_manager.get("debounce_time", 10))
-        debounce_layout.addWidget(self.debounce_spin)
-        debounce_layout.addStretch()
-        monitor_layout.addLayout(debounce_layout)
-        
-        monitor_group.setLayout(monitor_layout)
-        layout.addWidget(monitor_group)
-        
-        # Behavior settings
-        behavior_group = QGroupBox("Behavior")
-        behavior_layout = QVBoxLayout()
-        behavior_layout.setSpacing(12)
-        
-        self.auto_disable_check = QCheckBox("Auto-disable hotspot when WiFi disconnects")
-        self.auto_disable_check.setMinimumHeight(25)
-        self.auto_disable_check.setChecked(
-            self.settings_manager.get("auto_disable_on_wifi_disconnect", False)
-        )
-        behavior_layout.addWidget(self.auto_disable_check)
-        
-        behavior_group.setLayout(behavior_layout)
-        layout.addWidget(behavior_group)
-        
-        # Notifications
-        notif_group = QGroupBox("Notifications")
-        notif_layout = QVBoxLayout()
-        notif_layout.setSpacing(12)
-        
-        self.notifications_check = QCheckBox("Show notifications")
-        self.notifications_check.setMinimumHeight(25)
-        self.notifications_check.setChecked(
-            self.settings_manager.get("show_notifications", True)
-        )
-        notif_layout.addWidget(self.notifications_check)
-        
-        notif_group.setLayout(notif_layout)
-        layout.addWidget(notif_group)
-        
-        # Battery
-        battery_group = QGroupBox("Battery Awareness")
-        battery_layout = QVBoxLayout()
-        battery_layout.setSpacing(12)
-        
-        battery_info = QLabel("Disable auto-hotspot when battery is below:")
-        battery_layout.addWidget(battery_info)
-        
-        battery_control_layout = QHBoxLayout()
-        self.battery_spin = QSpinBox()
-        self.battery_spin.setMinimumWidth(100)
-        self.battery_spin.setMinimumHeight(30)
-        self.battery_spin.setRange(0, 100)
-        self.battery_spin.setSuffix("%")
-        self.battery_spin.setValue(self.settings_manager.get("battery_threshold", 0))
-        battery_control_layout.addWidget(self.battery_spin)
-        
-        battery_note = QLabel("(0 = disabled)")
-        battery_note.setStyleSheet("color: #888888; font-size: 11px;")
-        battery_control_layout.addWidget(battery_note)
-        battery_control_layout.addStretch()
-        battery_layout.addLayout(battery_control_layout)
-        
-        battery_group.setLayout(battery_layout)
-        layout.addWidget(battery_group)
-        
-        layout.addStretch()
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        save_btn = QPushButton("Save")
-        save_btn.setMinimumHeight(35)
-        save_btn.setMinimumWidth(100)
-        save_btn.clicked.connect(self.save_settings)
-        button_layout.addWidget(save_btn)
-        
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setMinimumHeight(35)
-        cancel_btn.setMinimumWidth(100)
-        cancel_btn.clicked.connect(self.reject)
-        button_layout.addWidget(cancel_btn)
-        
-        layout.addLayout(button_layout)
-        
-        self.setLayout(layout)
-        
-        # Apply dark theme with better input visibility
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e1e;
-                color: #e8e8e8;
-            }
-            QGroupBox {
-                color: #e8e8e8;
-                border: 1px solid #3a3a3a;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QLabel {
-                color: #d8d8d8;
-            }
-            QCheckBox {
-                color: #d8d8d8;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QSpinBox {
-                background-color: #2a2a2a;
-                color: #e8e8e8;
-                border: 2px solid #4a4a4a;
-                border-radius: 4px;
-                padding: 5px;
-                font-size: 13px;
-            }
-            QSpinBox:focus {
-                border: 2px solid #8b7355;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #3a3a3a;
-                border: none;
-                width: 20px;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #4a4a4a;
-            }
-            QPushButton {
-                background-color: #8b7355;
-                color: #f5f5dc;
-                border: 2px solid #6b5344;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #9b8365;
-            }
-        """)
+    One command per line, one JSON reply per line. Status is answered from the
+    keeper's cached snapshot, so a query never runs a probe.
+    """
+    MAX_LINE = 4096  # bytes without a newline before a client is dropped
     
-    def save_settings(self):
-        """Save settings and close"""
-        self.settings_manager.set("check_interval", self.interval_spin.value())
-        self.settings_manager.set("debounce_time", self.debounce_spin.value())
-        self.settings_manager.set("auto_disable_on_wifi_disconnect", self.auto_disable_check.isChecked())
-        self.settings_manager.set("show_notifications", self.notifications_check.isChecked())
-        self.settings_manager.set("battery_threshold", self.battery_spin.value())
-        
-        self.accept()
-
-
-class LogViewerDialog(QDialog):
-    """Log viewer dialog"""
-    
-    def __init__(self, parent, log_file):
-        super().__init__(parent)
-        self.log_file = log_file
-        self.init_ui()
-    
-    def init_ui(self):
-        """Initialize log viewer UI"""
-        self.setWindowTitle("Log Viewer")
-        self.setMinimumSize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #1a1a1a;
-                color: #e8e8e8;
-                font-family: Consolas, monospace;
-                font-size: 10pt;
-            }
-        """)
-        
-        # Load log file
-        try:
-            with open(self.log_file, 'r') as f:
-                self.log_text.setPlainText(f.read())
-        except Exception as e:
-            self.log_text.setPlainText(f"Error loading log: {e}")
-        
-        layout.addWidget(self.log_text)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self.refresh_log)
-        button_layout.addWidget(refresh_btn)
-        
-        clear_btn = QPushButton("Clear Log")
-        clear_btn.clicked.connect(self.clear_log)
-        button_layout.addWidget(clear_btn)
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(self.close)
-        button_layout.addWidget(close_btn)
-        
-        layout.addLayout(button_layout)
-        
-        self.setLayout(layout)
-        
-        # Dark theme
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e1e;
-            }
-            QPushButton {
-                background-color: #8b7355;
-                color: #f5f5dc;
-                border: 2px solid #6b5344;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #9b8365;
-            }
-        """)
+    def __init__(self, keeper, name=None):
+        super().__init__()
+        self.keeper = keeper
+        self.name = name or hotspotkeeper_ctl.endpoint()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)  # current user only
+        self.server.newConnection.connect(self.on_new_connection)
+        self.commands = {
+            'status': self.cmd_status,
+            'enable': lambda arg: self.cmd_hotspot(True),
+            'disable': lambda arg: self.cmd_hotspot(False),
+            'auto': self.cmd_auto,
+            'uptime': self.cmd_uptime,
+            'ping': lambda arg: {'ok': True, 'pid': os.getpid()},
+            'show': lambda arg: {'ok': False, 'error': 'running headless - no window to show'},
+        }
     
-    def refresh_log(self):
-        """Refresh log content"""
-        try:
-            with open(self.log_file, 'r') as f:
-                self.log_text.setPlainText(f.read())
-            # Scroll to bottom
-            self.log_text.verticalScrollBar().setValue(
-                self.log_text.verticalScrollBar().maximum()
-            )
-        except Exception as e:
-            self.log_text.setPlainText(f"Error loading log: {e}")
-    
-    def clear_log(self):
-        """Clear log file"""
-        reply = QMessageBox.question(
-            self, 'Clear Log',
-            'Are you sure you want to clear the log file?',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if reply == QMessageBox.Yes:
+    def register(self, command, handler):
+        """Add or replace a command; `handler(arg)` returns the reply dict"""
+        self.commands[command] = handler
+    
+    def start(self):
+        """Start listening; returns False (and logs) if the endpoint is unavailable"""
+        # A socket file left by a crash would block listen(); the single-instance
+        # check has already run, so nobody else is serving it
+        QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            logging.error(f"Control endpoint unavailable: {self.server.errorString()}")
+            return False
+        logging.info(f"Control endpoint listening on {self.server.fullServerName()}")
+        return True
+    
+    def close(self):
+        self.server.close()
+    
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.on_ready_read(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            metrics.inc('ipc.connections')
+    
+    def on_ready_read(self, connection):
+        while connection.canReadLine():
+            line = bytes(connection.readLine()).decode('utf-8', 'replace').strip()
+            if line:
+                connection.write((json.dumps(self.handle(line)) + '\n').encode('utf-8'))
+        if connection.bytesAvailable() > self.MAX_LINE:
+            logging.warning("Control client sent an oversized request; disconnecting")
+            connection.abort()
+    
+    def handle(self, line):
+        """Run one command line and return the reply"""
+        metrics.inc('ipc.requests')
+        with metrics.timer('ipc.request'):
+            command, _, arg = line.partition(' ')
+            handler = self.commands.get(command.lower())
+            if handler is None:
+                return {'ok': False, 'error': f"unknown command: {command}"}
             try:
-                with open(self.log_file, 'w') as f:
-                    f.write("")
-                self.log_text.clear()
-                logging.info("Log file cleared by user")
+                return handler(arg.strip().lower())
             except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to clear log: {e}")
+                logging.error(f"Control command '{line}' failed: {e}")
+                return {'ok': False, 'error': str(e)}
+    
+    def cmd_status(self, arg):
+        return {'ok': True, 'status': self.keeper.status()}
+    
+    def cmd_hotspot(self, enable):
+        if not self.keeper.request_hotspot(enable):
+            return {'ok': False, 'error': 'an enable/disable operation is already in progress'}
+        return {'ok': True}
+    
+    def cmd_auto(self, arg):
+        settings_manager = self.keeper.settings_manager
+        if arg == 'toggle':
+            enabled = not settings_manager.settings.auto_hotspot_enabled
+        elif arg in ('on', 'off'):
+            enabled = arg == 'on'
+        else:
+            return {'ok': False, 'error': 'auto needs on, off or toggle'}
+        if settings_manager.set("auto_hotspot_enabled", enabled):
+            logging.info(f"Auto-hotspot {'enabled' if enabled else 'disabled'} via control endpoint")
+        return {'ok': True, 'auto_enabled': settings_manager.settings.auto_hotspot_enabled}
+    
+    def cmd_uptime(self, arg):
+        try:
+            days = float(arg) if arg else 30.0
+        except ValueError:
+            return {'ok': False, 'error': 'uptime takes a number of days'}
+        if not self.keeper.history.enabled:
+            return {'ok': False, 'error': 'history is disabled'}
+        return {'ok': True, 'uptime': self.keeper.history.uptime(days * 86400)}
 
 
-class MainWindow(QMainWindow):
-    """Main application window"""
+class HotspotKeeper(QObject):
+    """
+    Monitoring core: network/power monitors, probe engine, poll scheduler and
+    the auto-enable policy, with no widgets.
+    
+    Runs on its own under QCoreApplication (--headless) or behind the tray
+    GUI, which only renders `status_changed` and reacts to operations.
+    """
+    status_changed = Signal(object)  # StatusSnapshot, after the policy has seen it
+    operation_started = Signal(bool, bool)  # enable, automatic
+    operation_finished = Signal(object, bool)  # TetheringResult, automatic
+    telemetry_sampled = Signal(object)  # TelemetrySample, while the hotspot is on
+    
+    SHUTDOWN_OPERATION_WAIT = 3  # seconds an in-flight enable/disable gets before the host is stopped
     
-    def __init__(self, start_minimized=False, settings_manager=None, log_file=None):
+    def __init__(self, settings_manager):
         super().__init__()
         self.settings_manager = settings_manager
-        self.log_file = log_file
-        self.auto_hotspot_enabled = self.settings_manager.get("auto_hotspot_enabled", True)
-        self.is_processing = False
-        self.start_minimized = start_minimized
-        self.last_manual_disable_time = None
-        self.last_enable_time = None  # Track when we last enabled hotspot
+        self.settings = settings_manager.settings  # typed; changes arrive via on_settings_changed
+        self.hotspot_operation = None  # Enable/disable operation in flight
+        self.operation_automatic = False
+        self.running = False
+        
+        # Auto-enable/disable decisions: debounce, failure cooldown, operation in flight
+        self.policy = HotspotPolicy()
+        self.policy.configure(self.settings)
+        
+        # Rolling binary trace of snapshots and decisions (replay with --replay-trace)
+        trace_path = self.settings_manager.settings_dir / "trace.bin"
+        self.trace = TraceRecorder(trace_path if self.settings.trace_enabled else None)
+        now = time.monotonic()
+        self.trace.session(now)
+        self.trace.config(self.policy, now)
+        
+        # Persistent status history with hourly/daily rollups (uptime, history chart)
+        self.history = self.create_history()
         
-        # Add retry tracking to prevent spam
-        self.consecutive_failures = 0
-        self.max_consecutive_failures = 3  # Stop trying after 3 failures
-        self.last_failure_time = None
-        self.failure_cooldown = 60  # Wait 60 seconds after max failures before trying again
-        
-        # FIXED: Track verification attempts to prevent spam
-        self.pending_verification = False
-        self.verification_attempts = 0
-        self.max_verification_attempts = 3
-        
-        self.init_ui()
-        self.init_monitoring()
-        
-        # Check for updates
-        self.update_checker = UpdateChecker()
-        self.update_checker.update_available.connect(self.show_update_notification)
-        self.update_checker.start()
-        
-    def init_ui(self):
-        """Initialize the user interface"""
-        self.setWindowTitle("HotspotKeeper v1.1.0")
-        self.setFixedSize(450, 400)
-        
-        # Set window icon
-        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'icon.ico')
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        
-        # Main widget and layout
-        main_widget = QWidget()
-        self.setCentralWidget(main_widget)
-        layout = QVBoxLayout(main_widget)
-        layout.setSpacing(15)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Title
-        title = QLabel("HotspotKeeper")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #e8e8e8;")
-        layout.addWidget(title)
-        
-        # Slogan
-        slogan = QLabel("Never Forget Hotspot Again.")
-        slogan.setStyleSheet("font-size: 12px; font-style: italic; color: #a8a8a8;")
-        layout.addWidget(slogan)
-        
-        # Status frame
-        status_frame = QFrame()
-        status_frame.setFrameStyle(QFrame.StyledPanel)
-        status_frame.setStyleSheet("""
-            QFrame {
-                background-color: #2a2a2a;
-                border: 1px solid #3a3a3a;
-                border-radius: 8px;
-                padding: 10px;
-            }
-        """)
-        status_layout = QVBoxLayout(status_frame)
-        
-        self.wifi_status = QLabel("WiFi: Checking...")
-        self.wifi_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        status_layout.addWidget(self.wifi_status)
-        
-        self.hotspot_status = QLabel("Hotspot: Checking...")
-        self.hotspot_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        status_layout.addWidget(self.hotspot_status)
-        
-        self.battery_status = QLabel("Battery: Checking...")
-        self.battery_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        status_layout.addWidget(self.battery_status)
-        
-        layout.addWidget(status_frame)
-        
-        # Settings
-        self.auto_enable_check = QCheckBox("Enable Auto-Hotspot")
-        self.auto_enable_check.setChecked(self.auto_hotspot_enabled)
-        self.auto_enable_check.setStyleSheet("""
-            QCheckBox {
-                font-size: 13px;
-                color: #d8d8d8;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 3px;
-                border: 2px solid #6b5344;
-                background-color: #2a2a2a;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #8b7355;
-                border-color: #8b7355;
-            }
-        """)
-        self.auto_enable_check.stateChanged.connect(self.toggle_auto_hotspot)
-        layout.addWidget(self.auto_enable_check)
-        
-        self.startup_check = QCheckBox("Start with Windows")
-        self.startup_check.setChecked(StartupManager.is_startup_enabled())
-        self.startup_check.setStyleSheet("""
-            QCheckBox {
-                font-size: 13px;
-                color: #d8d8d8;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 3px;
-                border: 2px solid #6b5344;
-                background-color: #2a2a2a;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #8b7355;
-                border-color: #8b7355;
-            }
-        """)
-        self.startup_check.stateChanged.connect(self.toggle_startup)
-        layout.addWidget(self.startup_check)
-        
-        # Manual controls
-        controls_layout = QHBoxLayout()
-        controls_layout.setSpacing(10)
-        
-        self.enable_btn = QPushButton("Enable Hotspot")
-        self.enable_btn.setMinimumWidth(180)
-        self.enable_btn.setFixedHeight(40)
-        self.enable_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #8b7355;
-                color: #f5f5dc;
-                border: 2px solid #6b5344;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #9b8365;
-                border-color: #7b6354;
-            }
-            QPushButton:pressed {
-                background-color: #6b5344;
-            }
-            QPushButton:disabled {
-                background-color: #4a4a4a;
-                color: #808080;
-                border-color: #3a3a3a;
-            }
-        """)
-        self.enable_btn.clicked.connect(self.manual_enable_hotspot)
-        controls_layout.addWidget(self.enable_btn)
-        
-        self.disable_btn = QPushButton("Disable Hotspot")
-        self.disable_btn.setMinimumWidth(180)
-        self.disable_btn.setFixedHeight(40)
-        self.disable_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #8b6f47;
-                color: #f5f5dc;
-                border: 2px solid #6b5337;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #9b7f57;
-                border-color: #7b6347;
-            }
-            QPushButton:pressed {
-                background-color: #6b5337;
-            }
-            QPushButton:disabled {
-                background-color: #4a4a4a;
-                color: #808080;
-                border-color: #3a3a3a;
-            }
-        """)
-        self.disable_btn.clicked.connect(self.manual_disable_hotspot)
-        controls_layout.addWidget(self.disable_btn)
-        
-        layout.addLayout(controls_layout)
-        
-        # Settings button
-        settings_btn = QPushButton("⚙ Settings")
-        settings_btn.setFixedHeight(35)
-        settings_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #5a5a5a;
-                color: #f5f5dc;
-                border: 2px solid #4a4a4a;
-                border-radius: 5px;
-                padding: 5px 15px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #6a6a6a;
-            }
-        """)
-        settings_btn.clicked.connect(self.show_settings)
-        layout.addWidget(settings_btn)
-        
-        # Info label
-        info = QLabel("Continuously monitors and keeps hotspot enabled when WiFi is connected.")
-        info.setWordWrap(True)
-        info.setStyleSheet("font-size: 11px; color: #888888;")
-        layout.addWidget(info)
-        
-        # GitHub link
-        github_link = QLabel('<a href="https://github.com/Moanesbbr/HotspotKeeper" style="color: #8b7355;">Open Source on GitHub</a>')
-        github_link.setOpenExternalLinks(True)
-        github_link.setStyleSheet("font-size: 11px;")
-        github_link.setAlignment(Qt.AlignCenter)
-        layout.addWidget(github_link)
-        
-        # Apply dark theme
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e1e;
-            }
-        """)
-    
-    def init_monitoring(self):
-        """Initialize network monitoring and system tray"""
         # Network monitor
         self.monitor = NetworkMonitor()
         self.monitor.wifi_connected.connect(self.on_wifi_connected)
         self.monitor.wifi_disconnected.connect(self.on_wifi_disconnected)
-        self.monitor.start()
         
-        # Status update timer - interval from settings
+        # Probe engine - collects status off the main thread
+        self.probe_engine = ProbeEngine()
+        self.probe_engine.snapshot_ready.connect(self.apply_status)
+        self.last_apply_time = 0.0  # seconds the main thread spent on the last snapshot
+        
+        # Status polling - adaptive interval, rescheduled after every snapshot
+        self.scheduler = PollScheduler(
+            self.settings.check_interval,
+            self.settings.max_check_interval
+        )
+        self.last_snapshot = None
+        self.next_wakeup_probes = True
         self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status)
-        interval = self.settings_manager.get("check_interval", 3) * 1000
-        self.status_timer.start(interval)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.on_poll_timer)
         
-        # System tray
-        self.create_tray_icon()
+        # Client count and throughput, sampled while the hotspot is on
+        self.telemetry = TelemetrySampler(self.settings.telemetry_interval)
+        self.telemetry.sampled.connect(self.telemetry_sampled)
         
-        # Initial status update
-        self.update_status()
+        # Local control endpoint for scripts (hotspotkeeper_ctl.py)
+        self.control_server = ControlServer(self)
     
-    def create_tray_icon(self):
-        """Create system tray icon and menu"""
-        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'icon.ico')
-        
-        if os.path.exists(icon_path):
-            self.base_icon = QIcon(icon_path)
-        else:
-            # Fallback icon
-            pixmap = QPixmap(64, 64)
-            pixmap.fill(Qt.transparent)
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setBrush(QColor("#8b7355"))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(20, 40, 24, 24)
-            for i in range(3):
-                radius = 15 + (i * 8)
-                painter.drawArc(32 - radius, 32 - radius, radius * 2, radius * 2, 0, 180 * 16)
-            painter.end()
-            self.base_icon = QIcon(pixmap)
-        
-        self.tray_icon = QSystemTrayIcon(self.base_icon, self)
-        
-        # Create menu
-        tray_menu = QMenu()
-        
-        show_action = QAction("Show Window", self)
-        show_action.triggered.connect(self.show)
-        tray_menu.addAction(show_action)
-        
-        tray_menu.addSeparator()
-        
-        self.auto_action = QAction("Auto-Hotspot Enabled", self)
-        self.auto_action.setCheckable(True)
-        self.auto_action.setChecked(self.auto_hotspot_enabled)
-        self.auto_action.triggered.connect(self.toggle_auto_from_tray)
-        tray_menu.addAction(self.auto_action)
-        
-        tray_menu.addSeparator()
-        
-        settings_action = QAction("Settings", self)
-        settings_action.triggered.connect(self.show_settings)
-        tray_menu.addAction(settings_action)
-        
-        logs_action = QAction("View Logs", self)
-        logs_action.triggered.connect(self.show_logs)
-        tray_menu.addAction(logs_action)
-        
-        tray_menu.addSeparator()
-        
-        quit_action = QAction("Exit", self)
-        quit_action.triggered.connect(self.quit_app)
-        tray_menu.addAction(quit_action)
-        
-        self.tray_icon.setContextMenu(tray_menu)
-        self.tray_icon.activated.connect(self.tray_icon_activated)
-        self.tray_icon.show()
-    
-    def update_tray_icon_status(self, wifi_on, hotspot_on):
-        """Update tray icon based on status (visual feedback)"""
-        # This creates a simple colored indicator overlay
-        # You could make this more sophisticated
-        if wifi_on and hotspot_on:
-            self.tray_icon.setToolTip("HotspotKeeper - WiFi & Hotspot Active")
-        elif wifi_on:
-            self.tray_icon.setToolTip("HotspotKeeper - WiFi Active")
-        else:
-            self.tray_icon.setToolTip("HotspotKeeper - Monitoring")
+    def create_history(self):
+        """A HistoryStore for the current settings (disabled if history is off)"""
+        settings = self.settings
+        directory = self.settings_manager.settings_dir / "history" if settings.history_enabled else None
+        return HistoryStore(directory, settings.history_tick_days, settings.history_hour_days,
+                            settings.history_day_days)
     
-    def tray_icon_activated(self, reason):
-        """Handle tray icon clicks"""
-        if reason == QSystemTrayIcon.DoubleClick:
-            if self.isVisible():
-                self.hide()
-            else:
-                self.show()
-                self.activateWindow()
+    def start(self):
+        """Start monitoring and request the first status"""
+        self.running = True
+        self.control_server.start()
+        self.monitor.start()
+        self.probe_engine.start()
+        self.telemetry.start()
+        BatteryMonitor.subscribe(self.on_power_changed)
+        self.settings_manager.subscribe(self.on_settings_changed)
+        self.update_status()
     
     def update_status(self):
-        """Update WiFi and hotspot status, and auto-enable if needed - FIXED VERSION"""
-        wifi_connected = self.monitor.check_wifi_connection()
-        hotspot_enabled = HotspotManager.is_hotspot_enabled()
-        battery_level = BatteryMonitor.get_battery_percentage()
-        is_plugged = BatteryMonitor.is_plugged_in()
-        
-        # FIXED: Extended grace period to 15 seconds (hotspot takes time to start)
-        grace_period = 15  # seconds (increased from 5)
-        in_grace_period = False
-        
-        if self.last_enable_time:
-            elapsed_since_enable = (datetime.now() - self.last_enable_time).total_seconds()
-            in_grace_period = elapsed_since_enable < grace_period
-            
-            if in_grace_period:
-                # During grace period, assume hotspot is enabled
-                # Don't override if we actually detected it as enabled
-                if not hotspot_enabled:
-                    logging.debug(f"In grace period ({elapsed_since_enable:.1f}s/{grace_period}s) - assuming hotspot is starting")
-                    hotspot_enabled = True
-        
-        # FIXED: Reset failure counter only if hotspot is truly enabled (not grace period assumption)
-        actual_hotspot_status = HotspotManager.is_hotspot_enabled()
-        if actual_hotspot_status and self.consecutive_failures > 0:
-            logging.info(f"Hotspot confirmed enabled. Resetting failure counter (was {self.consecutive_failures})")
-            self.consecutive_failures = 0
-            self.last_failure_time = None
-            self.verification_attempts = 0
-            self.pending_verification = False
-        
-        # Update WiFi status
-        if wifi_connected:
-            self.wifi_status.setText("WiFi: ✓ Connected")
-            self.wifi_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
-        else:
-            self.wifi_status.setText("WiFi: ✗ Disconnected")
-            self.wifi_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        
-        # Update hotspot status
-        if hotspot_enabled:
-            self.hotspot_status.setText("Hotspot: ✓ Enabled")
-            self.hotspot_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
-        else:
-            self.hotspot_status.setText("Hotspot: ✗ Disabled")
-            self.hotspot_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        
-        # Update battery status
-        if is_plugged:
-            self.battery_status.setText(f"Battery: {battery_level}% (Plugged In)")
-            self.battery_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
+        """Request a status refresh - probes run on the probe engine thread"""
+        metrics.inc('tick.requests')
+        self.probe_engine.request_tick()
+    
+    def status(self):
+        """Last snapshot and auto-hotspot state as plain data - never probes"""
+        status = {
+            'auto_enabled': self.policy.auto_enabled,
+            'busy': self.policy.busy,
+            'backend': HotspotBackend.instance().name,
+        }
+        snapshot = self.last_snapshot
+        if snapshot is not None:
+            status.update(snapshot._asdict())
+            del status['requested_at'], status['completed_at']
+            status['age'] = round(time.monotonic() - snapshot.completed_at, 3)  # seconds
+        sample = self.telemetry.latest()
+        if sample is not None:
+            status['client_count'] = sample.client_count
+            status['down_mbps'] = round(sample.down_mbps, 3)
+            status['up_mbps'] = round(sample.up_mbps, 3)
+        return status
+    
+    def on_poll_timer(self):
+        """Scheduled wakeup - probe, or only re-check the pause condition"""
+        self.scheduler.record_wakeup(self.next_wakeup_probes)
+        metrics.inc('scheduler.wakeups')
+        metrics.set_gauge('scheduler.polls_per_minute', round(self.scheduler.polls_per_minute(), 2))
+        if self.next_wakeup_probes:
+            self.update_status()  # apply_status schedules the next wakeup
         else:
-            self.battery_status.setText(f"Battery: {battery_level}%")
-            if battery_level < 20:
-                self.battery_status.setStyleSheet("font-size: 13px; color: #d08c8c;")
-            else:
-                self.battery_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
-        
-        # Update tray icon tooltip
-        self.update_tray_icon_status(wifi_connected, hotspot_enabled)
-        
-        # Check battery threshold
-        battery_threshold = self.settings_manager.get("battery_threshold", 0)
-        battery_ok = (battery_threshold == 0 or 
-                     battery_level >= battery_threshold or 
-                     is_plugged)
-        
-        # Check debounce time
-        debounce_time = self.settings_manager.get("debounce_time", 10)
-        debounce_ok = True
-        if self.last_manual_disable_time:
-            elapsed = (datetime.now() - self.last_manual_disable_time).total_seconds()
-            debounce_ok = elapsed >= debounce_time
-        
-        # FIXED: Check failure cooldown
-        if self.consecutive_failures >= self.max_consecutive_failures:
-            if self.last_failure_time:
-                elapsed_since_failure = (datetime.now() - self.last_failure_time).total_seconds()
-                if elapsed_since_failure < self.failure_cooldown:
-                    return
-                else:
-                    logging.info(f"Cooldown expired. Resetting retry counter.")
-                    self.consecutive_failures = 0
-                    self.last_failure_time = None
-        
-        # CRITICAL FIX: Auto-enable ONLY when all conditions met
-        # Added check for pending_verification to prevent re-triggering during verification
-        if (self.auto_hotspot_enabled and 
-            wifi_connected and  # WiFi must be connected
-            not hotspot_enabled and  # Hotspot must be disabled
-            not self.is_processing and  # Not currently processing
-            not self.pending_verification and  # NEW: Not waiting for verification
-            battery_ok and
-            debounce_ok):
-            
-            self.is_processing = True
-            self.pending_verification = True  # NEW: Mark as pending verification
-            
-            # Only show notification on first attempt, not during grace period retries
-            if self.consecutive_failures == 0 and self.settings_manager.get("show_notifications", True):
-                self.tray_icon.showMessage(
-                    "Auto-Hotspot",
-                    "Hotspot was disabled. Re-enabling...",
-                    QSystemTrayIcon.Information,
-                    2000
-                )
-            
-            logging.info(f"Auto-enabling hotspot (WiFi connected) - Attempt {self.consecutive_failures + 1}")
-            success = HotspotManager.enable_hotspot()
-            
-            if success:
-                self.consecutive_failures = 0
-                self.last_failure_time = None
-                self.last_enable_time = datetime.now()
-                self.verification_attempts = 0
-                
-                # FIXED: Wait longer (5 seconds) before doing verification check
-                QTimer.singleShot(5000, lambda: self._verify_hotspot_enabled())
-            else:
-                self.consecutive_failures += 1
-                self.last_failure_time = datetime.now()
-                self.is_processing = False
-                self.pending_verification = False
-                
-                logging.warning(f"Auto-enable failed (attempt {self.consecutive_failures}/{self.max_consecutive_failures})")
-                
-                if self.consecutive_failures >= self.max_consecutive_failures:
-                    if self.settings_manager.get("show_notifications", True):
-                        self.tray_icon.showMessage(
-                            "Auto-Hotspot Failed",
-                            f"Failed {self.max_consecutive_failures} times. Will retry in {self.failure_cooldown}s.\n\n"
-                            "Please check:\n• Mobile Hotspot is configured\n• You have admin privileges",
-                            QSystemTrayIcon.Warning,
-                            8000
-                        )
-                    logging.error(f"Max failures reached. Cooldown: {self.failure_cooldown}s")
-        
-        # Auto-disable on WiFi disconnect if enabled
-        if (self.settings_manager.get("auto_disable_on_wifi_disconnect", False) and
-            not wifi_connected and hotspot_enabled and 
-            not self.is_processing and not in_grace_period):
-            self.is_processing = True
+            self.schedule_next_poll()
+    
+    def polling_pause_reason(self):
+        """Why timer polling should pause right now ('idle', 'battery') or None"""
+        if (self.settings.pause_polling_on_battery and
+                self.last_snapshot is not None and not self.last_snapshot.is_plugged):
+            return 'battery'
+        if self.settings.pause_polling_when_idle:
+            idle = user_idle_seconds()
+            if idle is not None and idle >= self.settings.idle_threshold:
+                return 'idle'
+        return None
+    
+    def schedule_next_poll(self):
+        """(Re)start the poll timer using the scheduler's next interval"""
+        if not self.running:
+            return
+        delay, self.next_wakeup_probes = self.scheduler.next_wakeup(self.polling_pause_reason() is not None)
+        metrics.set_gauge('scheduler.next_delay', delay)
+        self.status_timer.start(int(delay * 1000))
+    
+    def apply_status(self, snapshot):
+        """Act on a status snapshot and time how long the main thread was busy"""
+        previous = self.last_snapshot
+        if previous is not None and snapshot.completed_at < previous.completed_at:
+            logging.debug("Ignoring a snapshot older than the current one")
+            return
+        started = time.perf_counter()
+        try:
+            self.last_snapshot = snapshot
+            if previous is not None and (previous.wifi_connected, previous.hotspot_enabled, previous.is_plugged) != \
+                    (snapshot.wifi_connected, snapshot.hotspot_enabled, snapshot.is_plugged):
+                self.scheduler.transition('state changed')
+            self.telemetry.update(snapshot)
+            self.status_changed.emit(snapshot)
+            self._apply_status(snapshot)
+        finally:
+            self.schedule_next_poll()
+            self.last_apply_time = time.perf_counter() - started
+            metrics.observe('core.apply_status', self.last_apply_time)
+    
+    def _apply_status(self, snapshot):
+        """Auto-enable/disable if the policy says so"""
+        now = time.monotonic()
+        self.trace.snapshot(snapshot, now)
+        sample = self.telemetry.latest()
+        self.history.record(snapshot, time.time(), sample.client_count if sample is not None else None)
+        failures = self.policy.consecutive_failures
+        action = self.policy.decide(snapshot, now)
+        if action:
+            self.trace.action(action, True, now)
+        if failures and not self.policy.consecutive_failures:
+            logging.info(f"Resetting failure counter (was {failures})")
+        
+        if action == PolicyAction.ENABLE:
+            logging.info(f"Auto-enabling hotspot (WiFi connected) - Attempt {self.policy.consecutive_failures + 1}")
+            self.start_hotspot_operation(True, automatic=True)
+        
+        elif action == PolicyAction.DISABLE:
             logging.info("Auto-disabling hotspot (WiFi disconnected)")
-            if HotspotManager.disable_hotspot():
-                self.last_enable_time = None
-                QTimer.singleShot(2500, lambda: self._finish_auto_enable())
-            else:
-                self.is_processing = False
+            self.start_hotspot_operation(False, automatic=True)
     
-    def _verify_hotspot_enabled(self):
-        """
-        NEW METHOD: Verify hotspot was actually enabled after enable command
-        This prevents infinite re-enable loops
-        """
-        self.verification_attempts += 1
-        
-        # Check if hotspot is now actually enabled
-        actual_status = HotspotManager.is_hotspot_enabled()
-        
-        if actual_status:
-            # Success! Hotspot is confirmed enabled
-            logging.info(f"Hotspot verified as enabled after {self.verification_attempts} check(s)")
-            self.is_processing = False
-            self.pending_verification = False
-            self.verification_attempts = 0
-            self.consecutive_failures = 0
-            self.update_status()
-        else:
-            # Still not detected - retry up to max attempts
-            if self.verification_attempts < self.max_verification_attempts:
-                logging.warning(f"Hotspot not yet detected, verification attempt {self.verification_attempts}/{self.max_verification_attempts}")
-                # Wait another 3 seconds and check again
-                QTimer.singleShot(3000, lambda: self._verify_hotspot_enabled())
-            else:
-                # Max verification attempts reached - consider it failed
-                logging.error(f"Hotspot not detected after {self.max_verification_attempts} verification attempts")
-                self.is_processing = False
-                self.pending_verification = False
-                self.verification_attempts = 0
-                self.consecutive_failures += 1
-                
-                if self.settings_manager.get("show_notifications", True):
-                    self.tray_icon.showMessage(
-                        "Hotspot Enable Issue",
-                        "Hotspot command sent but not detected as active.\n"
-                        "Please check Windows Mobile Hotspot settings.",
-                        QSystemTrayIcon.Warning,
-                        5000
-                    )
-                
-                self.update_status()
+    def request_hotspot(self, enable):
+        """Manually enable/disable the hotspot; False if an operation is already running"""
+        if self.policy.busy:
+            return False
+        logging.info(f"Manual hotspot {'enable' if enable else 'disable'} requested")
+        self.scheduler.transition('manual enable' if enable else 'manual disable')
+        self.start_hotspot_operation(enable)
+        return True
+    
+    def start_hotspot_operation(self, enable, automatic=False):
+        """Start an enable/disable operation; `operation_finished` reports its TetheringResult"""
+        if not automatic:
+            now = time.monotonic()
+            self.policy.manual_operation(enable, now)
+            self.trace.action(PolicyAction.ENABLE if enable else PolicyAction.DISABLE, False, now)
+        self.operation_automatic = automatic
+        self.hotspot_operation = HotspotOperation(enable)
+        self.hotspot_operation.completed.connect(self._on_operation_finished)
+        self.operation_started.emit(enable, automatic)
+        self.hotspot_operation.start()
     
-    def _finish_auto_enable(self):
-        """Complete auto-enable/disable process"""
-        self.is_processing = False
-        self.pending_verification = False
+    def _on_operation_finished(self, result):
+        """Common bookkeeping once Windows has reported an operation's outcome"""
+        now = time.monotonic()
+        enable = result.action == 'enable'
+        automatic = self.operation_automatic
+        self.policy.operation_finished(enable, result.success, now, automatic)
+        self.trace.outcome(enable, result.success, automatic, result.elapsed, now)
+        
+        if automatic and not result.success:
+            if enable:
+                policy = self.policy
+                self.scheduler.transition('enable failed')
+                logging.warning(f"Auto-enable failed: {result.status} "
+                                f"(attempt {policy.consecutive_failures}/{policy.max_failures})")
+                if policy.consecutive_failures >= policy.max_failures:
+                    logging.error(f"Max failures reached. Cooldown: {policy.failure_cooldown}s")
+            else:
+                logging.warning(f"Auto-disable failed: {result.status} {result.message}")
+        
+        self.operation_finished.emit(result, automatic)
+        self.probe_engine.invalidate()
         self.update_status()
     
     def on_wifi_connected(self):
         """Handle WiFi connection event"""
         logging.info("WiFi connection detected")
+        self.scheduler.transition('wifi connected')
+        self.probe_engine.invalidate()
         self.update_status()
     
     def on_wifi_disconnected(self):
         """Handle WiFi disconnection event"""
         logging.info("WiFi disconnection detected")
+        self.scheduler.transition('wifi disconnected')
+        self.probe_engine.invalidate()
         self.update_status()
     
-    def toggle_auto_hotspot(self, state):
-        """Toggle auto-hotspot feature"""
-        self.auto_hotspot_enabled = state == Qt.Checked
-        # Update tray menu checkbox immediately
-        self.auto_action.setChecked(self.auto_hotspot_enabled)
-        self.settings_manager.set("auto_hotspot_enabled", self.auto_hotspot_enabled)
-        logging.info(f"Auto-hotspot {'enabled' if self.auto_hotspot_enabled else 'disabled'}")
-    
-    def toggle_auto_from_tray(self):
-        """Toggle auto-hotspot from tray menu"""
-        self.auto_hotspot_enabled = self.auto_action.isChecked()
-        # Update main window checkbox immediately
-        self.auto_enable_check.blockSignals(True)  # Prevent signal loop
-        self.auto_enable_check.setChecked(self.auto_hotspot_enabled)
-        self.auto_enable_check.blockSignals(False)
-        self.settings_manager.set("auto_hotspot_enabled", self.auto_hotspot_enabled)
-        logging.info(f"Auto-hotspot {'enabled' if self.auto_hotspot_enabled else 'disabled'} from tray")
-    
-    def toggle_startup(self, state):
-        """Toggle Windows startup"""
-        if state == Qt.Checked:
-            if StartupManager.enable_startup():
-                if self.settings_manager.get("show_notifications", True):
-                    self.tray_icon.showMessage(
-                        "Startup Enabled",
-                        "App will start minimized in tray with Windows",
-                        QSystemTrayIcon.Information,
-                        2000
-                    )
-        else:
-            StartupManager.disable_startup()
+    def on_power_changed(self, power_status):
+        """Handle a pushed power change (called from a system thread)"""
+        self.probe_engine.invalidate()
+        self.probe_engine.request_tick()
     
-    def manual_enable_hotspot(self):
-        """Manually enable hotspot"""
-        if self.is_processing:
-            return
-        
-        self.is_processing = True
-        self.enable_btn.setEnabled(False)
-        self.disable_btn.setEnabled(False)
-        self.enable_btn.setText("Enabling...")
-        
-        if self.settings_manager.get("show_notifications", True):
-            self.tray_icon.showMessage(
-                "HotspotKeeper",
-                "Enabling Mobile Hotspot...",
-                QSystemTrayIcon.Information,
-                2000
-            )
-        
-        logging.info("Manual hotspot enable requested")
-        QTimer.singleShot(100, self._do_enable_hotspot)
+    def on_settings_changed(self, changed):
+        """Apply changed settings to the components that use them"""
+        if changed & HotspotPolicy.SETTINGS:
+            self.policy.configure(self.settings)
+            self.trace.config(self.policy, time.monotonic())
+        if changed & {"log_level", "log_max_size_mb", "log_max_age_days", "log_backup_count"}:
+            configure_logging(self.settings)
+        if changed & {"check_interval", "max_check_interval", "pause_polling_when_idle",
+                      "pause_polling_on_battery", "idle_threshold"}:
+            # Apply new intervals and poll soon
+            self.scheduler.configure(self.settings.check_interval, self.settings.max_check_interval)
+            self.scheduler.transition('settings changed')
+            self.schedule_next_poll()
+        if "telemetry_interval" in changed:
+            self.telemetry.configure(self.settings.telemetry_interval)
+        if changed & {"history_enabled", "history_tick_days", "history_hour_days", "history_day_days"}:
+            # Reopening resizes the rings, keeping the newest records
+            self.history.close()
+            self.history = self.create_history()
     
-    def _do_enable_hotspot(self):
-        """Internal method to enable hotspot"""
-        success = HotspotManager.enable_hotspot()
-        
-        self.enable_btn.setText("Enable Hotspot")
-        self.enable_btn.setEnabled(True)
-        self.disable_btn.setEnabled(True)
-        self.is_processing = False
-        
-        # Reset failure counter on successful manual enable
-        if success:
-            self.consecutive_failures = 0
-            self.last_failure_time = None
-            self.last_enable_time = datetime.now()  # Track when we enabled
-        
-        # Wait longer before checking status
-        QTimer.singleShot(2500, self.update_status)
-        
-        if self.settings_manager.get("show_notifications", True):
-            if success:
-                self.tray_icon.showMessage(
-                    "HotspotKeeper",
-                    "Mobile Hotspot enabled successfully!",
-                    QSystemTrayIcon.Information,
-                    2000
-                )
-            else:
-                self.tray_icon.showMessage(
-                    "HotspotKeeper",
-                    "Failed to enable hotspot. Please check:\n• Mobile Hotspot is configured\n• You have admin privileges",
-                    QSystemTrayIcon.Warning,
-                    5000
-                )
-    
-    def manual_disable_hotspot(self):
-        """Manually disable hotspot"""
-        if self.is_processing:
-            return
-        
-        self.is_processing = True
-        self.enable_btn.setEnabled(False)
-        self.disable_btn.setEnabled(False)
-        self.disable_btn.setText("Disabling...")
-        
-        # Record manual disable time for debounce
-        self.last_manual_disable_time = datetime.now()
-        
-        if self.settings_manager.get("show_notifications", True):
-            self.tray_icon.showMessage(
-                "HotspotKeeper",
-                "Disabling Mobile Hotspot...",
-                QSystemTrayIcon.Information,
-                2000
-            )
-        
-        logging.info("Manual hotspot disable requested")
-        QTimer.singleShot(100, self._do_disable_hotspot)
-    
-    def _do_disable_hotspot(self):
-        """Internal method to disable hotspot"""
-        success = HotspotManager.disable_hotspot()
-        
-        self.disable_btn.setText("Disable Hotspot")
-        self.enable_btn.setEnabled(True)
-        self.disable_btn.setEnabled(True)
-        self.is_processing = False
-        
-        # Clear enable time since we're disabling
-        if success:
-            self.last_enable_time = None
-        
-        # Wait longer before checking status
-        QTimer.singleShot(2500, self.update_status)
-        
-        if self.settings_manager.get("show_notifications", True):
-            if success:
-                self.tray_icon.showMessage(
-                    "HotspotKeeper",
-                    "Mobile Hotspot disabled successfully!",
-                    QSystemTrayIcon.Information,
-                    2000
-                )
+    def shutdown(self):
+        """Stop monitoring and release the backend; settings and metrics are saved"""
+        self.running = False
+        self.status_timer.stop()
+        BatteryMonitor.unsubscribe(self.on_power_changed)
+        self.control_server.close()
+        self.monitor.stop()
+        self.monitor.wait()
+        self.probe_engine.stop()
+        self.probe_engine.wait()
+        self.telemetry.stop()
+        self.telemetry.wait()
+        logging.info(f"Poll scheduler: {self.scheduler.stats()}")
+        logging.info(f"Probe engine: {self.probe_engine.measured} status probes, "
+                     f"{self.probe_engine.reused} served from the cached status")
+        ring = self.telemetry.ring
+        logging.info(f"Telemetry: peak {ring.peak_clients} clients, {ring.total_sent / 1e6:.1f} MB to clients, "
+                     f"{ring.total_received / 1e6:.1f} MB from clients")
+        try:
+            metrics.dump(self.settings_manager.settings_dir / "metrics.json")
+        except Exception as e:
+            logging.error(f"Error saving metrics: {e}")
+        self.trace.close()
+        self.history.close()
+        self.settings_manager.unsubscribe(self.on_settings_changed)
+        self.settings_manager.save_settings()
+        
+        # An enable/disable in flight holds the PowerShell host: give it a moment,
+        # then stop the host (killed under the request if need be) so it returns
+        operation = self.hotspot_operation
+        if operation is not None:
+            operation.wait(self.SHUTDOWN_OPERATION_WAIT * 1000)
+        PowerShellHost.instance().shutdown()
+        # A running QThread must not be destroyed; the operation's own timeout bounds this
+        if operation is not None and not operation.wait(int((operation.timeout + 5) * 1000)):
+            logging.error("Hotspot operation still running at shutdown")
+        HotspotBackend.instance().close()
+
+
+def acquire_instance_lock(timeout=5):
+    """
+    Take the per-user single-instance lock, or hand this launch to the
+    instance that holds it.
+    
+    Returns the held QLockFile, or None if another instance is running. A lock
+    left behind by a crash is stale - its process is gone - and is taken over.
+    """
+    lock_dir = Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    lock = QLockFile(str(lock_dir / "instance.lock"))
+    lock.setStaleLockTime(0)  # only a dead owner makes the lock stale, never its age
+    deadline = time.monotonic() + timeout
+    while not lock.tryLock(100):
+        # The owner is alive; its endpoint may not be listening yet if it is still starting
+        reply = hotspotkeeper_ctl.forward_launch(sys.argv[1:])
+        if reply is not None:
+            if reply.get('ok'):
+                logging.info("Another instance is running - handed this launch to it")
             else:
-                self.tray_icon.showMessage(
-                    "HotspotKeeper",
-                    "Failed to disable hotspot. Please try again.",
-                    QSystemTrayIcon.Warning,
-                    3000
-                )
-    
-    def show_settings(self):
-        """Show settings dialog"""
-        dialog = SettingsDialog(self, self.settings_manager)
-        if dialog.exec() == QDialog.Accepted:
-            # Restart timer with new interval
-            interval = self.settings_manager.get("check_interval", 3) * 1000
-            self.status_timer.stop()
-            self.status_timer.start(interval)
-            logging.info("Settings updated")
-    
-    def show_logs(self):
-        """Show log viewer"""
-        dialog = LogViewerDialog(self, self.log_file)
-        dialog.exec()
-    
-    def show_update_notification(self, version, url):
-        """Show update available notification"""
-        if self.settings_manager.get("show_notifications", True):
-            self.tray_icon.showMessage(
-                "Update Available",
-                f"Version {version} is available! Click to download.",
-                QSystemTrayIcon.Information,
-                5000
-            )
+                logging.warning(f"Another instance is running but refused this launch: {reply.get('error')}")
+            return None
+        if time.monotonic() > deadline:
+            logging.warning("Another instance holds the instance lock but does not answer")
+            return None
+    return lock
+
+
+def queue_launch_action(keeper):
+    """Honour --enable/--disable on a fresh start once the event loop runs"""
+    for flag, enable in (('--enable', True), ('--disable', False)):
+        if flag in sys.argv:
+            QTimer.singleShot(0, lambda enable=enable: keeper.request_hotspot(enable))
+
+
+def run_headless(app, keeper):
+    """Run the monitoring core without widgets until SIGINT/SIGTERM; returns the exit code"""
+    keeper.start()
     
-    def closeEvent(self, event):
-        """Handle window close event"""
-        event.ignore()
-        self.hide()
-        if not self.start_minimized and self.settings_manager.get("show_notifications", True):
-            self.tray_icon.showMessage(
-                "Still Running",
-                "App is running in system tray",
-                QSystemTrayIcon.Information,
-                2000
-            )
+    def request_quit(signum, frame):
+        logging.info(f"Received signal {signum}, stopping")
+        app.quit()
     
-    def quit_app(self):
-        """Quit the application"""
-        logging.info("Application shutting down")
-        self.monitor.stop()
-        self.monitor.wait()
-        QApplication.quit()
+    for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), request_quit)
+    
+    # Python only runs signal handlers between bytecodes - wake up regularly so
+    # a signal is not stuck behind Qt's event loop
+    wakeup_timer = QTimer()
+    wakeup_timer.timeout.connect(lambda: None)
+    wakeup_timer.start(250)
+    
+    logging.info(f"Running headless ({HotspotBackend.instance().name} backend)")
+    code = app.exec()
+    wakeup_timer.stop()
+    logging.info("Application shutting down")
+    keeper.shutdown()
+    return code
 
 
 def main():
+    # Offline analysis: replay a recorded trace through the decision logic and exit
+    if '--replay-trace' in sys.argv:
+        index = sys.argv.index('--replay-trace') + 1
+        if index < len(sys.argv):
+            path = sys.argv[index]
+        else:
+            path = Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper" / "trace.bin"
+        print(json.dumps(replay_trace(path), indent=2))
+        return
+    
     # Setup logging first
     log_file = setup_logging()
     logging.info("=== HotspotKeeper v1.1.0 Starting ===")
     
-    # Check for multiple instances
-    app = QApplication(sys.argv)
-    
-    # Use QSharedMemory to prevent multiple instances
-    shared_memory = QSharedMemory("HotspotKeeperUniqueInstance")
-    if not shared_memory.create(1):
-        logging.warning("Another instance is already running")
-        QMessageBox.warning(
-            None,
-            "Already Running",
-            "HotspotKeeper is already running in the system tray.",
-            QMessageBox.Ok
-        )
+    # One instance per user; a second launch is forwarded to it
+    instance_lock = acquire_instance_lock()
+    if instance_lock is None:
         sys.exit(0)
     
+    # --headless: monitoring core only, no widgets (service / Linux with the simulated backend)
+    headless = '--headless' in sys.argv
+    if headless:
+        app = QCoreApplication(sys.argv)
+    else:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+    
     # Check if running with --minimized flag
     start_minimized = '--minimized' in sys.argv
     
     # Request admin privileges
     run_as_admin()
     
+    # Load settings
+    settings_manager = SettingsManager()
+    configure_logging(settings_manager.settings)
+    
+    if headless:
+        keeper = HotspotKeeper(settings_manager)
+        queue_launch_action(keeper)
+        code = run_headless(app, keeper)
+        instance_lock.unlock()
+        sys.exit(code)
+    
+    from PySide6.QtWidgets import QSystemTrayIcon
+    from PySide6.QtGui import QIcon
+    from hotspotkeeper_gui import MainWindow
+    
     app.setQuitOnLastWindowClosed(False)
     
     # Set application icon
@@ -1606,16 +3665,13 @@ def main():
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
     
-    # Load settings
-    settings_manager = SettingsManager()
-    
     # Create main window
     window = MainWindow(start_minimized=start_minimized, settings_manager=settings_manager, log_file=log_file)
     
     # Start minimized or show window
     if start_minimized:
         window.hide()
-        if settings_manager.get("show_notifications", True):
+        if settings_manager.settings.show_notifications:
             window.tray_icon.showMessage(
                 "HotspotKeeper Started",
                 "Running in system tray",
@@ -1626,9 +3682,12 @@ def main():
     else:
         window.show()
         logging.info("Main window shown")
+    queue_launch_action(window.keeper)
     
-    sys.exit(app.exec())
+    code = app.exec()
+    instance_lock.unlock()
+    sys.exit(code)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,218 @@
+"""
+HotspotKeeper control client.
+
+Talks to the running instance over its local control endpoint - a named pipe
+on Windows, a Unix socket elsewhere - so scripts can query and toggle the
+hotspot without running any probes of their own. Standard library only, so
+it starts in milliseconds.
+
+Protocol: one command per line, one JSON object per line in reply
+(`{"ok": true, ...}` or `{"ok": false, "error": "..."}`). Commands:
+
+    status              cached status snapshot and auto-hotspot state
+    enable | disable    start a manual enable/disable (returns immediately)
+    auto on|off|toggle  switch auto-hotspot
+    uptime [days]       hotspot and WiFi time over the last days (default 30)
+    show                bring up the main window (tray instances only)
+    ping                check the instance is alive; replies with its pid
+
+Usage:
+    python hotspotkeeper_ctl.py status [--json]
+    python hotspotkeeper_ctl.py enable
+    python hotspotkeeper_ctl.py auto off
+    python hotspotkeeper_ctl.py uptime 7
+"""
+
+import argparse
+import getpass
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+EXIT_OK, EXIT_FAILED, EXIT_NOT_RUNNING = 0, 1, 2
+
+
+def endpoint():
+    """Name of the control endpoint for the current user"""
+    if sys.platform == 'win32':
+        return rf"\\.\pipe\HotspotKeeper-{getpass.getuser()}"
+    return str(Path(os.path.expanduser("~")) / "AppData" / "Local" / "HotspotKeeper" / "control.sock")
+
+
+class ControlClient:
+    """Connection to the running instance; raises OSError if none is listening"""
+
+    def __init__(self, path=None, timeout=5.0):
+        self.path = path or endpoint()
+        if sys.platform == 'win32':
+            self.sock = None
+            self.pipe = self._open_pipe(timeout)
+        else:
+            self.pipe = None
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            try:
+                self.sock.connect(self.path)
+            except OSError:
+                self.sock.close()
+                raise
+            self.buffer = b''
+
+    def _open_pipe(self, timeout):
+        """Open the named pipe, retrying while the server is busy accepting another client"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return open(self.path, 'r+b', buffering=0)
+            except FileNotFoundError:
+                raise
+            except OSError:  # ERROR_PIPE_BUSY - every instance of the pipe is taken
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+
+    def _read_line(self):
+        if self.pipe is not None:
+            line = b''
+            while not line.endswith(b'\n'):
+                chunk = self.pipe.read(4096)
+                if not chunk:
+                    break
+                line += chunk
+            return line
+        while b'\n' not in self.buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                break
+            self.buffer += chunk
+        line, _, self.buffer = self.buffer.partition(b'\n')
+        return line
+
+    def request(self, command):
+        """Send one command line and return the decoded reply"""
+        data = (command.strip() + '\n').encode('utf-8')
+        if self.pipe is not None:
+            self.pipe.write(data)
+        else:
+            self.sock.sendall(data)
+        line = self._read_line()
+        if not line:
+            raise ConnectionError("control endpoint closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        if self.pipe is not None:
+            self.pipe.close()
+        else:
+            self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def launch_command(argv):
+    """Command a relaunch with these arguments forwards to the running instance"""
+    if '--enable' in argv:
+        return 'enable'
+    if '--disable' in argv:
+        return 'disable'
+    if '--minimized' in argv or '--headless' in argv:
+        return 'ping'  # autostart while already running: nothing to do
+    return 'show'
+
+
+def forward_launch(argv, timeout=1.0):
+    """
+    Hand a relaunch's arguments to the running instance.
+    
+    Returns the instance's reply (`ok` is false if it could not act on them,
+    e.g. `show` on a headless instance), or None if no instance answers.
+    """
+    try:
+        with ControlClient(timeout=timeout) as client:
+            return client.request(launch_command(argv))
+    except (OSError, ValueError):  # not running, stale socket, or a garbled reply
+        return None
+
+
+def format_status(status):
+    """One-line human readable status"""
+    if status.get('wifi_connected') is None:
+        return f"No status yet   Auto: {'on' if status['auto_enabled'] else 'off'}"
+    wifi = f"connected ({status['ssid']})" if status['wifi_connected'] and status['ssid'] else \
+        'connected' if status['wifi_connected'] else 'disconnected'
+    hotspot = 'enabled' if status['hotspot_enabled'] else 'disabled'
+    if status['hotspot_enabled'] and status['client_count']:
+        hotspot += f" ({status['client_count']} clients)"
+    if status['hotspot_enabled'] and 'down_mbps' in status:
+        hotspot += f" {status['down_mbps']:.1f}/{status['up_mbps']:.1f} Mbps down/up"
+    battery = f"{status['battery_level']}%{' (plugged in)' if status['is_plugged'] else ''}"
+    busy = '   [operation in progress]' if status['busy'] else ''
+    return (f"WiFi: {wifi}   Hotspot: {hotspot}   Battery: {battery}   "
+            f"Auto: {'on' if status['auto_enabled'] else 'off'}   ({status['age']:.1f}s ago){busy}")
+
+
+def format_uptime(uptime):
+    """One-line human readable uptime summary"""
+    days = uptime['seconds'] / 86400
+    if not uptime['observed']:
+        return f"No history for the last {days:g} days"
+    clients = f", {uptime['mean_clients']:.1f} clients on average" if uptime['mean_clients'] else ''
+    return (f"Hotspot up {uptime['ratio']:.1%} of the last {days:g} days "
+            f"({uptime['hotspot'] / 3600:.1f} h of {uptime['observed'] / 3600:.1f} h observed, "
+            f"WiFi {uptime['wifi'] / 3600:.1f} h){clients}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query and control the running HotspotKeeper")
+    parser.add_argument('command', choices=('status', 'enable', 'disable', 'auto', 'uptime', 'show', 'ping'))
+    parser.add_argument('value', nargs='?', help="on, off or toggle for `auto`; days for `uptime`")
+    parser.add_argument('--json', action='store_true', help="print the raw JSON reply")
+    parser.add_argument('--timeout', type=float, default=5.0, help="seconds to wait for the reply")
+    args = parser.parse_args(argv)
+    if args.command == 'auto' and args.value not in ('on', 'off', 'toggle'):
+        parser.error("auto needs on, off or toggle")
+    if args.command == 'uptime' and args.value is not None:
+        try:
+            float(args.value)
+        except ValueError:
+            parser.error("uptime takes a number of days")
+
+    command = f"{args.command} {args.value}" if args.value is not None else args.command
+    try:
+        with ControlClient(timeout=args.timeout) as client:
+            reply = client.request(command)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("HotspotKeeper is not running", file=sys.stderr)
+        return EXIT_NOT_RUNNING
+    except OSError as e:
+        print(f"Control endpoint error: {e}", file=sys.stderr)
+        return EXIT_NOT_RUNNING
+
+    if args.json:
+        print(json.dumps(reply, indent=2))
+    elif not reply.get('ok'):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+    elif args.command == 'status':
+        print(format_status(reply['status']))
+    elif args.command == 'auto':
+        print(f"Auto-hotspot {'on' if reply['auto_enabled'] else 'off'}")
+    elif args.command == 'uptime':
+        print(format_uptime(reply['uptime']))
+    elif args.command == 'ping':
+        print(f"HotspotKeeper is running (pid {reply['pid']})")
+    elif args.command == 'show':
+        print("Main window shown")
+    else:
+        print(f"Hotspot {args.command} started")
+    return EXIT_OK if reply.get('ok') else EXIT_FAILED
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1236 @@
+"""
+HotspotKeeper dialogs - settings, log viewer and diagnostics.
+
+Imported on first use, so launching to the tray does not pay for them.
+"""
+
+import bisect
+import gzip
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox, QDialog,
+                               QSpinBox, QMessageBox, QGroupBox, QTextEdit, QFileDialog, QComboBox,
+                               QListView, QLineEdit, QDateTimeEdit, QScrollArea, QWidget, QFrame)
+from PySide6.QtCore import QTimer, Qt, Signal, QThread, QAbstractListModel, QModelIndex, QDateTime
+from PySide6.QtGui import QColor
+
+from hotspotkeeper import Settings, metrics
+
+
+class SettingsDialog(QDialog):
+    """Settings dialog window"""
+    
+    def __init__(self, parent, settings_manager):
+        super().__init__(parent)
+        self.settings_manager = settings_manager
+        self.init_ui()
+    
+    def init_ui(self):
+        """Initialize settings dialog UI"""
+        self.setWindowTitle("Settings")
+        self.setMinimumSize(500, 420)
+        self.resize(540, 680)  # fits a 768 px screen; the groups scroll below that
+        
+        content = QWidget()
+        layout = QVBoxLayout(content)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 10)
+        
+        # Monitoring settings
+        monitor_group = QGroupBox("Monitoring")
+        monitor_layout = QVBoxLayout()
+        monitor_layout.setSpacing(12)
+        
+        # Check interval
+        interval_layout = QHBoxLayout()
+        interval_label = QLabel("Check interval (seconds):")
+        interval_label.setMinimumWidth(180)
+        interval_layout.addWidget(interval_label)
+        
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setMinimumWidth(100)
+        self.interval_spin.setMinimumHeight(30)
+        self.interval_spin.setRange(*Settings.SCHEMA["check_interval"][2])
+        self.interval_spin.setValue(self.settings_manager.settings.check_interval)
+        interval_layout.addWidget(self.interval_spin)
+        interval_layout.addStretch()
+        monitor_layout.addLayout(interval_layout)
+        
+        # Backoff ceiling
+        max_interval_layout = QHBoxLayout()
+        max_interval_label = QLabel("Max interval when stable (s):")
+        max_interval_label.setMinimumWidth(180)
+        max_interval_layout.addWidget(max_interval_label)
+        
+        self.max_interval_spin = QSpinBox()
+        self.max_interval_spin.setMinimumWidth(100)
+        self.max_interval_spin.setMinimumHeight(30)
+        self.max_interval_spin.setRange(*Settings.SCHEMA["max_check_interval"][2])
+        self.max_interval_spin.setValue(self.settings_manager.settings.max_check_interval)
+        max_interval_layout.addWidget(self.max_interval_spin)
+        max_interval_layout.addStretch()
+        monitor_layout.addLayout(max_interval_layout)
+        
+        # Debounce time
+        debounce_layout = QHBoxLayout()
+        debounce_label = QLabel("Debounce time (seconds):")
+        debounce_label.setMinimumWidth(180)
+        debounce_layout.addWidget(debounce_label)
+        
+        self.debounce_spin = QSpinBox()
+        self.debounce_spin.setMinimumWidth(100)
+        self.debounce_spin.setMinimumHeight(30)
+        self.debounce_spin.setRange(*Settings.SCHEMA["debounce_time"][2])
+        self.debounce_spin.setValue(self.settings_manager.settings.debounce_time)
+        debounce_layout.addWidget(self.debounce_spin)
+        debounce_layout.addStretch()
+        monitor_layout.addLayout(debounce_layout)
+        
+        self.pause_idle_check = QCheckBox("Pause polling while the computer is idle")
+        self.pause_idle_check.setMinimumHeight(25)
+        self.pause_idle_check.setChecked(self.settings_manager.settings.pause_polling_when_idle)
+        monitor_layout.addWidget(self.pause_idle_check)
+        
+        self.pause_battery_check = QCheckBox("Pause polling while on battery")
+        self.pause_battery_check.setMinimumHeight(25)
+        self.pause_battery_check.setChecked(self.settings_manager.settings.pause_polling_on_battery)
+        monitor_layout.addWidget(self.pause_battery_check)
+        
+        monitor_group.setLayout(monitor_layout)
+        layout.addWidget(monitor_group)
+        
+        # Behavior settings
+        behavior_group = QGroupBox("Behavior")
+        behavior_layout = QVBoxLayout()
+        behavior_layout.setSpacing(12)
+        
+        self.auto_disable_check = QCheckBox("Auto-disable hotspot when WiFi disconnects")
+        self.auto_disable_check.setMinimumHeight(25)
+        self.auto_disable_check.setChecked(
+            self.settings_manager.settings.auto_disable_on_wifi_disconnect
+        )
+        behavior_layout.addWidget(self.auto_disable_check)
+        
+        # Update check interval
+        update_layout = QHBoxLayout()
+        update_label = QLabel("Check for updates every (h):")
+        update_label.setMinimumWidth(180)
+        update_layout.addWidget(update_label)
+        
+        self.update_interval_spin = QSpinBox()
+        self.update_interval_spin.setMinimumWidth(100)
+        self.update_interval_spin.setMinimumHeight(30)
+        self.update_interval_spin.setRange(*Settings.SCHEMA["update_check_interval"][2])
+        self.update_interval_spin.setSpecialValueText("Never")
+        self.update_interval_spin.setValue(self.settings_manager.settings.update_check_interval)
+        update_layout.addWidget(self.update_interval_spin)
+        update_layout.addStretch()
+        behavior_layout.addLayout(update_layout)
+        
+        behavior_group.setLayout(behavior_layout)
+        layout.addWidget(behavior_group)
+        
+        # History retention
+        history_group = QGroupBox("History")
+        history_layout = QVBoxLayout()
+        history_layout.setSpacing(12)
+        
+        self.history_spins = {}
+        for key, text in (("history_tick_days", "Keep every check for (days):"),
+                          ("history_hour_days", "Keep hourly history (days):"),
+                          ("history_day_days", "Keep daily history (days):")):
+            row = QHBoxLayout()
+            label = QLabel(text)
+            label.setMinimumWidth(180)
+            row.addWidget(label)
+            
+            spin = QSpinBox()
+            spin.setMinimumWidth(100)
+            spin.setMinimumHeight(30)
+            spin.setRange(*Settings.SCHEMA[key][2])
+            spin.setValue(getattr(self.settings_manager.settings, key))
+            row.addWidget(spin)
+            row.addStretch()
+            history_layout.addLayout(row)
+            self.history_spins[key] = spin
+        
+        history_group.setLayout(history_layout)
+        layout.addWidget(history_group)
+        
+        # Notifications
+        notif_group = QGroupBox("Notifications")
+        notif_layout = QVBoxLayout()
+        notif_layout.setSpacing(12)
+        
+        self.notifications_check = QCheckBox("Show notifications")
+        self.notifications_check.setMinimumHeight(25)
+        self.notifications_check.setChecked(
+            self.settings_manager.settings.show_notifications
+        )
+        notif_layout.addWidget(self.notifications_check)
+        
+        notif_group.setLayout(notif_layout)
+        layout.addWidget(notif_group)
+        
+        # Battery
+        battery_group = QGroupBox("Battery Awareness")
+        battery_layout = QVBoxLayout()
+        battery_layout.setSpacing(12)
+        
+        battery_info = QLabel("Disable auto-hotspot when battery is below:")
+        battery_layout.addWidget(battery_info)
+        
+        battery_control_layout = QHBoxLayout()
+        self.battery_spin = QSpinBox()
+        self.battery_spin.setMinimumWidth(100)
+        self.battery_spin.setMinimumHeight(30)
+        self.battery_spin.setRange(*Settings.SCHEMA["battery_threshold"][2])
+        self.battery_spin.setSuffix("%")
+        self.battery_spin.setValue(self.settings_manager.settings.battery_threshold)
+        battery_control_layout.addWidget(self.battery_spin)
+        
+        battery_note = QLabel("(0 = disabled)")
+        battery_note.setStyleSheet("color: #888888; font-size: 11px;")
+        battery_control_layout.addWidget(battery_note)
+        battery_control_layout.addStretch()
+        battery_layout.addLayout(battery_control_layout)
+        
+        battery_group.setLayout(battery_layout)
+        layout.addWidget(battery_group)
+        
+        # Logging
+        log_group = QGroupBox("Logging")
+        log_layout = QVBoxLayout()
+        log_layout.setSpacing(12)
+        
+        level_layout = QHBoxLayout()
+        level_label = QLabel("Log level:")
+        level_label.setMinimumWidth(180)
+        level_layout.addWidget(level_label)
+        
+        self.log_level_combo = QComboBox()
+        self.log_level_combo.setMinimumWidth(100)
+        self.log_level_combo.setMinimumHeight(30)
+        self.log_level_combo.addItems(Settings.SCHEMA["log_level"][2])
+        self.log_level_combo.setCurrentText(str(self.settings_manager.settings.log_level).upper())
+        level_layout.addWidget(self.log_level_combo)
+        level_layout.addStretch()
+        log_layout.addLayout(level_layout)
+        
+        log_size_layout = QHBoxLayout()
+        log_size_label = QLabel("Rotate log at (MB):")
+        log_size_label.setMinimumWidth(180)
+        log_size_layout.addWidget(log_size_label)
+        
+        self.log_size_spin = QSpinBox()
+        self.log_size_spin.setMinimumWidth(100)
+        self.log_size_spin.setMinimumHeight(30)
+        self.log_size_spin.setRange(*Settings.SCHEMA["log_max_size_mb"][2])
+        self.log_size_spin.setValue(self.settings_manager.settings.log_max_size_mb)
+        log_size_layout.addWidget(self.log_size_spin)
+        log_size_layout.addStretch()
+        log_layout.addLayout(log_size_layout)
+        
+        log_group.setLayout(log_layout)
+        layout.addWidget(log_group)
+        
+        layout.addStretch()
+        
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        scroll.setWidget(content)
+        
+        dialog_layout = QVBoxLayout()
+        dialog_layout.setContentsMargins(0, 0, 0, 20)
+        dialog_layout.addWidget(scroll)
+        
+        # Buttons - outside the scroll area so they are always visible
+        button_layout = QHBoxLayout()
+        button_layout.setContentsMargins(20, 0, 20, 0)
+        
+        save_btn = QPushButton("Save")
+        save_btn.setMinimumHeight(35)
+        save_btn.setMinimumWidth(100)
+        save_btn.clicked.connect(self.save_settings)
+        button_layout.addWidget(save_btn)
+        
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setMinimumHeight(35)
+        cancel_btn.setMinimumWidth(100)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+        
+        dialog_layout.addLayout(button_layout)
+        
+        self.setLayout(dialog_layout)
+        
+        # Apply dark theme with better input visibility
+        self.setStyleSheet("""
+            QDialog, QScrollArea, QScrollArea > QWidget > QWidget {
+                background-color: #1e1e1e;
+                color: #e8e8e8;
+            }
+            QScrollBar:vertical {
+                background-color: #1e1e1e;
+                width: 10px;
+            }
+            QScrollBar::handle:vertical {
+                background-color: #4a4a4a;
+                border-radius: 4px;
+                min-height: 30px;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                height: 0px;
+            }
+            QGroupBox {
+                color: #e8e8e8;
+                border: 1px solid #3a3a3a;
+                border-radius: 5px;
+                margin-top: 10px;
+                padding-top: 15px;
+                font-weight: bold;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+            }
+            QLabel {
+                color: #d8d8d8;
+            }
+            QCheckBox {
+                color: #d8d8d8;
+                spacing: 8px;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+            }
+            QSpinBox, QComboBox {
+                background-color: #2a2a2a;
+                color: #e8e8e8;
+                border: 2px solid #4a4a4a;
+                border-radius: 4px;
+                padding: 5px;
+                font-size: 13px;
+            }
+            QSpinBox:focus, QComboBox:focus {
+                border: 2px solid #8b7355;
+            }
+            QSpinBox::up-button, QSpinBox::down-button {
+                background-color: #3a3a3a;
+                border: none;
+                width: 20px;
+            }
+            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+                background-color: #4a4a4a;
+            }
+            QPushButton {
+                background-color: #8b7355;
+                color: #f5f5dc;
+                border: 2px solid #6b5344;
+                border-radius: 5px;
+                padding: 8px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b8365;
+            }
+        """)
+    
+    def save_settings(self):
+        """Save settings and close"""
+        self.settings_manager.update({
+            "check_interval": self.interval_spin.value(),
+            "max_check_interval": self.max_interval_spin.value(),
+            "pause_polling_when_idle": self.pause_idle_check.isChecked(),
+            "pause_polling_on_battery": self.pause_battery_check.isChecked(),
+            "debounce_time": self.debounce_spin.value(),
+            "auto_disable_on_wifi_disconnect": self.auto_disable_check.isChecked(),
+            "update_check_interval": self.update_interval_spin.value(),
+            **{key: spin.value() for key, spin in self.history_spins.items()},
+            "show_notifications": self.notifications_check.isChecked(),
+            "battery_threshold": self.battery_spin.value(),
+            "log_level": self.log_level_combo.currentText(),
+            "log_max_size_mb": self.log_size_spin.value(),
+        })
+        
+        self.accept()
+
+
+class LogFileIndex:
+    """
+    Line-start offsets for the tail of a growing log file.
+    
+    Only complete lines are indexed. The index starts with the last lines
+    (`load_tail`), grows backwards on demand (`load_previous`) and picks up
+    appended lines (`load_appended`); text is read by offset, so memory use
+    does not depend on the file size. The file is opened per read so the log
+    handler can still rotate it on Windows.
+    """
+    
+    def __init__(self, path, chunk_size=64 * 1024):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.offsets = array('Q')  # start offset of each indexed line
+        self.end = 0  # offset just past the last indexed line
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    @property
+    def at_start(self):
+        """True once the first line of the file is indexed"""
+        return not self.offsets or self.offsets[0] == 0
+    
+    def _scan_back(self, f, pos, count):
+        """Start offsets of up to `count` lines before line start `pos`, in file order"""
+        starts = []
+        hi = pos - 1  # the newline that ends the previous line
+        while hi > 0 and len(starts) < count:
+            lo = max(0, hi - self.chunk_size)
+            f.seek(lo)
+            data = f.read(hi - lo)
+            i = len(data)
+            while len(starts) < count:
+                i = data.rfind(b'\n', 0, i)
+                if i < 0:
+                    break
+                starts.append(lo + i + 1)
+            hi = lo
+        if pos > 0 and hi <= 0 and len(starts) < count:
+            starts.append(0)
+        starts.reverse()
+        return starts
+    
+    def load_tail(self, count):
+        """Reset the index to the last `count` complete lines"""
+        self.offsets = array('Q')
+        self.end = 0
+        try:
+            with open(self.path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                # The end of the last complete line
+                pos = size
+                while pos > 0:
+                    lo = max(0, pos - self.chunk_size)
+                    f.seek(lo)
+                    newline = f.read(pos - lo).rfind(b'\n')
+                    if newline >= 0:
+                        self.end = lo + newline + 1
+                        break
+                    pos = lo
+                self.offsets = array('Q', self._scan_back(f, self.end, count))
+        except OSError:
+            pass
+        return len(self.offsets)
+    
+    def load_previous(self, count):
+        """Index up to `count` lines before the first indexed one; returns how many were added"""
+        if self.at_start:
+            return 0
+        try:
+            with open(self.path, 'rb') as f:
+                starts = self._scan_back(f, self.offsets[0], count)
+        except OSError:
+            return 0
+        self.offsets[0:0] = array('Q', starts)
+        return len(starts)
+    
+    def load_appended(self):
+        """
+        Index lines appended since the last call; returns how many were added,
+        or -1 if the file shrank (cleared or rotated) and needs a load_tail.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        if size < self.end:
+            return -1
+        if size == self.end:
+            return 0
+        with open(self.path, 'rb') as f:
+            f.seek(self.end)
+            data = f.read(size - self.end)
+        last = data.rfind(b'\n')
+        if last < 0:
+            return 0
+        added = 0
+        start = 0
+        while start <= last:
+            self.offsets.append(self.end + start)
+            added += 1
+            start = data.index(b'\n', start) + 1
+        self.end += last + 1
+        return added
+    
+    def read_lines(self, first, last):
+        """Text of indexed lines first..last-1"""
+        start = self.offsets[first]
+        stop = self.offsets[last] if last < len(self.offsets) else self.end
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        return [line.rstrip('\r') for line in data.decode('utf-8', errors='replace').split('\n')[:last - first]]
+
+
+class LogLineModel(QAbstractListModel):
+    """List model over a LogFileIndex; lines are read in blocks as the view asks for them"""
+    
+    BLOCK = 256
+    MAX_BLOCKS = 64
+    LEVEL_COLORS = {' - WARNING - ': QColor('#d0b88c'), ' - ERROR - ': QColor('#d08c8c'),
+                    ' - CRITICAL - ': QColor('#d08c8c')}
+    
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.log_index = index
+        self.blocks = OrderedDict()  # block number -> lines, least recently used first
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.log_index)
+    
+    def line(self, row):
+        block = row // self.BLOCK
+        lines = self.blocks.get(block)
+        if lines is None:
+            first = block * self.BLOCK
+            try:
+                lines = self.log_index.read_lines(first, min(first + self.BLOCK, len(self.log_index)))
+            except OSError as e:
+                return f"Error loading log: {e}"
+            self.blocks[block] = lines
+            if len(self.blocks) > self.MAX_BLOCKS:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(block)
+        offset = row - block * self.BLOCK
+        return lines[offset] if offset < len(lines) else ""
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.line(index.row())
+        if role == Qt.ForegroundRole:
+            text = self.line(index.row())
+            for marker, color in self.LEVEL_COLORS.items():
+                if marker in text:
+                    return color
+        return None
+    
+    def reload_tail(self, count):
+        self.beginResetModel()
+        self.blocks.clear()
+        self.log_index.load_tail(count)
+        self.endResetModel()
+    
+    def load_previous(self, count):
+        """Prepend older lines; returns how many were added"""
+        added = self.log_index.load_previous(count)
+        if added:
+            self.beginInsertRows(QModelIndex(), 0, added - 1)
+            self.blocks.clear()  # row numbers shifted
+            self.endInsertRows()
+        return added
+    
+    def load_appended(self):
+        """Append new lines; returns how many were added, or -1 after a reset"""
+        rows = len(self.log_index)
+        last_block = rows // self.BLOCK
+        added = self.log_index.load_appended()
+        if added > 0:
+            self.blocks.pop(last_block, None)  # may have been cached short
+            self.beginInsertRows(QModelIndex(), rows, rows + added - 1)
+            self.endInsertRows()
+        return added
+
+
+class LogSegment:
+    """
+    Offsets, levels and timestamps of every line in one log file or rotated
+    (gzip-compressed) segment.
+    
+    Continuation lines (tracebacks) inherit the level and time of the record
+    they belong to. The live file is indexed incrementally by `update`;
+    compressed segments never change and are indexed once.
+    """
+    
+    LEVELS = {b'DEBUG': 1, b'INFO': 2, b'WARNING': 3, b'ERROR': 4, b'CRITICAL': 5}
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.compressed = self.path.suffix == '.gz'
+        self.offsets = array('Q')
+        self.levels = array('B')
+        self.times = array('d')
+        self.end = 0
+        self._minutes = {}  # 'YYYY-MM-DD HH:MM' -> epoch seconds
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def _parse(self, raw):
+        """(level, epoch seconds) of a record's first line, (0, 0.0) for anything else"""
+        if len(raw) < 28 or raw[23:26] != b' - ':
+            return 0, 0.0
+        level = self.LEVELS.get(raw[26:raw.find(b' ', 26)], 0)
+        if not level:
+            return 0, 0.0
+        minute = raw[:16]
+        base = self._minutes.get(minute)
+        try:
+            if base is None:
+                if len(self._minutes) > 4096:
+                    self._minutes.clear()
+                base = self._minutes[minute] = time.mktime((int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+                                                            int(raw[11:13]), int(raw[14:16]), 0, 0, 0, -1))
+            return level, base + int(raw[17:19]) + int(raw[20:23]) / 1000
+        except ValueError:
+            return 0, 0.0
+    
+    def read(self, start=0, stop=None):
+        """Bytes start..stop of the (decompressed) file"""
+        if self.compressed:
+            with gzip.open(self.path, 'rb') as f:
+                return f.read()[start:stop]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return f.read(-1 if stop is None else stop - start)
+    
+    def update(self):
+        """Index complete lines added since the last call; -1 if the file shrank"""
+        if self.compressed:
+            if self.end:
+                return 0
+            data = self.read()
+        else:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size < self.end:
+                return -1
+            if size == self.end:
+                return 0
+            data = self.read(self.end, size)
+        
+        last = data.rfind(b'\n')
+        if last < 0:
+            return 0
+        level = self.levels[-1] if self.levels else 0
+        stamp = self.times[-1] if self.times else 0.0
+        offset = self.end
+        parse = self._parse
+        lines = data[:last].split(b'\n')
+        for raw in lines:
+            self.offsets.append(offset)
+            line_level, line_time = parse(raw)
+            if line_level:
+                level, stamp = line_level, line_time
+            self.levels.append(level)
+            self.times.append(stamp)
+            offset += len(raw) + 1
+        self.end += last + 1
+        return len(lines)
+
+
+class LogSearchIndex:
+    """
+    Line index over hotspotkeeper.log and its rotated siblings, oldest first.
+    
+    Rows are addressed by id = segment number << 32 | line number. Text is
+    read from disk by offset when needed; one decompressed rotated segment is
+    cached for reads.
+    """
+    
+    CHUNK = 4 * 1024 * 1024  # bytes searched per read
+    
+    def __init__(self, log_file):
+        self.log_file = Path(log_file)
+        self.segments = []
+        self._cache = (None, None)  # (segment, decompressed bytes)
+    
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+    
+    def sibling_paths(self):
+        """Rotated segments (hotspotkeeper.log.N[.gz], oldest first) followed by the live log"""
+        name = self.log_file.name
+        rotated = []
+        for path in self.log_file.parent.glob(name + '.*'):
+            number = path.name[len(name) + 1:].split('.')[0]
+            if number.isdigit():
+                rotated.append((int(number), path))
+        return [path for _, path in sorted(rotated, reverse=True)] + [self.log_file]
+    
+    def refresh(self):
+        """
+        Index new lines. Returns (rebuilt, added): rebuilt means the files
+        rotated and every row id changed.
+        """
+        paths = self.sibling_paths()
+        if self.segments and [segment.path for segment in self.segments] == paths:
+            added = self.segments[-1].update()
+            if added >= 0:
+                return False, added
+        segments = [LogSegment(path) for path in paths]
+        for segment in segments:
+            try:
+                segment.update()
+            except (OSError, EOFError) as e:
+                logging.warning(f"Could not index {segment.path}: {e}")
+        self.segments = segments
+        self._cache = (None, None)
+        return True, len(self)
+    
+    def _segment_bytes(self, segment, start, stop):
+        if not segment.compressed:
+            return segment.read(start, stop)
+        cached_segment, data = self._cache
+        if cached_segment is not segment:
+            data = segment.read()
+            self._cache = (segment, data)
+        return data[start:stop]
+    
+    def _locate(self, row_id):
+        segment = self.segments[row_id >> 32]
+        return segment, row_id & 0xFFFFFFFF
+    
+    def line(self, row_id):
+        """Text of one row"""
+        segment, line = self._locate(row_id)
+        stop = segment.offsets[line + 1] if line + 1 < len(segment) else segment.end
+        return self._segment_bytes(segment, segment.offsets[line], stop).decode('utf-8', errors='replace').rstrip('\r\n')
+    
+    def level(self, row_id):
+        segment, line = self._locate(row_id)
+        return segment.levels[line]
+    
+    def time(self, row_id):
+        segment, line = self._locate(row_id)
+        return segment.times[line]
+    
+    def matches(self, segment_number, first_line=0, pattern=None, min_level=0):
+        """Ids of rows from `first_line` on in one segment that match `pattern` (compiled bytes regex) and level"""
+        segment = self.segments[segment_number]
+        base = segment_number << 32
+        levels = segment.levels
+        ids = array('Q')
+        count = len(segment)
+        if pattern is None:
+            ids.extend(base | line for line in range(first_line, count) if levels[line] >= min_level)
+            return ids
+        
+        offsets = segment.offsets
+        line = first_line
+        while line < count:
+            # A chunk of whole lines
+            chunk_start = offsets[line]
+            last = min(count, bisect.bisect_left(offsets, chunk_start + self.CHUNK, line + 1))
+            chunk_stop = offsets[last] if last < count else segment.end
+            data = self._segment_bytes(segment, chunk_start, chunk_stop)
+            position = 0
+            while True:
+                found = pattern.search(data, position)
+                if found is None:
+                    break
+                hit = bisect.bisect_right(offsets, chunk_start + found.start(), line, last) - 1
+                if levels[hit] >= min_level:
+                    ids.append(base | hit)
+                if hit + 1 >= last:
+                    break
+                position = offsets[hit + 1] - chunk_start  # next line
+            line = last
+        return ids
+    
+    def find_time(self, ids, timestamp):
+        """Position in `ids` (in file order) of the first row logged at or after `timestamp`"""
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time(ids[mid]) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class LogIndexer(QThread):
+    """Keep a LogSearchIndex up to date and run the current query against it, off the GUI thread"""
+    indexed = Signal(int)  # total lines indexed
+    results = Signal(int, object, bool)  # query generation, ids, replace (False = append)
+    
+    def __init__(self, log_file, interval=1.0):
+        super().__init__()
+        self.index = LogSearchIndex(log_file)
+        self.interval = interval
+        self.running = True
+        self.wake = threading.Event()
+        self.query = None  # (compiled pattern or None, min level)
+        self.generation = 0
+    
+    def set_query(self, pattern, min_level):
+        """Search for `pattern` (compiled bytes regex or None) at or above `min_level`; None clears"""
+        self.query = None if pattern is None and min_level is None else (pattern, min_level or 0)
+        self.generation += 1
+        self.wake.set()
+    
+    def run(self):
+        done_generation = None
+        scanned = 0  # lines of the live segment already matched
+        while self.running:
+            try:
+                rebuilt, added = self.index.refresh()
+                if rebuilt or added:
+                    self.indexed.emit(len(self.index))
+                
+                query, generation = self.query, self.generation
+                segments = self.index.segments
+                if query is not None and segments:
+                    pattern, min_level = query
+                    if rebuilt or generation != done_generation:
+                        ids = array('Q')
+                        for number in range(len(segments)):
+                            ids.extend(self.index.matches(number, 0, pattern, min_level))
+                        self.results.emit(generation, ids, True)
+                    elif len(segments[-1]) > scanned:
+                        ids = self.index.matches(len(segments) - 1, scanned, pattern, min_level)
+                        if ids:
+                            self.results.emit(generation, ids, False)
+                    done_generation = generation
+                scanned = len(segments[-1]) if segments else 0
+            except Exception as e:
+                logging.error(f"Log indexer error: {e}")
+            self.wake.wait(self.interval)
+            self.wake.clear()
+    
+    def stop(self):
+        self.running = False
+        self.wake.set()
+
+
+class LogSearchModel(QAbstractListModel):
+    """List model over row ids of a LogSearchIndex - search results, or every line when jumping to a time"""
+    
+    MAX_CACHED = 4096
+    LEVEL_COLORS = {3: QColor('#d0b88c'), 4: QColor('#d08c8c'), 5: QColor('#d08c8c')}
+    
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.log_index = index
+        self.ids = array('Q')
+        self.lines = OrderedDict()  # row id -> text, least recently used first
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+    
+    def line(self, row):
+        row_id = self.ids[row]
+        text = self.lines.get(row_id)
+        if text is None:
+            try:
+                text = self.log_index.line(row_id)
+            except (IndexError, OSError, EOFError):
+                return ""  # files rotated; fresh results are on their way
+            self.lines[row_id] = text
+            if len(self.lines) > self.MAX_CACHED:
+                self.lines.popitem(last=False)
+        return text
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.line(index.row())
+        if role == Qt.ForegroundRole:
+            try:
+                return self.LEVEL_COLORS.get(self.log_index.level(self.ids[index.row()]))
+            except IndexError:
+                return None
+        return None
+    
+    def set_ids(self, ids):
+        self.beginResetModel()
+        self.ids = ids
+        self.lines.clear()
+        self.endResetModel()
+    
+    def append_ids(self, ids):
+        rows = len(self.ids)
+        self.beginInsertRows(QModelIndex(), rows, rows + len(ids) - 1)
+        self.ids.extend(ids)
+        self.endInsertRows()
+
+
+class LogViewerDialog(QDialog):
+    """
+    Log viewer dialog - shows the tail of the log and follows new lines.
+    
+    Searching, filtering by level or jumping to a time switches the view to
+    results from a background LogIndexer covering the rotated logs too.
+    """
+    
+    TAIL_LINES = 2000  # lines shown initially and added per page when scrolling up
+    LEVEL_FILTERS = [("All levels", 0), ("INFO and above", 2), ("WARNING and above", 3), ("ERROR and above", 4)]
+    
+    def __init__(self, parent, log_file):
+        super().__init__(parent)
+        self.log_file = log_file
+        self.model = LogLineModel(LogFileIndex(log_file), self)
+        
+        # Search index over the log and its rotated segments
+        self.indexer = LogIndexer(log_file)
+        self.search_model = LogSearchModel(self.indexer.index, self)
+        self.query_generation = None  # generation of the query whose results are shown
+        self.pending_jump = None  # timestamp to scroll to once results arrive
+        self.indexed_lines = 0
+        self.indexer.indexed.connect(self.on_indexed)
+        self.indexer.results.connect(self.on_results)
+        
+        self.init_ui()
+        self.refresh_log()
+        self.indexer.start()
+        
+        # Follow appended lines while open
+        self.follow_timer = QTimer(self)
+        self.follow_timer.timeout.connect(self.follow_log)
+        self.follow_timer.start(1000)
+        
+        # Debounce typing in the search box
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.apply_filter)
+    
+    def init_ui(self):
+        """Initialize log viewer UI"""
+        self.setWindowTitle("Log Viewer")
+        self.setMinimumSize(800, 500)
+        
+        layout = QVBoxLayout()
+        
+        # Search / filter bar
+        filter_layout = QHBoxLayout()
+        
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search...")
+        self.search_edit.textChanged.connect(lambda: self.search_timer.start(300))
+        filter_layout.addWidget(self.search_edit)
+        
+        self.regex_check = QCheckBox("Regex")
+        self.regex_check.toggled.connect(self.apply_filter)
+        filter_layout.addWidget(self.regex_check)
+        
+        self.level_combo = QComboBox()
+        for label, _ in self.LEVEL_FILTERS:
+            self.level_combo.addItem(label)
+        self.level_combo.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.level_combo)
+        
+        self.time_edit = QDateTimeEdit(QDateTime.currentDateTime())
+        self.time_edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.time_edit.setCalendarPopup(True)
+        filter_layout.addWidget(self.time_edit)
+        
+        jump_btn = QPushButton("Go to Time")
+        jump_btn.clicked.connect(self.jump_to_time)
+        filter_layout.addWidget(jump_btn)
+        
+        layout.addLayout(filter_layout)
+        
+        self.log_view = QListView()
+        self.log_view.setModel(self.model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setSelectionMode(QListView.ExtendedSelection)
+        self.log_view.setStyleSheet("""
+            QListView {
+                background-color: #1a1a1a;
+                color: #e8e8e8;
+                font-family: Consolas, monospace;
+                font-size: 10pt;
+            }
+        """)
+        self.log_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        layout.addWidget(self.log_view)
+        
+        self.line_count_label = QLabel()
+        self.line_count_label.setStyleSheet("color: #888888; font-size: 11px;")
+        layout.addWidget(self.line_count_label)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_log)
+        button_layout.addWidget(refresh_btn)
+        
+        clear_btn = QPushButton("Clear Log")
+        clear_btn.clicked.connect(self.clear_log)
+        button_layout.addWidget(clear_btn)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
+        
+        # Dark theme
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #1e1e1e;
+            }
+            QPushButton {
+                background-color: #8b7355;
+                color: #f5f5dc;
+                border: 2px solid #6b5344;
+                border-radius: 5px;
+                padding: 8px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b8365;
+            }
+            QLineEdit, QComboBox, QDateTimeEdit {
+                background-color: #2a2a2a;
+                color: #e8e8e8;
+                border: 2px solid #4a4a4a;
+                border-radius: 4px;
+                padding: 4px;
+            }
+            QCheckBox {
+                color: #d8d8d8;
+            }
+        """)
+    
+    def searching(self):
+        return self.log_view.model() is self.search_model
+    
+    def update_line_count(self):
+        if self.searching():
+            status = f"{len(self.search_model.ids)} matching lines" if self.query_generation is not None else "Searching..."
+        else:
+            index = self.model.log_index
+            status = f"Showing {'all' if index.at_start else 'last'} {len(index)} lines"
+        self.line_count_label.setText(f"{status} - {self.indexed_lines} lines indexed")
+    
+    def apply_filter(self):
+        """Run the search box / level filter through the indexer, or go back to the tail view"""
+        text = self.search_edit.text()
+        min_level = self.LEVEL_FILTERS[self.level_combo.currentIndex()][1]
+        if not text and not min_level and self.pending_jump is None:
+            self.indexer.set_query(None, None)
+            self.query_generation = None
+            self.log_view.setModel(self.model)
+            self.log_view.scrollToBottom()
+            self.update_line_count()
+            return
+        
+        pattern = None
+        if text:
+            source = text.encode('utf-8')
+            try:
+                pattern = re.compile(source if self.regex_check.isChecked() else re.escape(source), re.IGNORECASE)
+            except re.error as e:
+                self.line_count_label.setText(f"Invalid regular expression: {e}")
+                return
+        
+        self.indexer.set_query(pattern, min_level)
+        self.query_generation = None
+        self.search_model.set_ids(array('Q'))
+        self.log_view.setModel(self.search_model)
+        self.update_line_count()
+    
+    def jump_to_time(self):
+        """Scroll to the first line logged at or after the chosen time"""
+        self.pending_jump = self.time_edit.dateTime().toSecsSinceEpoch()
+        if self.searching() and self.query_generation is not None:
+            self._do_jump()
+        elif not self.searching():
+            self.apply_filter()  # index every line, then jump
+    
+    def _do_jump(self):
+        row = self.indexer.index.find_time(self.search_model.ids, self.pending_jump)
+        self.pending_jump = None
+        if self.search_model.ids:
+            row = min(row, len(self.search_model.ids) - 1)
+            target = self.search_model.index(row, 0)
+            self.log_view.scrollTo(target, QListView.PositionAtTop)
+            self.log_view.setCurrentIndex(target)
+    
+    def on_indexed(self, lines):
+        self.indexed_lines = lines
+        self.update_line_count()
+    
+    def on_results(self, generation, ids, replace):
+        """Results from the indexer; stale generations are ignored"""
+        if not self.searching() or generation != self.indexer.generation:
+            return
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        if replace:
+            self.search_model.set_ids(ids)
+            self.log_view.scrollToBottom()
+        elif ids:
+            self.search_model.append_ids(ids)
+            if at_bottom:
+                self.log_view.scrollToBottom()
+        self.query_generation = generation
+        if self.pending_jump is not None:
+            self._do_jump()
+        self.update_line_count()
+    
+    def refresh_log(self):
+        """Reload the tail of the log and scroll to the bottom"""
+        self.model.reload_tail(self.TAIL_LINES)
+        self.log_view.scrollToBottom()
+        self.update_line_count()
+    
+    def follow_log(self):
+        """Append new lines, staying at the bottom if the view was there"""
+        if self.searching():
+            return  # the indexer appends new matches itself
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        added = self.model.load_appended()
+        if added < 0:
+            self.refresh_log()
+        elif added:
+            if at_bottom:
+                self.log_view.scrollToBottom()
+            self.update_line_count()
+    
+    def on_scroll(self, value):
+        """Load an older page when scrolled to the top"""
+        if self.searching():
+            return
+        if value == self.log_view.verticalScrollBar().minimum() and not self.model.log_index.at_start:
+            added = self.model.load_previous(self.TAIL_LINES)
+            if added:
+                self.log_view.scrollTo(self.model.index(added, 0), QListView.PositionAtTop)
+                self.update_line_count()
+    
+    def clear_log(self):
+        """Clear log file"""
+        reply = QMessageBox.question(
+            self, 'Clear Log',
+            'Are you sure you want to clear the log file?',
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            try:
+                with open(self.log_file, 'w') as f:
+                    f.write("")
+                self.refresh_log()
+                self.indexer.wake.set()
+                logging.info("Log file cleared by user")
+            except Exception as e:
+                QMessageBox.warning(self, "Error", f"Failed to clear log: {e}")
+    
+    def done(self, result):
+        """Stop the indexer when the dialog closes"""
+        self.follow_timer.stop()
+        self.indexer.stop()
+        self.indexer.wait()
+        super().done(result)
+
+
+class DiagnosticsDialog(QDialog):
+    """Live view of the metrics registry"""
+    
+    def __init__(self, parent, dump_path):
+        super().__init__(parent)
+        self.dump_path = dump_path
+        self.init_ui()
+        
+        # Refresh while open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_metrics)
+        self.refresh_timer.start(1000)
+    
+    def init_ui(self):
+        """Initialize diagnostics UI"""
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumSize(700, 450)
+        
+        layout = QVBoxLayout()
+        
+        self.metrics_text = QTextEdit()
+        self.metrics_text.setReadOnly(True)
+        self.metrics_text.setLineWrapMode(QTextEdit.NoWrap)
+        self.metrics_text.setStyleSheet("""
+            QTextEdit {
+                background-color: #1a1a1a;
+                color: #e8e8e8;
+                font-family: Consolas, monospace;
+                font-size: 10pt;
+            }
+        """)
+        layout.addWidget(self.metrics_text)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_metrics)
+        button_layout.addWidget(refresh_btn)
+        
+        save_btn = QPushButton("Save to File")
+        save_btn.clicked.connect(self.save_metrics)
+        button_layout.addWidget(save_btn)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
+        
+        # Dark theme
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #1e1e1e;
+            }
+            QPushButton {
+                background-color: #8b7355;
+                color: #f5f5dc;
+                border: 2px solid #6b5344;
+                border-radius: 5px;
+                padding: 8px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b8365;
+            }
+        """)
+        
+        self.refresh_metrics()
+    
+    def refresh_metrics(self):
+        """Re-render the metrics, keeping the scroll position"""
+        scroll = self.metrics_text.verticalScrollBar().value()
+        self.metrics_text.setPlainText(metrics.format_report())
+        self.metrics_text.verticalScrollBar().setValue(scroll)
+    
+    def save_metrics(self):
+        """Dump the metrics as JSON"""
+        path, _ = QFileDialog.getSaveFileName(self, "Save Metrics", str(self.dump_path), "JSON files (*.json)")
+        if not path:
+            return
+        try:
+            metrics.dump(path)
+            logging.info(f"Metrics saved to {path}")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to save metrics: {e}")
@@ -0,0 +1,716 @@
+"""
+HotspotKeeper tray GUI - a thin client of the HotspotKeeper monitoring core.
+
+Imported by main() unless running --headless.
+"""
+
+import logging
+import os
+import time
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QPushButton, QSystemTrayIcon, QMenu, QCheckBox, QFrame, QDialog)
+from PySide6.QtCore import QTimer, Qt, QRectF
+from PySide6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor
+
+from hotspotkeeper import HotspotKeeper, StartupManager, UpdateChecker, metrics
+
+
+class UptimeChart(QWidget):
+    """Bar per hour over the last day: hotspot time in green, WiFi-only time in grey"""
+    
+    HOURS = 24
+    
+    def __init__(self):
+        super().__init__()
+        self.rollups = []
+        self.now = 0.0
+        self.setFixedHeight(50)
+        self.setToolTip("Hotspot uptime per hour, last 24 hours")
+    
+    def set_rollups(self, rollups, now):
+        """Hourly HistoryStore.ROLLUP records to draw"""
+        self.rollups = rollups
+        self.now = now
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#2a2a2a"))
+        width = self.width() / self.HOURS
+        height = self.height()
+        first_hour = self.now - self.now % 3600 - (self.HOURS - 1) * 3600
+        for start, observed, wifi, hotspot, *_ in self.rollups:
+            slot = int((start - first_hour) // 3600)
+            if not 0 <= slot < self.HOURS:
+                continue
+            x = slot * width
+            wifi_height = height * min(wifi / 3600, 1.0)
+            hotspot_height = height * min(hotspot / 3600, 1.0)
+            painter.fillRect(QRectF(x + 1, height - wifi_height, width - 2, wifi_height), QColor("#4a4a4a"))
+            painter.fillRect(QRectF(x + 1, height - hotspot_height, width - 2, hotspot_height), QColor("#7fb57f"))
+        painter.end()
+
+
+class MainWindow(QMainWindow):
+    """Main application window"""
+    
+    UPDATE_CHECK_DELAY = 30  # seconds after a --minimized start (login) before checking for updates
+    UPDATE_CHECK_QUIT_WAIT = 2  # seconds an update check in flight gets to finish on quit
+    HISTORY_REFRESH = 60  # seconds between history chart refreshes while the window is shown
+    
+    def __init__(self, start_minimized=False, settings_manager=None, log_file=None):
+        super().__init__()
+        self.settings_manager = settings_manager
+        self.settings = settings_manager.settings  # typed; changes arrive via on_settings_changed
+        self.log_file = log_file
+        self.start_minimized = start_minimized
+        
+        # Monitoring and auto-enable run in the core; the window renders and forwards commands
+        self.keeper = HotspotKeeper(settings_manager)
+        self.keeper.status_changed.connect(self.on_status_changed)
+        self.keeper.operation_started.connect(self.on_operation_started)
+        self.keeper.operation_finished.connect(self.on_operation_finished)
+        self.keeper.telemetry_sampled.connect(self.on_telemetry_sampled)
+        
+        # Widgets are built on first show - a --minimized start only needs the tray
+        self.ui_built = False
+        self.history_refreshed = 0.0
+        self.create_tray_icon()
+        self.settings_manager.subscribe(self.on_settings_changed)
+        self.keeper.control_server.register('show', self.on_show_requested)
+        self.keeper.start()
+        
+        # Check for updates - off the startup path, then hourly; the checker's
+        # on-disk cache limits real requests to the configured interval
+        self.update_checker = None
+        self.notified_version = None
+        QTimer.singleShot(self.UPDATE_CHECK_DELAY * 1000 if start_minimized else 0, self.check_for_updates)
+        self.update_timer = QTimer(self)
+        self.update_timer.timeout.connect(self.check_for_updates)
+        self.update_timer.start(3600 * 1000)
+    
+    def setVisible(self, visible):
+        """Build the widgets the first time the window is shown"""
+        if visible:
+            self.ensure_ui()
+            if time.monotonic() - self.history_refreshed >= self.HISTORY_REFRESH:
+                self.refresh_history()
+        super().setVisible(visible)
+    
+    def ensure_ui(self):
+        """Build the widgets if they have not been built yet"""
+        if self.ui_built:
+            return
+        started = time.perf_counter()
+        self.init_ui()
+        self.ui_built = True
+        if self.keeper.policy.busy:  # an operation started from ctl or a relaunch is still running
+            self.enable_btn.setEnabled(False)
+            self.disable_btn.setEnabled(False)
+        self.refresh_history()
+        if self.keeper.last_snapshot is not None:
+            self.render_status(self.keeper.last_snapshot)
+        metrics.observe('gui.build_ui', time.perf_counter() - started)
+    
+    def check_for_updates(self):
+        """Start a background update check unless disabled or one is running"""
+        hours = self.settings.update_check_interval
+        if hours == 0 or (self.update_checker is not None and self.update_checker.isRunning()):
+            return
+        self.update_checker = UpdateChecker(self.settings_manager.settings_dir / "update_cache.json", hours * 3600)
+        self.update_checker.update_available.connect(self.show_update_notification)
+        self.update_checker.start()
+        
+    def init_ui(self):
+        """Initialize the user interface"""
+        self.setWindowTitle("HotspotKeeper v1.1.0")
+        self.setFixedSize(450, 570)
+        
+        # Set window icon
+        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'icon.ico')
+        if os.path.exists(icon_path):
+            self.setWindowIcon(QIcon(icon_path))
+        
+        # Main widget and layout
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Title
+        title = QLabel("HotspotKeeper")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #e8e8e8;")
+        layout.addWidget(title)
+        
+        # Slogan
+        slogan = QLabel("Never Forget Hotspot Again.")
+        slogan.setStyleSheet("font-size: 12px; font-style: italic; color: #a8a8a8;")
+        layout.addWidget(slogan)
+        
+        # Status frame
+        status_frame = QFrame()
+        status_frame.setFrameStyle(QFrame.StyledPanel)
+        status_frame.setObjectName("statusFrame")  # keep the style off the labels (QLabel is a QFrame)
+        status_frame.setStyleSheet("""
+            QFrame#statusFrame {
+                background-color: #2a2a2a;
+                border: 1px solid #3a3a3a;
+                border-radius: 8px;
+                padding: 10px;
+            }
+        """)
+        status_layout = QVBoxLayout(status_frame)
+        
+        self.wifi_status = QLabel("WiFi: Checking...")
+        self.wifi_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        status_layout.addWidget(self.wifi_status)
+        
+        self.hotspot_status = QLabel("Hotspot: Checking...")
+        self.hotspot_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        status_layout.addWidget(self.hotspot_status)
+        
+        self.clients_status = QLabel("Clients: -")
+        self.clients_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        status_layout.addWidget(self.clients_status)
+        
+        self.battery_status = QLabel("Battery: Checking...")
+        self.battery_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        status_layout.addWidget(self.battery_status)
+        
+        layout.addWidget(status_frame)
+        
+        # History - hourly uptime over the last day, from the core's HistoryStore
+        self.uptime_label = QLabel("Uptime: no history yet")
+        self.uptime_label.setStyleSheet("font-size: 12px; color: #a8a8a8;")
+        layout.addWidget(self.uptime_label)
+        self.uptime_chart = UptimeChart()
+        layout.addWidget(self.uptime_chart)
+        
+        # Settings
+        self.auto_enable_check = QCheckBox("Enable Auto-Hotspot")
+        self.auto_enable_check.setChecked(self.keeper.policy.auto_enabled)
+        self.auto_enable_check.setStyleSheet("""
+            QCheckBox {
+                font-size: 13px;
+                color: #d8d8d8;
+                spacing: 8px;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+                border-radius: 3px;
+                border: 2px solid #6b5344;
+                background-color: #2a2a2a;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #8b7355;
+                border-color: #8b7355;
+            }
+        """)
+        self.auto_enable_check.stateChanged.connect(self.toggle_auto_hotspot)
+        layout.addWidget(self.auto_enable_check)
+        
+        self.startup_check = QCheckBox("Start with Windows")
+        self.startup_check.setChecked(StartupManager.is_startup_enabled())
+        self.startup_check.setStyleSheet("""
+            QCheckBox {
+                font-size: 13px;
+                color: #d8d8d8;
+                spacing: 8px;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+                border-radius: 3px;
+                border: 2px solid #6b5344;
+                background-color: #2a2a2a;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #8b7355;
+                border-color: #8b7355;
+            }
+        """)
+        self.startup_check.stateChanged.connect(self.toggle_startup)
+        layout.addWidget(self.startup_check)
+        
+        # Manual controls
+        controls_layout = QHBoxLayout()
+        controls_layout.setSpacing(10)
+        
+        self.enable_btn = QPushButton("Enable Hotspot")
+        self.enable_btn.setMinimumWidth(180)
+        self.enable_btn.setFixedHeight(40)
+        self.enable_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #8b7355;
+                color: #f5f5dc;
+                border: 2px solid #6b5344;
+                border-radius: 5px;
+                padding: 8px 20px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b8365;
+                border-color: #7b6354;
+            }
+            QPushButton:pressed {
+                background-color: #6b5344;
+            }
+            QPushButton:disabled {
+                background-color: #4a4a4a;
+                color: #808080;
+                border-color: #3a3a3a;
+            }
+        """)
+        self.enable_btn.clicked.connect(self.manual_enable_hotspot)
+        controls_layout.addWidget(self.enable_btn)
+        
+        self.disable_btn = QPushButton("Disable Hotspot")
+        self.disable_btn.setMinimumWidth(180)
+        self.disable_btn.setFixedHeight(40)
+        self.disable_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #8b6f47;
+                color: #f5f5dc;
+                border: 2px solid #6b5337;
+                border-radius: 5px;
+                padding: 8px 20px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b7f57;
+                border-color: #7b6347;
+            }
+            QPushButton:pressed {
+                background-color: #6b5337;
+            }
+            QPushButton:disabled {
+                background-color: #4a4a4a;
+                color: #808080;
+                border-color: #3a3a3a;
+            }
+        """)
+        self.disable_btn.clicked.connect(self.manual_disable_hotspot)
+        controls_layout.addWidget(self.disable_btn)
+        
+        layout.addLayout(controls_layout)
+        
+        # Settings button
+        settings_btn = QPushButton("⚙ Settings")
+        settings_btn.setFixedHeight(35)
+        settings_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #5a5a5a;
+                color: #f5f5dc;
+                border: 2px solid #4a4a4a;
+                border-radius: 5px;
+                padding: 5px 15px;
+                font-size: 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #6a6a6a;
+            }
+        """)
+        settings_btn.clicked.connect(self.show_settings)
+        layout.addWidget(settings_btn)
+        
+        # Info label
+        info = QLabel("Continuously monitors and keeps hotspot enabled when WiFi is connected.")
+        info.setWordWrap(True)
+        info.setStyleSheet("font-size: 11px; color: #888888;")
+        layout.addWidget(info)
+        
+        # GitHub link
+        github_link = QLabel('<a href="https://github.com/Moanesbbr/HotspotKeeper" style="color: #8b7355;">Open Source on GitHub</a>')
+        github_link.setOpenExternalLinks(True)
+        github_link.setStyleSheet("font-size: 11px;")
+        github_link.setAlignment(Qt.AlignCenter)
+        layout.addWidget(github_link)
+        
+        # Apply dark theme
+        self.setStyleSheet("""
+            QMainWindow {
+                background-color: #1e1e1e;
+            }
+        """)
+    
+    def create_tray_icon(self):
+        """Create system tray icon and menu"""
+        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'icon.ico')
+        
+        if os.path.exists(icon_path):
+            self.base_icon = QIcon(icon_path)
+        else:
+            # Fallback icon
+            pixmap = QPixmap(64, 64)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(QColor("#8b7355"))
+            painter.setPen(Qt.NoPen)
+            painter.drawEllipse(20, 40, 24, 24)
+            for i in range(3):
+                radius = 15 + (i * 8)
+                painter.drawArc(32 - radius, 32 - radius, radius * 2, radius * 2, 0, 180 * 16)
+            painter.end()
+            self.base_icon = QIcon(pixmap)
+        
+        self.tray_icon = QSystemTrayIcon(self.base_icon, self)
+        
+        # Create menu
+        tray_menu = QMenu()
+        
+        show_action = QAction("Show Window", self)
+        show_action.triggered.connect(self.show)
+        tray_menu.addAction(show_action)
+        
+        tray_menu.addSeparator()
+        
+        self.auto_action = QAction("Auto-Hotspot Enabled", self)
+        self.auto_action.setCheckable(True)
+        self.auto_action.setChecked(self.keeper.policy.auto_enabled)
+        self.auto_action.triggered.connect(self.toggle_auto_from_tray)
+        tray_menu.addAction(self.auto_action)
+        
+        tray_menu.addSeparator()
+        
+        settings_action = QAction("Settings", self)
+        settings_action.triggered.connect(self.show_settings)
+        tray_menu.addAction(settings_action)
+        
+        logs_action = QAction("View Logs", self)
+        logs_action.triggered.connect(self.show_logs)
+        tray_menu.addAction(logs_action)
+        
+        diagnostics_action = QAction("Diagnostics", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        tray_menu.addAction(diagnostics_action)
+        
+        tray_menu.addSeparator()
+        
+        quit_action = QAction("Exit", self)
+        quit_action.triggered.connect(self.quit_app)
+        tray_menu.addAction(quit_action)
+        
+        self.tray_icon.setContextMenu(tray_menu)
+        self.tray_icon.activated.connect(self.tray_icon_activated)
+        self.tray_icon.show()
+    
+    def on_show_requested(self, arg):
+        """A relaunch (or `hotspotkeeper_ctl.py show`) asked for the window"""
+        self.show()
+        self.setWindowState(self.windowState() & ~Qt.WindowMinimized)
+        self.raise_()
+        self.activateWindow()
+        return {'ok': True}
+    
+    def update_tray_icon_status(self, wifi_on, hotspot_on):
+        """Update tray icon based on status (visual feedback)"""
+        # This creates a simple colored indicator overlay
+        # You could make this more sophisticated
+        if wifi_on and hotspot_on:
+            self.tray_icon.setToolTip("HotspotKeeper - WiFi & Hotspot Active")
+        elif wifi_on:
+            self.tray_icon.setToolTip("HotspotKeeper - WiFi Active")
+        else:
+            self.tray_icon.setToolTip("HotspotKeeper - Monitoring")
+    
+    def tray_icon_activated(self, reason):
+        """Handle tray icon clicks"""
+        if reason == QSystemTrayIcon.DoubleClick:
+            if self.isVisible():
+                self.hide()
+            else:
+                self.show()
+                self.activateWindow()
+    
+    def on_status_changed(self, snapshot):
+        """Render a status snapshot"""
+        started = time.perf_counter()
+        if self.ui_built:
+            self.render_status(snapshot)
+            if self.isVisible() and time.monotonic() - self.history_refreshed >= self.HISTORY_REFRESH:
+                self.refresh_history()
+        
+        # Update tray icon tooltip
+        self.update_tray_icon_status(snapshot.wifi_connected, snapshot.hotspot_enabled)
+        metrics.observe('gui.render', time.perf_counter() - started)
+    
+    def refresh_history(self):
+        """Redraw the uptime chart and summary from the history rollups"""
+        history = self.keeper.history
+        now = time.time()
+        self.history_refreshed = time.monotonic()
+        if not history.enabled:
+            self.uptime_label.setText("Uptime: history disabled")
+            self.uptime_chart.set_rollups([], now)
+            return
+        day = history.uptime(86400, now)
+        month = history.uptime(30 * 86400, now)
+        if day['ratio'] is not None:
+            self.uptime_label.setText(f"Hotspot uptime: {day['ratio']:.1%} last 24 h   "
+                                      f"{month['ratio']:.1%} last 30 days")
+        self.uptime_chart.set_rollups(history.hours.records(now - UptimeChart.HOURS * 3600), now)
+    
+    def render_status(self, snapshot):
+        """Show a status snapshot in the window's labels"""
+        wifi_connected = snapshot.wifi_connected
+        hotspot_enabled = snapshot.hotspot_enabled
+        battery_level = snapshot.battery_level
+        is_plugged = snapshot.is_plugged
+        
+        # Update WiFi status
+        if wifi_connected:
+            self.wifi_status.setText(f"WiFi: ✓ Connected ({snapshot.ssid})" if snapshot.ssid else "WiFi: ✓ Connected")
+            self.wifi_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
+        else:
+            self.wifi_status.setText("WiFi: ✗ Disconnected")
+            self.wifi_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        
+        # Update hotspot status
+        if hotspot_enabled:
+            self.hotspot_status.setText("Hotspot: ✓ Enabled")
+            self.hotspot_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
+        else:
+            self.hotspot_status.setText("Hotspot: ✗ Disabled")
+            self.hotspot_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+        
+        # Client count and throughput - live values come from on_telemetry_sampled
+        sample = self.keeper.telemetry.latest()
+        if sample is not None:
+            self.render_telemetry(sample)
+        elif hotspot_enabled:
+            self.clients_status.setText(f"Clients: {snapshot.client_count or 0}")
+        else:
+            self.clients_status.setText("Clients: -")
+        
+        # Update battery status
+        if is_plugged:
+            self.battery_status.setText(f"Battery: {battery_level}% (Plugged In)")
+            self.battery_status.setStyleSheet("font-size: 13px; color: #7fb57f;")
+        else:
+            self.battery_status.setText(f"Battery: {battery_level}%")
+            if battery_level < 20:
+                self.battery_status.setStyleSheet("font-size: 13px; color: #d08c8c;")
+            else:
+                self.battery_status.setStyleSheet("font-size: 13px; color: #b8b8b8;")
+    
+    def on_telemetry_sampled(self, sample):
+        """Show a telemetry sample - skipped while the window is hidden"""
+        if self.ui_built and self.isVisible():
+            self.render_telemetry(sample)
+    
+    def render_telemetry(self, sample):
+        """Show client count and throughput in the window"""
+        self.clients_status.setText(f"Clients: {sample.client_count}   "
+                                    f"↓ {sample.down_mbps:.1f} Mbps   ↑ {sample.up_mbps:.1f} Mbps")
+    
+    def on_operation_started(self, enable, automatic):
+        """Notify when the core starts re-enabling the hotspot on its own"""
+        # Only show notification on first attempt, not on retries
+        if (automatic and enable and self.keeper.policy.consecutive_failures == 0 and
+                self.settings.show_notifications):
+            self.tray_icon.showMessage(
+                "Auto-Hotspot",
+                "Hotspot was disabled. Re-enabling...",
+                QSystemTrayIcon.Information,
+                2000
+            )
+    
+    def on_operation_finished(self, result, automatic):
+        """Route an operation's outcome to the manual or automatic handler"""
+        if not automatic:
+            if result.action == 'enable':
+                self._on_manual_enable_finished(result)
+            else:
+                self._on_manual_disable_finished(result)
+        elif result.action == 'enable' and not result.success:
+            policy = self.keeper.policy
+            if policy.consecutive_failures >= policy.max_failures and self.settings.show_notifications:
+                self.tray_icon.showMessage(
+                    "Auto-Hotspot Failed",
+                    f"Failed {policy.max_failures} times. Will retry in {policy.failure_cooldown}s.\n\n"
+                    "Please check:\n• Mobile Hotspot is configured\n• You have admin privileges",
+                    QSystemTrayIcon.Warning,
+                    8000
+                )
+    
+    def toggle_auto_hotspot(self, state):
+        """Toggle auto-hotspot feature"""
+        if self.settings_manager.set("auto_hotspot_enabled", self.auto_enable_check.isChecked()):
+            logging.info(f"Auto-hotspot {'enabled' if self.settings.auto_hotspot_enabled else 'disabled'}")
+    
+    def toggle_auto_from_tray(self):
+        """Toggle auto-hotspot from tray menu"""
+        if self.settings_manager.set("auto_hotspot_enabled", self.auto_action.isChecked()):
+            logging.info(f"Auto-hotspot {'enabled' if self.settings.auto_hotspot_enabled else 'disabled'} from tray")
+    
+    def on_settings_changed(self, changed):
+        """Keep the window checkbox and tray action in sync with the settings"""
+        if "auto_hotspot_enabled" in changed:
+            widgets = (self.auto_enable_check, self.auto_action) if self.ui_built else (self.auto_action,)
+            for widget in widgets:
+                widget.blockSignals(True)  # Prevent signal loop
+                widget.setChecked(self.settings.auto_hotspot_enabled)
+                widget.blockSignals(False)
+    
+    def toggle_startup(self, state):
+        """Toggle Windows startup"""
+        if self.startup_check.isChecked():
+            if StartupManager.enable_startup():
+                if self.settings.show_notifications:
+                    self.tray_icon.showMessage(
+                        "Startup Enabled",
+                        "App will start minimized in tray with Windows",
+                        QSystemTrayIcon.Information,
+                        2000
+                    )
+        else:
+            StartupManager.disable_startup()
+    
+    def manual_enable_hotspot(self):
+        """Manually enable hotspot"""
+        if self.keeper.policy.busy:
+            return
+        
+        self.enable_btn.setEnabled(False)
+        self.disable_btn.setEnabled(False)
+        self.enable_btn.setText("Enabling...")
+        
+        if self.settings.show_notifications:
+            self.tray_icon.showMessage(
+                "HotspotKeeper",
+                "Enabling Mobile Hotspot...",
+                QSystemTrayIcon.Information,
+                2000
+            )
+        
+        self.keeper.request_hotspot(True)
+    
+    def _on_manual_enable_finished(self, result):
+        """Handle the outcome of a manual enable"""
+        if self.ui_built:  # ctl or a forwarded --enable can run before the window was ever shown
+            self.enable_btn.setText("Enable Hotspot")
+            self.enable_btn.setEnabled(True)
+            self.disable_btn.setEnabled(True)
+        
+        if self.settings.show_notifications:
+            if result.success:
+                self.tray_icon.showMessage(
+                    "HotspotKeeper",
+                    "Mobile Hotspot enabled successfully!",
+                    QSystemTrayIcon.Information,
+                    2000
+                )
+            else:
+                self.tray_icon.showMessage(
+                    "HotspotKeeper",
+                    f"Failed to enable hotspot ({result.status or 'error'}). Please check:\n"
+                    "• Mobile Hotspot is configured\n• You have admin privileges",
+                    QSystemTrayIcon.Warning,
+                    5000
+                )
+    
+    def manual_disable_hotspot(self):
+        """Manually disable hotspot"""
+        if self.keeper.policy.busy:
+            return
+        
+        self.enable_btn.setEnabled(False)
+        self.disable_btn.setEnabled(False)
+        self.disable_btn.setText("Disabling...")
+        
+        if self.settings.show_notifications:
+            self.tray_icon.showMessage(
+                "HotspotKeeper",
+                "Disabling Mobile Hotspot...",
+                QSystemTrayIcon.Information,
+                2000
+            )
+        
+        self.keeper.request_hotspot(False)
+    
+    def _on_manual_disable_finished(self, result):
+        """Handle the outcome of a manual disable"""
+        if self.ui_built:
+            self.disable_btn.setText("Disable Hotspot")
+            self.enable_btn.setEnabled(True)
+            self.disable_btn.setEnabled(True)
+        
+        if self.settings.show_notifications:
+            if result.success:
+                self.tray_icon.showMessage(
+                    "HotspotKeeper",
+                    "Mobile Hotspot disabled successfully!",
+                    QSystemTrayIcon.Information,
+                    2000
+                )
+            else:
+                self.tray_icon.showMessage(
+                    "HotspotKeeper",
+                    f"Failed to disable hotspot ({result.status or 'error'}). Please try again.",
+                    QSystemTrayIcon.Warning,
+                    3000
+                )
+    
+    def show_settings(self):
+        """Show settings dialog"""
+        from hotspotkeeper_dialogs import SettingsDialog
+        
+        dialog = SettingsDialog(self, self.settings_manager)
+        if dialog.exec() == QDialog.Accepted:
+            logging.info("Settings updated")  # applied by on_settings_changed
+    
+    def show_logs(self):
+        """Show log viewer"""
+        from hotspotkeeper_dialogs import LogViewerDialog
+        
+        dialog = LogViewerDialog(self, self.log_file)
+        dialog.exec()
+    
+    def show_diagnostics(self):
+        """Show live metrics"""
+        from hotspotkeeper_dialogs import DiagnosticsDialog
+        
+        dialog = DiagnosticsDialog(self, self.settings_manager.settings_dir / "metrics.json")
+        dialog.exec()
+    
+    def show_update_notification(self, version, url):
+        """Show update available notification (once per version)"""
+        if version == self.notified_version:
+            return
+        self.notified_version = version
+        if self.settings.show_notifications:
+            self.tray_icon.showMessage(
+                "Update Available",
+                f"Version {version} is available! Click to download.",
+                QSystemTrayIcon.Information,
+                5000
+            )
+    
+    def closeEvent(self, event):
+        """Handle window close event"""
+        event.ignore()
+        self.hide()
+        if not self.start_minimized and self.settings.show_notifications:
+            self.tray_icon.showMessage(
+                "Still Running",
+                "App is running in system tray",
+                QSystemTrayIcon.Information,
+                2000
+            )
+    
+    def quit_app(self):
+        """Quit the application"""
+        logging.info("Application shutting down")
+        self.settings_manager.unsubscribe(self.on_settings_changed)
+        self.update_timer.stop()
+        checker = self.update_checker
+        if checker is not None and not checker.wait(self.UPDATE_CHECK_QUIT_WAIT * 1000):
+            logging.warning("Update check still running at exit")
+        self.keeper.shutdown()
+        QApplication.quit()
@@ -0,0 +1,35 @@
+"""
+HotspotKeeper launcher.
+
+Entry point for running HotspotKeeper from source and for the packaged exe.
+A relaunch (double-click, autostart, shortcut) while an instance is running
+is handed to that instance over the control endpoint and exits here, before
+the application module is compiled or Qt is loaded; otherwise it imports
+`hotspotkeeper` and starts it.
+
+Usage:
+    python hotspotkeeper_launcher.py [--minimized | --headless] [--enable | --disable]
+    python hotspotkeeper_launcher.py --replay-trace [path]
+"""
+
+import sys
+
+import hotspotkeeper_ctl
+
+
+def main():
+    argv = sys.argv[1:]
+    if '--replay-trace' not in argv:
+        reply = hotspotkeeper_ctl.forward_launch(argv)
+        if reply is not None:
+            if not reply.get('ok'):
+                print(f"HotspotKeeper is already running: {reply.get('error')}", file=sys.stderr)
+                return hotspotkeeper_ctl.EXIT_FAILED
+            return hotspotkeeper_ctl.EXIT_OK
+
+    import hotspotkeeper
+    return hotspotkeeper.main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
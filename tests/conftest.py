@@ -0,0 +1,24 @@
+"""
+Shared test setup: the repository root on sys.path, Qt on its offscreen
+platform, the simulated backend and a throwaway profile, so the tests run
+on Linux without any Windows API.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["HOTSPOTKEEPER_BACKEND"] = "simulated"
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="hotspotkeeper-test-")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The process-wide QCoreApplication"""
+    from PySide6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
@@ -0,0 +1,43 @@
+"""
+Stand-in for the PowerShell host: speaks PowerShellHost's line protocol and
+interprets a few test "scripts" instead of PowerShell:
+
+    echo <text>   reply with <text> on stdout
+    fail <text>   reply with code 1 and <text> on stderr
+    sleep <secs>  wait, then reply
+    die           exit without replying
+    pid           reply with this process's pid
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if request.get('op') == 'exit':
+            break
+        command, _, arg = request['script'].partition(' ')
+        response = {'id': request['id'], 'code': 0, 'stdout': '', 'stderr': ''}
+        if command == 'echo':
+            response['stdout'] = arg
+        elif command == 'fail':
+            response['code'] = 1
+            response['stderr'] = arg
+        elif command == 'sleep':
+            time.sleep(float(arg))
+        elif command == 'die':
+            sys.exit(3)
+        elif command == 'pid':
+            response['stdout'] = str(os.getpid())
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
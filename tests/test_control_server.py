@@ -0,0 +1,130 @@
+"""ControlServer command dispatch, driven through hotspotkeeper_ctl.ControlClient"""
+
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from hotspotkeeper import HotspotBackend, HotspotKeeper, SettingsManager, SimulatedBackend
+from hotspotkeeper_ctl import ControlClient
+
+unix_socket = pytest.mark.skipif(sys.platform == 'win32', reason="raw requests use the Unix socket endpoint")
+
+
+def wait_until(app, predicate, timeout=5):
+    """Run the event loop until predicate() holds; returns False on timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def off_thread(app, function):
+    """Run a blocking client call on a thread while the server's event loop keeps running"""
+    result = {}
+
+    def run():
+        try:
+            result['value'] = function()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert wait_until(app, lambda: not thread.is_alive())
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+@pytest.fixture
+def keeper(qapp):
+    backend = SimulatedBackend(wifi_connected=True)
+    backend.tethering_delay = 0.3
+    HotspotBackend.install(backend)
+    settings_manager = SettingsManager()
+    settings_manager.set("auto_hotspot_enabled", False)
+    keeper = HotspotKeeper(settings_manager)
+    keeper.start()
+    assert wait_until(qapp, lambda: keeper.last_snapshot is not None)
+    yield keeper
+    keeper.shutdown()
+
+
+@pytest.fixture
+def ask(qapp, keeper):
+    """Send one command on a fresh connection and return the reply"""
+    def ask(command):
+        def request():
+            with ControlClient(keeper.control_server.name, timeout=5) as client:
+                return client.request(command)
+        return off_thread(qapp, request)
+    return ask
+
+
+def test_status(ask):
+    reply = ask("status")
+    assert reply['ok']
+    status = reply['status']
+    assert status['wifi_connected'] is True and status['hotspot_enabled'] is False
+    assert status['auto_enabled'] is False and status['backend'] == 'simulated'
+
+
+def test_enable_and_disable(qapp, ask, keeper):
+    assert ask("enable") == {'ok': True}
+    busy = ask("disable")
+    assert not busy['ok'] and 'in progress' in busy['error']
+    assert wait_until(qapp, lambda: not keeper.policy.busy and keeper.last_snapshot.hotspot_enabled)
+    assert ask("status")['status']['hotspot_enabled'] is True
+
+    assert ask("DISABLE") == {'ok': True}  # commands are case-insensitive
+    assert wait_until(qapp, lambda: not keeper.policy.busy and not keeper.last_snapshot.hotspot_enabled)
+
+
+def test_auto(ask, keeper):
+    assert ask("auto on") == {'ok': True, 'auto_enabled': True}
+    assert keeper.settings.auto_hotspot_enabled
+    assert ask("auto toggle") == {'ok': True, 'auto_enabled': False}
+    assert ask("auto off") == {'ok': True, 'auto_enabled': False}
+    assert not ask("auto sideways")['ok']
+    assert not keeper.settings.auto_hotspot_enabled
+
+
+@unix_socket
+def test_unknown_and_malformed_commands(qapp, ask, keeper):
+    assert ask("reboot") == {'ok': False, 'error': 'unknown command: reboot'}
+    assert not ask('{"command": "status"')['ok']  # requests are command lines, not JSON
+    assert not ask("uptime soon")['ok']
+    assert ask("show") == {'ok': False, 'error': 'running headless - no window to show'}
+
+    # Several commands on one connection, including undecodable bytes
+    def pipelined():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(keeper.control_server.name)
+            sock.sendall(b"ping\n\xff\xfe\nstatus\n")
+            data = b''
+            while data.count(b'\n') < 3:
+                data += sock.recv(4096)
+            return data.splitlines()
+    lines = off_thread(qapp, pipelined)
+    assert b'"pid"' in lines[0] and b'unknown command' in lines[1] and b'"status"' in lines[2]
+
+
+@unix_socket
+def test_oversized_request_disconnects(qapp, keeper):
+    def oversized():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(keeper.control_server.name)
+            try:
+                sock.sendall(b"x" * (keeper.control_server.MAX_LINE * 4))
+                return sock.recv(4096)
+            except (ConnectionResetError, BrokenPipeError):
+                return b''
+    assert off_thread(qapp, oversized) == b''
@@ -0,0 +1,47 @@
+"""The headless core under QCoreApplication: auto-enable on WiFi connect and a clean shutdown"""
+
+import signal
+
+from PySide6.QtCore import QTimer
+
+from hotspotkeeper import HotspotBackend, HotspotKeeper, SettingsManager, SimulatedBackend, run_headless
+
+
+def test_headless_auto_enable_and_shutdown(qapp):
+    backend = SimulatedBackend(wifi_connected=False)
+    HotspotBackend.install(backend)
+    settings_manager = SettingsManager()
+    settings_manager.update({"auto_hotspot_enabled": True, "pause_polling_when_idle": False,
+                             "pause_polling_on_battery": False})
+    keeper = HotspotKeeper(settings_manager)
+    seen = []
+
+    def on_status(snapshot):
+        seen.append((snapshot.wifi_connected, snapshot.hotspot_enabled))
+        if snapshot.wifi_connected and snapshot.hotspot_enabled and not keeper.policy.busy:
+            qapp.quit()
+
+    keeper.status_changed.connect(on_status)
+    QTimer.singleShot(500, lambda: backend.set_wifi(True))
+    timed_out = []
+    watchdog = QTimer()
+    watchdog.setSingleShot(True)
+    watchdog.timeout.connect(lambda: (timed_out.append(True), qapp.quit()))
+    watchdog.start(20000)
+
+    handlers = {name: signal.getsignal(getattr(signal, name)) for name in ('SIGINT', 'SIGTERM')}
+    try:
+        run_headless(qapp, keeper)  # returns after keeper.shutdown()
+    finally:
+        watchdog.stop()
+        for name, handler in handlers.items():
+            signal.signal(getattr(signal, name), handler)
+
+    assert not timed_out
+    assert seen[0] == (False, False)
+    assert seen[-1] == (True, True)
+    assert backend.calls['set_tethering'] == 1
+    for thread in (keeper.monitor, keeper.probe_engine, keeper.telemetry):
+        assert not thread.isRunning()
+    assert not keeper.control_server.server.isListening()
+    assert keeper.hotspot_operation is None or not keeper.hotspot_operation.isRunning()
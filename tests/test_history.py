@@ -0,0 +1,102 @@
+"""HistoryTier ring wraparound and HistoryStore rollups and uptime"""
+
+import struct
+import time
+
+import pytest
+
+from hotspotkeeper import HistoryStore, HistoryTier, StatusSnapshot
+
+RECORD = struct.Struct('<dI')  # time, value
+
+# Ticks every minute for 30 hours from 18:00 local time: WiFi throughout, the
+# hotspot (with 2 clients) only for the last 5 hours. Crosses two midnights.
+START = time.mktime((2026, 1, 14, 18, 0, 0, 0, 0, -1))
+STEP = 60
+TICKS = 30 * 60 + 1
+HOTSPOT_FROM = 25 * 60  # tick index
+END = START + (TICKS - 1) * STEP
+
+
+def snapshot(hotspot):
+    return StatusSnapshot(True, hotspot, 80, True, "TestWiFi", 2 if hotspot else 0, 0.0, 0.01)
+
+
+def fill(store):
+    for index in range(TICKS):
+        store.record(snapshot(index >= HOTSPOT_FROM), START + index * STEP)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history", tick_days=1, hour_days=1, day_days=30)
+    fill(store)
+    yield store
+    store.close(END)
+
+
+def test_tier_wraps_oldest_first(tmp_path):
+    tier = HistoryTier(tmp_path / "tier.bin", RECORD, 5)
+    for value in range(12):
+        tier.append(float(value), value)
+    assert tier.wrapped()
+    assert [value for _, value in tier.records()] == [7, 8, 9, 10, 11]
+    assert [value for _, value in tier.records(since=9.5)] == [10, 11]
+    assert tier.oldest_time() == 7.0
+    tier.close()
+
+    # Reopened with the same capacity: everything kept; with a smaller one: the newest records
+    tier = HistoryTier(tmp_path / "tier.bin", RECORD, 5)
+    assert [value for _, value in tier.records()] == [7, 8, 9, 10, 11]
+    tier.append(12.0, 12)
+    tier.close()
+    tier = HistoryTier(tmp_path / "tier.bin", RECORD, 3)
+    assert [value for _, value in tier.records()] == [10, 11, 12]
+    tier.close()
+
+
+def test_day_rollups_split_at_midnight(store):
+    days = store.days.records()
+    assert len(days) == 3  # 18:00-24:00, a full day, and the bucket opened by the last tick at midnight
+    assert [day[1] for day in days] == [6 * 3600, 24 * 3600, 0]  # observed
+    assert [day[2] for day in days] == [6 * 3600, 24 * 3600, 0]  # wifi
+    assert [day[3] for day in days] == [0, 5 * 3600, 0]  # hotspot
+    assert days[1][4] == 2 * 5 * 3600  # client-seconds
+    assert sum(day[5] for day in days) == TICKS  # samples
+
+
+def test_hour_rollups_wrap(store):
+    assert store.hours.wrapped()
+    hours = store.hours.records()
+    assert len(hours) == 24
+    assert hours[-1][0] == END - END % 3600  # hour buckets are UTC hours, whatever the time zone
+    assert sum(hour[1] for hour in hours) == END - hours[0][0]
+    assert sum(hour[3] for hour in hours) == 5 * 3600
+
+
+def test_uptime(store):
+    # 20 hours: inside the hourly tier
+    recent = store.uptime(20 * 3600, END)
+    assert (recent['observed'], recent['hotspot']) == (20 * 3600, 5 * 3600)
+    assert recent['ratio'] == 0.25 and recent['mean_clients'] == 2
+
+    # 30 days: further back than the wrapped hourly tier, answered from the days
+    month = store.uptime(30 * 86400, END)
+    assert (month['observed'], month['hotspot'], month['wifi']) == (30 * 3600, 5 * 3600, 30 * 3600)
+    assert month['ratio'] == pytest.approx(1 / 6, abs=1e-4)
+
+
+def test_restart_keeps_rollups_and_gap_is_unobserved(tmp_path):
+    directory = tmp_path / "history"
+    store = HistoryStore(directory, hour_days=2)
+    fill(store)
+    store.close(END)
+
+    # Two hours later (longer than MAX_GAP): the gap is not credited
+    store = HistoryStore(directory, hour_days=2)
+    later = END + 2 * 3600
+    store.record(snapshot(True), later)
+    store.record(snapshot(True), later + 600)
+    uptime = store.uptime(40 * 3600, later + 600)
+    store.close(later + 600)
+    assert (uptime['observed'], uptime['hotspot']) == (30 * 3600 + 600, 5 * 3600 + 600)
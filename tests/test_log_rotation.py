@@ -0,0 +1,32 @@
+"""CompressingRotatingFileHandler size limits, with and without kept segments"""
+
+import gzip
+import logging
+
+from hotspotkeeper import CompressingRotatingFileHandler
+
+
+def write_records(handler, count):
+    for i in range(count):
+        handler.handle(logging.makeLogRecord({'msg': f"record {i:04d} " + "x" * 80, 'levelno': logging.INFO}))
+
+
+def test_rotated_segments_are_compressed(tmp_path):
+    path = tmp_path / "hotspotkeeper.log"
+    handler = CompressingRotatingFileHandler(path, max_bytes=4096, backup_count=2)
+    write_records(handler, 300)
+    handler.close()
+    assert path.stat().st_size <= 4096
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        ["hotspotkeeper.log", "hotspotkeeper.log.1.gz", "hotspotkeeper.log.2.gz"]
+    assert b"record" in gzip.decompress((tmp_path / "hotspotkeeper.log.1.gz").read_bytes())
+
+
+def test_no_backups_truncates(tmp_path):
+    path = tmp_path / "hotspotkeeper.log"
+    handler = CompressingRotatingFileHandler(path, max_bytes=4096, backup_count=0)
+    write_records(handler, 300)
+    handler.close()
+    assert 0 < path.stat().st_size <= 4096
+    assert "record 0299" in path.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["hotspotkeeper.log"]
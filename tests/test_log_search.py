@@ -0,0 +1,120 @@
+"""LogSearchIndex over rotated gzip segments (search, level filter, jump to time) and LogFileIndex paging"""
+
+import gzip
+import re
+import time
+
+import pytest
+
+from hotspotkeeper_dialogs import LogFileIndex, LogSearchIndex, LogSegment
+
+START = time.mktime((2026, 3, 2, 9, 0, 0, 0, 0, -1))
+LEVELS = ('DEBUG', 'INFO', 'INFO', 'WARNING', 'ERROR')
+
+
+def record(number):
+    """Line `number` of the test log: one record a minute, every fifth an ERROR with a traceback"""
+    stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(START + number * 60)) + ',250'
+    level = LEVELS[number % len(LEVELS)]
+    line = f"{stamp} - {level} - event {number}\n"
+    if level == 'ERROR':
+        line += "Traceback (most recent call last):\n  ValueError: hotspot busy\n"
+    return line
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """hotspotkeeper.log.2.gz (records 0-99), .log.1.gz (100-199) and the live log (200-249)"""
+    for suffix, numbers in (('.2.gz', range(0, 100)), ('.1.gz', range(100, 200))):
+        with gzip.open(tmp_path / f"hotspotkeeper.log{suffix}", 'wt') as f:
+            f.writelines(record(n) for n in numbers)
+    (tmp_path / "hotspotkeeper.log").write_text(''.join(record(n) for n in range(200, 250)))
+    (tmp_path / "hotspotkeeper.log.old").write_text("not a rotated segment\n")
+    return tmp_path
+
+
+@pytest.fixture
+def index(log_dir):
+    index = LogSearchIndex(log_dir / "hotspotkeeper.log")
+    assert index.refresh() == (True, 250 + 50 * 2)  # every ERROR brings two traceback lines
+    return index
+
+
+def search(index, pattern=None, min_level=0):
+    ids = []
+    for number in range(len(index.segments)):
+        ids.extend(index.matches(number, 0, pattern, min_level))
+    return ids
+
+
+def test_segments_oldest_first(index, log_dir):
+    assert [segment.path.name for segment in index.segments] == [
+        "hotspotkeeper.log.2.gz", "hotspotkeeper.log.1.gz", "hotspotkeeper.log"]
+    assert index.line(0).endswith("event 0")
+    assert index.line(2 << 32).endswith("event 200")
+
+
+def test_search_across_segments(index):
+    ids = search(index, re.compile(rb'event (99|100|249)\b'))
+    assert [index.line(row).split(' - ')[-1] for row in ids] == ["event 99", "event 100", "event 249"]
+    assert [row >> 32 for row in ids] == [0, 1, 2]
+
+    # Traceback lines belong to their record's level and time
+    busy = search(index, re.compile(rb'hotspot busy'))
+    assert len(busy) == 50
+    assert all(index.level(row) == LogSegment.LEVELS[b'ERROR'] for row in busy)
+    assert index.time(busy[0]) == START + 4 * 60 + 0.25
+
+
+def test_level_filter(index):
+    warnings = search(index, min_level=LogSegment.LEVELS[b'WARNING'])
+    assert len(warnings) == 50 + 50 * 3  # WARNING records, ERROR records with their tracebacks
+    errors = search(index, re.compile(rb'event'), LogSegment.LEVELS[b'ERROR'])
+    assert [index.line(row).split(' - ')[-1] for row in errors][:2] == ["event 4", "event 9"]
+    assert len(errors) == 50
+
+
+def test_jump_to_time(index):
+    ids = search(index, re.compile(rb'event'))
+    assert index.find_time(ids, START) == 0
+    position = index.find_time(ids, START + 150 * 60)  # inside the middle segment
+    assert index.line(ids[position]).endswith("event 150")
+    assert index.line(ids[index.find_time(ids, START + 150 * 60 + 1)]).endswith("event 151")
+    assert index.find_time(ids, START + 10 * 86400) == len(ids)
+
+
+def test_live_log_growth_and_rotation(index, log_dir):
+    live = log_dir / "hotspotkeeper.log"
+    with open(live, 'a') as f:
+        f.write(record(250) + record(251)[:20])  # the second line is still being written
+    assert index.refresh() == (False, 1)
+    assert index.line(2 << 32 | len(index.segments[2]) - 1).endswith("event 250")
+
+    live.rename(log_dir / "hotspotkeeper.log.3")
+    live.write_text(record(300))
+    rebuilt, total = index.refresh()
+    assert rebuilt and len(index.segments) == 4 and total == len(index)
+
+
+def test_log_file_index_paging(tmp_path):
+    path = tmp_path / "hotspotkeeper.log"
+    path.write_text(''.join(f"line {n}\n" for n in range(1000)) + "partial")
+    log_index = LogFileIndex(path, chunk_size=64)  # small chunks: lines straddle the reads
+    assert log_index.load_tail(100) == 100
+    assert log_index.read_lines(0, 2) == ["line 900", "line 901"]
+    assert log_index.read_lines(99, 100) == ["line 999"]
+
+    assert log_index.load_previous(850) == 850
+    assert log_index.read_lines(0, 1) == ["line 50"]
+    assert log_index.load_previous(100) == 50 and log_index.at_start
+    assert log_index.load_previous(100) == 0
+    assert len(log_index) == 1000
+
+    with open(path, 'a') as f:
+        f.write(" line\nline 1001\n")
+    assert log_index.load_appended() == 2
+    assert log_index.read_lines(1000, 1002) == ["partial line", "line 1001"]
+
+    path.write_text("cleared\n")
+    assert log_index.load_appended() == -1
+    assert log_index.load_tail(10) == 1
@@ -0,0 +1,58 @@
+"""NetworkMonitor driven by a ManualEventSource: WiFi is only checked on events"""
+
+import time
+
+import pytest
+
+from hotspotkeeper import HotspotBackend, ManualEventSource, NetworkMonitor, SimulatedBackend
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(wifi_connected=False)
+    HotspotBackend.install(backend)
+    return backend
+
+
+@pytest.fixture
+def monitor(qapp, backend):
+    monitor = NetworkMonitor(ManualEventSource())
+    monitor.start()
+    assert wait_for(lambda: monitor.has_state)  # the initial check
+    yield monitor
+    monitor.stop()
+    monitor.wait()
+
+
+def test_no_checks_while_idle(monitor, backend):
+    checks = backend.calls['is_wifi_connected']
+    time.sleep(1.0)
+    assert backend.calls['is_wifi_connected'] == checks
+    assert monitor.check_count == 1
+
+
+def test_one_refresh_per_burst(monitor, backend):
+    backend.set_wifi(True)
+    for _ in range(10):
+        monitor.event_source.notify()
+        time.sleep(NetworkMonitor.SETTLE_TIME / 10)
+    assert wait_for(lambda: monitor.check_count == 2)
+    time.sleep(NetworkMonitor.SETTLE_TIME * 2)
+    assert monitor.check_count == 2
+    assert monitor.was_connected
+    assert 1 <= monitor.event_count <= 10
+
+    # A second, separate burst is a second refresh
+    backend.set_wifi(False)
+    monitor.event_source.notify()
+    assert wait_for(lambda: monitor.check_count == 3)
+    assert not monitor.was_connected
@@ -0,0 +1,56 @@
+"""Pushed power changes reach HotspotKeeper without waiting for a poll"""
+
+import time
+
+import pytest
+
+from hotspotkeeper import HotspotBackend, HotspotKeeper, ManualPowerStatusProvider, SettingsManager, SimulatedBackend
+
+
+def wait_until(app, predicate, timeout=5):
+    """Run the event loop until predicate() holds; returns False on timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+@pytest.fixture
+def keeper(qapp):
+    HotspotBackend.install(SimulatedBackend(wifi_connected=False))
+    keeper = HotspotKeeper(SettingsManager())
+    keeper.start()
+    yield keeper
+    keeper.shutdown()
+
+
+def test_power_change_is_pushed_to_keeper(qapp, keeper):
+    backend = HotspotBackend.instance()
+    assert isinstance(backend.power, ManualPowerStatusProvider)
+    assert wait_until(qapp, lambda: keeper.last_snapshot is not None)
+    assert (keeper.last_snapshot.battery_level, keeper.last_snapshot.is_plugged) == (100, True)
+
+    # Push the poll timer out of reach: only the power notification can bring a new snapshot
+    keeper.scheduler.configure(3600, 3600)
+    keeper.scheduler.fast_interval = 3600
+    keeper.schedule_next_poll()
+    wakeups = keeper.scheduler.wakeups
+
+    backend.power.set(battery_level=15, plugged_in=False)
+    assert wait_until(qapp, lambda: keeper.last_snapshot.battery_level == 15)
+    assert keeper.last_snapshot.is_plugged is False
+    assert keeper.scheduler.wakeups == wakeups
+
+
+def test_shutdown_unsubscribes_from_power(qapp):
+    HotspotBackend.install(SimulatedBackend(wifi_connected=False))
+    backend = HotspotBackend.instance()
+    keeper = HotspotKeeper(SettingsManager())
+    keeper.start()
+    assert keeper.on_power_changed in backend.power.subscribers
+    keeper.shutdown()
+    assert keeper.on_power_changed not in backend.power.subscribers
+    backend.power.set(battery_level=40, plugged_in=False)  # nothing left to call
@@ -0,0 +1,81 @@
+"""PowerShellHost against the fake host script (no PowerShell needed)"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from hotspotkeeper import PowerShellHost
+
+FAKE_HOST = [sys.executable, str(Path(__file__).with_name("fake_powershell_host.py"))]
+
+
+@pytest.fixture
+def host():
+    host = PowerShellHost(FAKE_HOST)
+    yield host
+    host.shutdown()
+
+
+def test_round_trip(host):
+    result = host.run("echo hello")
+    assert (result.returncode, result.stdout, result.stderr) == (0, "hello", "")
+    assert host.run("echo again").stdout == "again"
+    assert host.restart_count == 0
+
+
+def test_nonzero_code(host):
+    result = host.run("fail boom")
+    assert (result.returncode, result.stderr) == (1, "boom")
+    assert host.run("echo still alive").returncode == 0
+
+
+def test_timeout_restarts_host(host):
+    first_pid = host.run("pid").stdout
+    with pytest.raises(subprocess.TimeoutExpired):
+        host.run("sleep 5", timeout=0.3)
+    result = host.run("pid", timeout=5)
+    assert result.stdout != first_pid
+    assert host.restart_count == 1
+
+
+def test_crash_restarts_host(host):
+    first_pid = host.run("pid").stdout
+    assert host.run("die").returncode == -1
+    # The dead host is reaped, so the next request starts a new one instead of timing out
+    result = host.run("pid", timeout=2)
+    assert result.returncode == 0 and result.stdout != first_pid
+    assert host.run("echo again", timeout=2).stdout == "again"
+
+
+def test_crash_after_timeout_restart(host):
+    with pytest.raises(subprocess.TimeoutExpired):
+        host.run("sleep 5", timeout=0.3)
+    assert host.run("die").returncode == -1
+    assert host.run("echo again", timeout=2).stdout == "again"
+
+
+def test_shutdown(host):
+    host.run("echo up")
+    process = host.process
+    host.shutdown()
+    assert process.poll() is not None
+    assert not host.is_running()
+    with pytest.raises(RuntimeError):
+        host.run("echo after shutdown")
+
+
+def test_shutdown_while_request_in_flight(host):
+    results = []
+    worker = threading.Thread(target=lambda: results.append(host.run("sleep 30", timeout=35)))
+    worker.start()
+    time.sleep(0.3)  # let the request take the host
+    started = time.monotonic()
+    host.shutdown(timeout=0.5)
+    worker.join(5)
+    assert not worker.is_alive()
+    assert time.monotonic() - started < 5
+    assert results[0].returncode == -1
@@ -0,0 +1,102 @@
+"""ProbeEngine and HotspotKeeper with slow fake probes: probes stay off the GUI thread"""
+
+import threading
+import time
+
+import pytest
+
+from hotspotkeeper import (DeviceStatus, HotspotBackend, HotspotKeeper, ProbeEngine, SettingsManager,
+                           SimulatedBackend, StatusSnapshot, TetheringState)
+
+PROBE_TIME = 0.3  # seconds each fake probe takes
+
+
+class SlowProbe:
+    """Fake status probe that takes PROBE_TIME and records the threads it ran on"""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def __call__(self):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(PROBE_TIME)
+        return DeviceStatus(True, "TestWiFi", TetheringState.OFF, 0, 80, True)
+
+
+def wait_until(app, predicate, timeout=5):
+    """Run the event loop until predicate() holds; returns False on timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+@pytest.fixture
+def engine(qapp):
+    engine = ProbeEngine(SlowProbe(), ttl=0)
+    snapshots = []
+    engine.snapshot_ready.connect(snapshots.append)
+    engine.snapshots = snapshots
+    engine.start()
+    yield engine
+    engine.stop()
+    engine.wait()
+
+
+@pytest.fixture
+def keeper(qapp):
+    HotspotBackend.install(SimulatedBackend())
+    keeper = HotspotKeeper(SettingsManager())
+    keeper.probe_engine.probe = SlowProbe()
+    keeper.probe_engine.ttl = 0
+    keeper.start()
+    yield keeper
+    keeper.shutdown()
+
+
+def test_request_tick_does_not_wait_for_probe(qapp, engine):
+    started = time.perf_counter()
+    engine.request_tick()
+    assert time.perf_counter() - started < PROBE_TIME / 10
+    assert wait_until(qapp, lambda: engine.snapshots)
+    assert engine.snapshots[0].ssid == "TestWiFi"
+    assert engine.snapshots[0].latency >= PROBE_TIME
+    assert threading.get_ident() not in engine.probe.threads
+
+
+def test_requests_during_a_tick_are_coalesced(qapp, engine):
+    engine.request_tick()
+    time.sleep(PROBE_TIME / 3)  # first tick is probing
+    for _ in range(5):
+        engine.request_tick()
+    assert wait_until(qapp, lambda: len(engine.snapshots) == 2)
+    time.sleep(PROBE_TIME * 1.5)
+    qapp.processEvents()
+    assert len(engine.snapshots) == 2 and engine.probe.calls == 2
+
+
+def test_update_status_keeps_gui_thread_free(qapp, keeper):
+    assert wait_until(qapp, lambda: keeper.last_snapshot is not None)
+    ticks = keeper.probe_engine.tick_count
+    started = time.perf_counter()
+    keeper.update_status()
+    assert time.perf_counter() - started < PROBE_TIME / 10
+    assert wait_until(qapp, lambda: keeper.probe_engine.tick_count > ticks)
+    assert wait_until(qapp, lambda: keeper.last_snapshot.completed_at > started - 1)
+    assert keeper.last_apply_time < PROBE_TIME / 10
+    assert threading.get_ident() not in keeper.probe_engine.probe.threads
+
+
+def test_stale_snapshot_does_not_overwrite_newer(qapp, keeper):
+    assert wait_until(qapp, lambda: keeper.last_snapshot is not None)
+    now = time.monotonic()
+    newer = StatusSnapshot(True, False, 50, True, "Newer", 0, now - 0.1, now)
+    stale = StatusSnapshot(False, False, 10, False, "Stale", 0, now - 2.0, now - 1.0)
+    keeper.apply_status(newer)
+    keeper.apply_status(stale)
+    assert keeper.last_snapshot is newer
@@ -0,0 +1,126 @@
+"""SettingsManager persistence (debounced, skipped when unchanged, atomically replaced) and Settings validation and migration"""
+
+import json
+import time
+
+import pytest
+
+from hotspotkeeper import Settings, SettingsManager, metrics
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def manager(home, monkeypatch):
+    monkeypatch.setattr(SettingsManager, "SAVE_DELAY", 0.2)
+    manager = SettingsManager()
+    yield manager
+    manager.save_settings()
+
+
+def saves():
+    return metrics.counters['settings.saves']
+
+
+def wait_for_saves(count, timeout=3):
+    deadline = time.monotonic() + timeout
+    while saves() < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return saves() >= count
+
+
+def test_burst_of_updates_is_one_write(manager):
+    before = saves()
+    for interval in range(5, 15):
+        manager.set("check_interval", interval)
+    manager.update({"debounce_time": 30, "battery_threshold": 20})
+    assert saves() == before  # nothing written until the burst is over
+    assert wait_for_saves(before + 1)
+    time.sleep(SettingsManager.SAVE_DELAY * 2)
+    assert saves() == before + 1
+    data = json.loads(manager.settings_file.read_text())
+    assert (data["check_interval"], data["debounce_time"], data["battery_threshold"]) == (14, 30, 20)
+
+
+def test_unchanged_values_are_not_written(manager):
+    manager.set("check_interval", 7)
+    manager.save_settings()
+    before = saves()
+    assert manager.set("check_interval", 7) is False
+    assert manager.update({"check_interval": 7, "show_notifications": True}) == []
+    assert not manager.dirty
+    time.sleep(SettingsManager.SAVE_DELAY * 2)
+    manager.save_settings()
+    assert saves() == before
+
+
+def test_save_replaces_file_atomically(manager):
+    manager.set("check_interval", 9)
+    manager.save_settings()
+    temp_file = manager.settings_file.with_name(manager.settings_file.name + ".tmp")
+    assert not temp_file.exists()
+    assert json.loads(manager.settings_file.read_text())["check_interval"] == 9
+
+    # A failed write leaves the previous file untouched and the change pending
+    temp_file.mkdir()
+    manager.set("check_interval", 10)
+    manager.save_settings()
+    assert json.loads(manager.settings_file.read_text())["check_interval"] == 9
+    assert manager.dirty
+    temp_file.rmdir()
+    manager.save_settings()
+    assert json.loads(manager.settings_file.read_text())["check_interval"] == 10
+    assert not temp_file.exists()
+
+
+def write_settings(home, data):
+    settings_dir = home / "AppData" / "Local" / "HotspotKeeper"
+    settings_dir.mkdir(parents=True, exist_ok=True)
+    (settings_dir / "settings.json").write_text(json.dumps(data))
+
+
+def test_validate():
+    assert Settings.validate("check_interval", 5.0) == 5 and type(Settings.validate("check_interval", 5.0)) is int
+    assert Settings.validate("show_notifications", 0) is False
+    assert Settings.validate("log_level", "debug") == "DEBUG"
+    for name, value in (("check_interval", 0), ("check_interval", 2.5), ("check_interval", "3"),
+                        ("check_interval", True), ("show_notifications", "yes"), ("log_level", "LOUD"),
+                        ("battery_threshold", 101)):
+        with pytest.raises(ValueError):
+            Settings.validate(name, value)
+
+
+def test_invalid_values_fall_back_and_unknown_keys_are_kept(home):
+    write_settings(home, {"settings_version": Settings.VERSION, "check_interval": -4, "log_level": 3,
+                          "battery_threshold": 25, "future_option": [1, 2]})
+    manager = SettingsManager()
+    assert manager.settings.check_interval == Settings.SCHEMA["check_interval"][1]
+    assert manager.settings.log_level == Settings.SCHEMA["log_level"][1]
+    assert manager.settings.battery_threshold == 25
+    assert manager.get("future_option") == [1, 2]
+    assert manager.dirty  # the repaired values are written back
+    manager.save_settings()
+    data = json.loads(manager.settings_file.read_text())
+    assert data["check_interval"] == Settings.SCHEMA["check_interval"][1]
+    assert data["future_option"] == [1, 2]
+
+
+def test_older_file_is_migrated(home):
+    write_settings(home, {"check_interval": 8, "last_manual_disable_time": 1700000000.0})  # version 1: no version key
+    manager = SettingsManager()
+    assert manager.settings.check_interval == 8
+    assert manager.get("last_manual_disable_time") is None
+    assert manager.dirty
+    manager.save_settings()
+    data = json.loads(manager.settings_file.read_text())
+    assert data["settings_version"] == Settings.VERSION
+    assert "last_manual_disable_time" not in data
+
+    # Already current: loads without a rewrite
+    assert not SettingsManager().dirty
+    assert not Settings.migrate({"settings_version": Settings.VERSION})
@@ -0,0 +1,75 @@
+"""TelemetryRing rate calculation, including counter resets, and TelemetrySampler on the simulator"""
+
+import random
+import time
+
+import pytest
+
+from hotspotkeeper import (HotspotBackend, SimulatedBackend, StatusSnapshot, TelemetryRing, TelemetrySampler,
+                           TrafficCounters)
+
+
+def test_rates_from_counter_deltas():
+    ring = TelemetryRing(capacity=10)
+    assert ring.append(0.0, 1, TrafficCounters(1000, 5000)) == (0.0, 1, 0.0, 0.0)  # no previous sample
+    sample = ring.append(2.0, 2, TrafficCounters(3000, 15000))
+    assert (sample.rx_rate, sample.tx_rate) == (1000.0, 5000.0)
+    assert sample.down_mbps == pytest.approx(0.04)
+    assert (ring.total_received, ring.total_sent, ring.peak_clients) == (2000, 10000, 2)
+
+
+def test_counter_reset_restarts_the_delta():
+    ring = TelemetryRing(capacity=10)
+    ring.append(0.0, 1, TrafficCounters(50_000, 90_000))
+    # Adapter recreated: counters start again from a small value
+    assert ring.append(2.0, 1, TrafficCounters(100, 200))[2:] == (0.0, 0.0)
+    assert ring.append(4.0, 1, TrafficCounters(2100, 4200))[2:] == (1000.0, 2000.0)
+    # Adapter down (no counters), then back: no rate across the gap
+    assert ring.append(6.0, 0, None)[2:] == (0.0, 0.0)
+    assert ring.append(8.0, 1, TrafficCounters(9000, 9000))[2:] == (0.0, 0.0)
+    # Same timestamp twice and only one counter going backwards
+    assert ring.append(8.0, 1, TrafficCounters(9500, 9500))[2:] == (0.0, 0.0)
+    assert ring.append(10.0, 1, TrafficCounters(9400, 20000))[2:] == (0.0, 0.0)
+    assert (ring.total_received, ring.total_sent) == (2000, 4000)
+
+
+def test_rates_never_negative_and_ring_wraps():
+    rng = random.Random(7)
+    ring = TelemetryRing(capacity=50)
+    received = sent = 0
+    now = 0.0
+    for _ in range(1000):
+        now += rng.choice((0.0, 0.5, 2.0, 2.0, 5.0))
+        if rng.random() < 0.05:
+            received, sent = rng.randint(0, 1000), rng.randint(0, 1000)  # reset
+        else:
+            received += rng.randint(0, 100_000)
+            sent += rng.randint(0, 1_000_000)
+        counters = None if rng.random() < 0.05 else TrafficCounters(received, sent)
+        sample = ring.append(now, rng.randint(0, 8), counters)
+        assert sample.rx_rate >= 0 and sample.tx_rate >= 0
+    samples = ring.samples()
+    assert len(samples) == 50
+    assert samples[-1] == ring.latest() and samples[-1].timestamp == now
+    assert all(a.timestamp <= b.timestamp for a, b in zip(samples, samples[1:]))
+    assert all(s.rx_rate >= 0 and s.tx_rate >= 0 for s in samples)
+
+
+def test_sampler_on_simulator(qapp):
+    backend = SimulatedBackend(hotspot_enabled=True)
+    backend.set_clients(2)
+    HotspotBackend.install(backend)
+    sampler = TelemetrySampler(interval=0.05)
+    sampler.update(StatusSnapshot(True, True, 100, True, None, 2, 0.0, 0.0))
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while sampler.ring.count < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        sampler.stop()
+        sampler.wait()
+    samples = sampler.ring.samples()
+    assert len(samples) >= 5
+    assert all(s.client_count == 2 for s in samples)
+    assert samples[-1].tx_rate > samples[-1].rx_rate > 0  # simulated traffic flows mostly to the clients
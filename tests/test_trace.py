@@ -0,0 +1,105 @@
+"""TraceRecorder fixed-size records and ring wrap, and replay_trace against HotspotPolicy"""
+
+import pytest
+
+from hotspotkeeper import (HotspotPolicy, PolicyAction, StatusSnapshot, TraceRecorder, read_trace,
+                           replay_trace)
+
+
+def snapshot(wifi, hotspot, battery=80, plugged=True, clients=0, latency=0.005):
+    return StatusSnapshot(wifi, hotspot, battery, plugged, "TestWiFi" if wifi else None, clients, 0.0, latency)
+
+
+def record_session(trace, start, ticks=40):
+    """Drive a HotspotPolicy the way HotspotKeeper does and record it; WiFi drops and returns every 10 ticks"""
+    policy = HotspotPolicy(auto_disable=True)
+    trace.session(start)
+    trace.config(policy, start)
+    hotspot = False
+    for tick in range(ticks):
+        now = start + tick * 3
+        wifi = tick % 10 < 7
+        trace.snapshot(snapshot(wifi, hotspot, clients=2 if hotspot else 0), now)
+        action = policy.decide(snapshot(wifi, hotspot), now)
+        if action:
+            trace.action(action, True, now)
+            hotspot = action == PolicyAction.ENABLE
+            policy.operation_finished(hotspot, True, now + 1, automatic=True)
+            trace.outcome(hotspot, True, True, 1.0, now + 1)
+    return policy
+
+
+def test_records_round_trip(tmp_path):
+    path = tmp_path / "trace.bin"
+    trace = TraceRecorder(path, capacity=16)
+    trace.session(100.0)
+    trace.snapshot(snapshot(True, False, battery=300, plugged=False, clients=70000, latency=0.25), 101.5)
+    trace.action(PolicyAction.ENABLE, True, 102.0)
+    trace.outcome(True, False, True, 2.5, 104.0)
+    trace.close()
+    assert path.stat().st_size == TraceRecorder.HEADER.size + 16 * TraceRecorder.RECORD.size
+
+    assert list(read_trace(path)) == [
+        (100.0, TraceRecorder.SESSION, 0, 0, 0, 0, 0, 0.0),
+        (101.5, TraceRecorder.SNAPSHOT, 1, 0, 255, 0, 0xFFFF, 0.25),  # battery and clients saturate
+        (102.0, TraceRecorder.ACTION, PolicyAction.ENABLE, 1, 0, 0, 0, 0.0),
+        (104.0, TraceRecorder.OUTCOME, 1, 0, 1, 0, 0, 2.5),
+    ]
+
+    # Reopened with the same layout: appends; with another capacity: starts over
+    trace = TraceRecorder(path, capacity=16)
+    trace.session(200.0)
+    trace.close()
+    assert len(list(read_trace(path))) == 5
+    trace = TraceRecorder(path, capacity=8)
+    trace.session(300.0)
+    trace.close()
+    assert list(read_trace(path)) == [(300.0, TraceRecorder.SESSION, 0, 0, 0, 0, 0, 0.0)]
+
+
+def test_ring_wraps_oldest_first(tmp_path):
+    path = tmp_path / "trace.bin"
+    trace = TraceRecorder(path, capacity=8)
+    for tick in range(21):
+        trace.snapshot(snapshot(True, True, clients=tick), float(tick))
+    trace.close()
+    assert path.stat().st_size == TraceRecorder.HEADER.size + 8 * TraceRecorder.RECORD.size
+    records = list(read_trace(path))
+    assert [record[0] for record in records] == [float(tick) for tick in range(13, 21)]
+    assert [record[6] for record in records] == list(range(13, 21))
+
+    (tmp_path / "other.bin").write_bytes(b"NOTATRACE" + bytes(64))
+    with pytest.raises(ValueError):
+        list(read_trace(tmp_path / "other.bin"))
+
+
+def test_replay_matches_recording(tmp_path):
+    path = tmp_path / "trace.bin"
+    trace = TraceRecorder(path)
+    record_session(trace, 1000.0)
+    record_session(trace, 5000.0)
+    trace.close()
+
+    stats = replay_trace(path)
+    assert stats['sessions'] == 2 and stats['snapshots'] == 80
+    assert stats['mismatches'] == 0 and stats.get('failures', 0) == 0
+    assert stats['replayed_actions'] == stats['recorded_actions'] == stats['successes'] == 16
+    assert stats['probe_latency_p50_ms'] == 5.0
+    assert stats['records'] == len(list(read_trace(path)))
+
+
+def test_replay_reports_mismatches(tmp_path):
+    path = tmp_path / "trace.bin"
+    trace = TraceRecorder(path)
+    trace.session(0.0)
+    trace.config(HotspotPolicy(), 0.0)
+    trace.snapshot(snapshot(True, False), 1.0)  # the policy enables here, but nothing was recorded
+    trace.session(10.0)
+    trace.config(HotspotPolicy(auto_enabled=False), 10.0)
+    trace.snapshot(snapshot(True, False), 11.0)
+    trace.action(PolicyAction.ENABLE, True, 11.0)  # recorded, but auto-enable is off
+    trace.close()
+
+    stats = replay_trace(path)
+    assert stats['mismatches'] == 2
+    assert (stats['replayed_actions'], stats['recorded_actions']) == (1, 1)
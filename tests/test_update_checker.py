@@ -0,0 +1,105 @@
+"""UpdateChecker against a local stand-in for the GitHub releases API"""
+
+import http.server
+import json
+import threading
+
+import pytest
+
+from hotspotkeeper import UpdateChecker
+
+ETAG = '"release-2.0.0"'
+LAST_MODIFIED = "Wed, 01 Jul 2026 10:00:00 GMT"
+
+
+class ReleaseServer(http.server.ThreadingHTTPServer):
+    """Serves the latest release, or replies with `status` when it is set"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ReleaseHandler)
+        self.status = None
+        self.requests = []  # request headers, one dict per request
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/releases/latest"
+
+
+class ReleaseHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.server.status is not None:
+            self.send_response(self.server.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"tag_name": "v2.0.0", "html_url": "https://example.invalid/v2.0.0"}).encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ReleaseServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def check(server, cache_path, min_interval=0):
+    """Run one check on this thread; returns the checker and the updates it announced"""
+    checker = UpdateChecker(cache_path=cache_path, min_interval=min_interval, url=server.url)
+    announced = []
+    checker.update_available.connect(lambda version, url: announced.append(version))
+    checker.run()
+    return checker, announced
+
+
+def test_first_check_fetches_and_caches(qapp, server, tmp_path):
+    cache_path = tmp_path / "update_cache.json"
+    checker, announced = check(server, cache_path)
+    assert checker.result == 'fetched'
+    assert announced == ["2.0.0"]
+    cache = json.loads(cache_path.read_text())
+    assert (cache["etag"], cache["last_modified"], cache["tag_name"]) == (ETAG, LAST_MODIFIED, "v2.0.0")
+    assert "If-None-Match" not in server.requests[0]
+
+
+def test_not_modified_keeps_cached_release(qapp, server, tmp_path):
+    cache_path = tmp_path / "update_cache.json"
+    check(server, cache_path)
+    server.status = 304
+    checker, announced = check(server, cache_path)
+    assert checker.result == 'not_modified'
+    assert server.requests[1]["If-None-Match"] == ETAG
+    assert server.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    assert announced == ["2.0.0"]
+    assert json.loads(cache_path.read_text())["tag_name"] == "v2.0.0"
+
+
+def test_min_interval_skips_network_and_error_backs_off(qapp, server, tmp_path):
+    cache_path = tmp_path / "update_cache.json"
+    check(server, cache_path)
+    checker, announced = check(server, cache_path, min_interval=3600)
+    assert checker.result == 'cached'
+    assert announced == ["2.0.0"]
+    assert len(server.requests) == 1
+
+    # A rate-limited check is not retried until min_interval has passed
+    other_cache = tmp_path / "rate_limited.json"
+    server.status = 403
+    checker, announced = check(server, other_cache, min_interval=3600)
+    assert checker.result is None and announced == []
+    assert len(server.requests) == 2
+    checker, _ = check(server, other_cache, min_interval=3600)
+    assert checker.result == 'cached'
+    assert len(server.requests) == 2